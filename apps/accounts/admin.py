@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import User, Profile
+from .search import user_search_q
 
 
 class ProfileInline(admin.StackedInline):
@@ -26,8 +27,15 @@ class CustomUserAdmin(UserAdmin):
             'fields': ('email', 'username', 'password1', 'password2', 'role', 'first_name', 'last_name'),
         }),
     )
-    search_fields = ('email', 'username', 'first_name', 'last_name')
+    # Names and emails are searched through the user search index
+    search_fields = ('username',)
     ordering = ('email',)
+    
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            results |= queryset.filter(user_search_q(search_term))
+        return results, may_have_duplicates
 
 
 admin.site.register(User, CustomUserAdmin)
@@ -6,6 +6,3 @@ class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.accounts'
     verbose_name = 'User Accounts'
-
-    def ready(self):
-        import apps.accounts.signals  # noqa
\ No newline at end of file
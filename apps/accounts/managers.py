@@ -1,4 +1,5 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
 
@@ -27,3 +28,21 @@ class UserManager(BaseUserManager):
             raise ValueError(_('Superuser must have is_superuser=True.'))
         
         return self.create_user(email, password, **extra_fields)
+    
+    def bulk_create_users(self, users, batch_size=500):
+        """
+        Insert unsaved users and their profiles with bulk_create(), without
+        sending per-row signals. Users without a password get an unusable one.
+        """
+        from .models import Profile
+        
+        users = list(users)
+        for user in users:
+            user.email = self.normalize_email(user.email)
+            if not user.password:
+                user.set_unusable_password()
+        
+        with transaction.atomic(using=self.db):
+            users = self.bulk_create(users, batch_size=batch_size)
+            Profile.objects.bulk_create((Profile(user=user) for user in users), batch_size=batch_size)
+        return users
@@ -0,0 +1,76 @@
+from django.db import migrations
+
+
+# SQLite: an FTS5 trigram index over the name and email columns. It is an
+# external-content table, so it stores only the index, and triggers keep it in
+# sync with every write, including bulk_create() and update().
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE accounts_user_search USING fts5(
+        first_name, last_name, email,
+        content='accounts_user', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER accounts_user_search_insert AFTER INSERT ON accounts_user BEGIN
+        INSERT INTO accounts_user_search(rowid, first_name, last_name, email)
+        VALUES (new.id, new.first_name, new.last_name, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER accounts_user_search_delete AFTER DELETE ON accounts_user BEGIN
+        INSERT INTO accounts_user_search(accounts_user_search, rowid, first_name, last_name, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER accounts_user_search_update AFTER UPDATE OF first_name, last_name, email ON accounts_user BEGIN
+        INSERT INTO accounts_user_search(accounts_user_search, rowid, first_name, last_name, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email);
+        INSERT INTO accounts_user_search(rowid, first_name, last_name, email)
+        VALUES (new.id, new.first_name, new.last_name, new.email);
+    END
+    """,
+    "INSERT INTO accounts_user_search(accounts_user_search) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS accounts_user_search_insert',
+    'DROP TRIGGER IF EXISTS accounts_user_search_delete',
+    'DROP TRIGGER IF EXISTS accounts_user_search_update',
+    'DROP TABLE IF EXISTS accounts_user_search',
+]
+
+# PostgreSQL: trigram GIN indexes on the expressions icontains compiles to,
+# so the existing icontains filters use them as they are.
+POSTGRESQL_FORWARD = ['CREATE EXTENSION IF NOT EXISTS pg_trgm'] + [
+    f'CREATE INDEX IF NOT EXISTS accounts_user_{column}_trgm '
+    f'ON accounts_user USING gin (UPPER({column}::text) gin_trgm_ops)'
+    for column in ('first_name', 'last_name', 'email')
+]
+
+POSTGRESQL_BACKWARD = [
+    f'DROP INDEX IF EXISTS accounts_user_{column}_trgm'
+    for column in ('first_name', 'last_name', 'email')
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}),
+            run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
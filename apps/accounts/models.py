@@ -33,6 +33,14 @@ class User(AbstractUser):
     @property
     def is_student(self):
         return self.role == self.Role.STUDENT
+    
+    def get_profile(self):
+        """Return the user's profile, creating it on first access"""
+        try:
+            return self.profile
+        except Profile.DoesNotExist:
+            self.profile, _ = Profile.objects.get_or_create(user=self)
+            return self.profile
 
 
 class Profile(models.Model):
@@ -0,0 +1,30 @@
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from .models import User
+
+
+# The FTS5 trigram tokenizer cannot match fewer than three characters
+MIN_INDEXED_LENGTH = 3
+
+
+def user_search_q(query, prefix=''):
+    """
+    Filter matching users whose first name, last name or email contains the
+    query, like icontains on each of them. On SQLite the lookup goes through
+    the accounts_user_search FTS5 index; on PostgreSQL the icontains filters
+    use the trigram indexes. Pass prefix='student__' to filter a related model.
+    """
+    query = query.strip()
+    alias = router.db_for_read(User)
+    if connections[alias].vendor == 'sqlite' and len(query) >= MIN_INDEXED_LENGTH:
+        # A quoted FTS5 string is a phrase, which the trigram tokenizer matches as a substring
+        phrase = '"{}"'.format(query.replace('"', '""'))
+        matches = RawSQL('SELECT rowid FROM accounts_user_search WHERE accounts_user_search MATCH %s', [phrase])
+        return Q(**{f'{prefix}id__in': matches})
+
+    return (
+        Q(**{f'{prefix}first_name__icontains': query}) |
+        Q(**{f'{prefix}last_name__icontains': query}) |
+        Q(**{f'{prefix}email__icontains': query})
+    )
@@ -61,10 +61,13 @@ def dashboard(request):
 def profile(request):
     """User profile view"""
     
+    # Profiles are created on first use, not with the user
+    profile = request.user.get_profile()
+    
     if request.method == 'POST':
         user_form = UserUpdateForm(request.POST, instance=request.user)
         profile_form = ProfileUpdateForm(
-            request.POST, request.FILES, instance=request.user.profile
+            request.POST, request.FILES, instance=profile
         )
         
         if user_form.is_valid() and profile_form.is_valid():
@@ -74,7 +77,7 @@ def profile(request):
             return redirect('profile')
     else:
         user_form = UserUpdateForm(instance=request.user)
-        profile_form = ProfileUpdateForm(instance=request.user.profile)
+        profile_form = ProfileUpdateForm(instance=profile)
     
     context = {
         'user_form': user_form,
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('v1/courses/', views.course_list, name='api_course_list'),
+    path('v1/courses/<int:course_id>/sessions/', views.session_list, name='api_session_list'),
+    path('v1/courses/<int:course_id>/sessions/<int:session_id>/roster/', views.session_roster, name='api_session_roster'),
+    path('v1/me/report/', views.student_report, name='api_student_report'),
+]
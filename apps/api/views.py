@@ -0,0 +1,243 @@
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import condition, require_GET
+from apps.courses.enrolled import is_enrolled
+from apps.courses.models import Course, CourseEnrollment
+from apps.sessions.models import Session
+from apps.attendance.models import Attendance
+from utils.caching import get_course_versions, get_or_set_course_value
+from utils.pagination import InvalidCursor, keyset_page
+
+
+API_VERSION = 'v1'
+PAGE_SIZE = 50
+
+
+def api_login_required(view):
+    """Like login_required, but answers 401 instead of redirecting to the login page"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Authentication required.'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def _error(message, status):
+    return JsonResponse({'error': message}, status=status)
+
+
+def _paginated(request, queryset, ordering, serialize, **extra):
+    """Return one keyset page of values() rows as {'results': [...], 'next': url}"""
+    try:
+        page = keyset_page(queryset, ordering, request.GET.get('cursor'), PAGE_SIZE)
+    except InvalidCursor:
+        return _error('Invalid page cursor.', 400)
+
+    next_url = None
+    if page.has_next:
+        query = request.GET.copy()
+        query['cursor'] = page.next_cursor
+        next_url = f'{request.path}?{query.urlencode()}'
+
+    return JsonResponse({**extra, 'results': serialize(page.items), 'next': next_url})
+
+
+def _course_access(request, course_id):
+    """Return (course, None) if the user may read the course, otherwise (None, an error response)"""
+    course = Course.objects.filter(id=course_id).only('id', 'name', 'teacher_id').first()
+    if course is None:
+        return None, _error('Course not found.', 404)
+    # Only courses that exist get a version, which gives later requests an ETag
+    get_course_versions([course.id])
+
+    if request.user.is_teacher:
+        if course.teacher_id != request.user.id:
+            return None, _error("You don't have permission to view this course.", 403)
+    elif not is_enrolled(course.id, request.user.id):
+        return None, _error('You are not enrolled in this course.', 403)
+    return course, None
+
+
+def session_status(row, now):
+    """Status of a session values() row, following the Session model properties"""
+    if row['is_closed']:
+        return 'closed'
+    start = timezone.make_aware(datetime.combine(row['date'], row['start_time']))
+    end = timezone.make_aware(datetime.combine(row['date'], row['end_time']))
+    # Sessions open 15 minutes before their scheduled start
+    if now < start - timedelta(minutes=15):
+        return 'upcoming'
+    if now <= end:
+        return 'active'
+    return 'past'
+
+
+# Conditional GET. ETags come from the per-course version counters in the
+# cache, so a 304 costs no query beyond loading the user. The user is part of
+# the tag because the access checks only run on a full response. There is no
+# Last-Modified: HTTP dates have whole seconds, so a check-in in the same second
+# as a fetch would leave If-Modified-Since matching a stale copy.
+
+def _course_etag(request, course_id, **kwargs):
+    # Ids come straight from the URL, so don't create versions for them here
+    version = get_course_versions([course_id], create=False).get(course_id)
+    if version is None:
+        return None
+    return f'{API_VERSION}-user{request.user.id}-course{course_id}-{version}'
+
+
+def _sessions_etag(request, course_id):
+    # Session statuses follow the clock, so the tag also changes every minute
+    etag = _course_etag(request, course_id)
+    return f'{etag}-{timezone.now():%Y%m%d%H%M}' if etag else None
+
+
+def _report_course_ids(request):
+    if not hasattr(request, '_api_report_course_ids'):
+        request._api_report_course_ids = sorted(
+            CourseEnrollment.objects.filter(student=request.user, is_active=True).values_list('course_id', flat=True)
+        ) if request.user.is_authenticated else []
+    return request._api_report_course_ids
+
+
+def _report_etag(request):
+    course_ids = _report_course_ids(request)
+    versions = get_course_versions(course_ids)
+    state = ','.join(f'{course_id}:{versions[course_id]}' for course_id in course_ids)
+    return f'{API_VERSION}-user{request.user.id}-report-' + hashlib.sha1(state.encode()).hexdigest()
+
+
+@require_GET
+@api_login_required
+def course_list(request):
+    """Courses the user teaches or is actively enrolled in"""
+
+    if request.user.is_teacher:
+        courses = Course.objects.filter(teacher=request.user)
+    else:
+        courses = Course.objects.filter(enrollments__student=request.user, enrollments__is_active=True)
+
+    rows = courses.values(
+        'id', 'name', 'code', 'is_active', 'created_at', 'teacher__first_name', 'teacher__last_name'
+    )
+
+    def serialize(rows):
+        return [{
+            'id': row['id'],
+            'name': row['name'],
+            'code': row['code'],
+            'is_active': row['is_active'],
+            'teacher': f"{row['teacher__first_name']} {row['teacher__last_name']}".strip(),
+            'created_at': row['created_at'],
+        } for row in rows]
+
+    return _paginated(request, rows, ('-created_at', '-id'), serialize)
+
+
+@require_GET
+@api_login_required
+@condition(etag_func=_sessions_etag)
+def session_list(request, course_id):
+    """Sessions of a course, newest first, with their status"""
+
+    course, error = _course_access(request, course_id)
+    if error:
+        return error
+
+    rows = Session.objects.filter(course=course).values(
+        'id', 'title', 'date', 'start_time', 'end_time', 'is_closed'
+    )
+    now = timezone.now()
+
+    def serialize(rows):
+        return [{**row, 'status': session_status(row, now)} for row in rows]
+
+    return _paginated(request, rows, ('-date', '-start_time', '-id'), serialize)
+
+
+@require_GET
+@api_login_required
+@condition(etag_func=_course_etag)
+def session_roster(request, course_id, session_id):
+    """Active students of a course with their attendance in one session"""
+
+    course, error = _course_access(request, course_id)
+    if error:
+        return error
+    if not request.user.is_teacher:
+        return _error("You don't have permission to view this roster.", 403)
+
+    session = Session.objects.filter(id=session_id, course=course).values(
+        'id', 'title', 'date', 'start_time', 'end_time', 'is_closed'
+    ).first()
+    if session is None:
+        return _error('Session not found.', 404)
+
+    rows = CourseEnrollment.objects.filter(course=course, is_active=True).values(
+        'id', 'student_id', 'student__first_name', 'student__last_name', 'student__email'
+    )
+
+    def serialize(rows):
+        # Attendance of this page's students only, in one query
+        attendance = {
+            student_id: (status, check_in_time)
+            for student_id, status, check_in_time in Attendance.objects.filter(
+                session_id=session_id, student_id__in=[row['student_id'] for row in rows]
+            ).values_list('student_id', 'status', 'check_in_time')
+        }
+        results = []
+        for row in rows:
+            status, check_in_time = attendance.get(row['student_id'], (Attendance.Status.ABSENT, None))
+            results.append({
+                'student_id': row['student_id'],
+                'first_name': row['student__first_name'],
+                'last_name': row['student__last_name'],
+                'email': row['student__email'],
+                'status': status,
+                'check_in_time': check_in_time,
+            })
+        return results
+
+    return _paginated(
+        request, rows, ('student__last_name', 'student__first_name', 'id'), serialize, session=session
+    )
+
+
+@require_GET
+@api_login_required
+@condition(etag_func=_report_etag)
+def student_report(request):
+    """Attendance summary of the current student in each of their courses"""
+
+    if not request.user.is_student:
+        return _error('Only students have an attendance report.', 403)
+
+    course_ids = _report_course_ids(request)
+    versions = get_course_versions(course_ids)
+    courses = Course.objects.filter(id__in=course_ids).values('id', 'name', 'code')
+
+    results = []
+    for course in courses:
+        # Shares its cache entry with the HTML report
+        stats = get_or_set_course_value(
+            course['id'], versions[course['id']], ('student', request.user.id, 'stats'),
+            lambda: {
+                'session_count': Session.objects.filter(course_id=course['id']).count(),
+                'attended_sessions': Attendance.objects.filter(
+                    session__course_id=course['id'], student=request.user
+                ).count(),
+            }
+        )
+        total, attended = stats['session_count'], stats['attended_sessions']
+        results.append({
+            **course,
+            'total_sessions': total,
+            'attended_sessions': attended,
+            'attendance_rate': round(attended / total * 100, 1) if total else 0,
+        })
+
+    return JsonResponse({'results': results})
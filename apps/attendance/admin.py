@@ -1,12 +1,14 @@
 from django.contrib import admin
 from .models import Attendance
+from apps.accounts.search import user_search_q
 
 
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
     list_display = ('student', 'session', 'check_in_time', 'status')
     list_filter = ('status', 'check_in_time', 'session__course')
-    search_fields = ('student__email', 'student__first_name', 'student__last_name', 'session__title', 'session__course__name')
+    # Student names and emails are searched through the user search index
+    search_fields = ('session__title', 'session__course__name')
     date_hierarchy = 'check_in_time'
     
     fieldsets = (
@@ -22,6 +24,12 @@ class AttendanceAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            results |= queryset.filter(user_search_q(search_term, prefix='student__'))
+        return results, may_have_duplicates
+    
     def get_readonly_fields(self, request, obj=None):
         if obj:  # Editing an existing object
             return ('session', 'student', 'check_in_time', 'ip_address', 'device_info')
@@ -5,3 +5,6 @@ class AttendanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.attendance'
     verbose_name = 'Attendance Tracking'
+
+    def ready(self):
+        import apps.attendance.signals  # noqa
\ No newline at end of file
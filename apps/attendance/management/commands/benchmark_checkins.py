@@ -0,0 +1,180 @@
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, OperationalError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from apps.accounts.models import User
+from apps.courses.enrolled import forget_enrolled
+from apps.courses.models import Course, CourseEnrollment
+from apps.sessions.models import Session
+from apps.attendance.models import Attendance
+
+
+@contextmanager
+def database_options(options):
+    """Open new connections with other DATABASES['default']['OPTIONS'], e.g. from every client thread"""
+    settings_dict = connection.settings_dict
+    saved = settings_dict.get('OPTIONS', {})
+    settings_dict['OPTIONS'] = options
+    try:
+        yield
+    finally:
+        settings_dict['OPTIONS'] = saved
+
+
+class Command(BaseCommand):
+    help = 'Measures concurrent mark_attendance throughput against the configured database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=200, help='Number of students checking in')
+        parser.add_argument('--threads', type=int, default=16, help='Number of concurrent clients')
+        parser.add_argument(
+            '--baseline',
+            action='store_true',
+            help=(
+                'Disable the SQLite tuning (rollback journal, default busy timeout and deferred '
+                'transactions, no persistent connections) for comparison'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        students = options['students']
+        threads = options['threads']
+        baseline = options['baseline']
+
+        self.stdout.write(
+            f"Benchmarking {students} check-ins with {threads} threads "
+            f"({'baseline' if baseline else 'tuned'} {connection.vendor} settings)..."
+        )
+
+        pragmas = {'journal_mode': 'DELETE', 'synchronous': 'FULL'} if baseline else None
+        # The untuned settings had no OPTIONS: a 5 s busy timeout and deferred transactions
+        options = {} if baseline else connection.settings_dict.get('OPTIONS', {})
+        with override_settings(**({'SQLITE_PRAGMAS': pragmas} if pragmas else {})), database_options(options):
+            # Reconnect so the settings above are applied to every connection
+            connection.close()
+
+            run_id = uuid.uuid4().hex[:8]
+            course, session, users = self.seed(run_id, students)
+            try:
+                results = self.run_clients(session, users, threads, persistent=not baseline)
+                recorded = Attendance.objects.filter(session=session).count()
+            finally:
+                self.cleanup(course, users)
+                connection.close()
+
+        self.report(results, recorded)
+
+    def seed(self, run_id, students):
+        """Create a teacher, an active session and enrolled students"""
+        teacher = User.objects.create(
+            email=f'bench-{run_id}-teacher@example.com', password=make_password(None),
+            username=f'bench-{run_id}-teacher', role=User.Role.TEACHER,
+        )
+        course = Course.objects.create(name=f'Benchmark {run_id}', teacher=teacher)
+
+        now = timezone.localtime()
+        session = Session.objects.create(
+            course=course,
+            title='Benchmark session',
+            date=now.date(),
+            start_time=now.time(),
+            end_time=(now + timedelta(hours=1)).time(),
+        )
+        # Keep the QR code valid for the whole run
+        session.refresh_qr_code(duration_seconds=3600)
+
+        # Hash the password once; the benchmark never logs in with it
+        password = make_password(None)
+        users = [
+            User.objects.create(
+                email=f'bench-{run_id}-{i}@example.com', password=password,
+                username=f'bench-{run_id}-{i}', role=User.Role.STUDENT,
+            )
+            for i in range(students)
+        ]
+        CourseEnrollment.objects.bulk_create(
+            CourseEnrollment(course=course, student=user) for user in users
+        )
+        forget_enrolled(course.id)
+        return course, session, [teacher] + users
+
+    def run_clients(self, session, users, threads, persistent):
+        """Check every student in from a pool of concurrent clients"""
+        url = reverse('mark_attendance', args=[session.id, session.qr_code_token])
+        students = users[1:]
+        chunks = [students[i::threads] for i in range(threads)]
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(threads + 1)
+
+        def worker(chunk):
+            clients = []
+            for student in chunk:
+                client = Client()
+                client.force_login(student)
+                clients.append(client)
+            if not persistent:
+                connection.close()
+
+            barrier.wait()
+            for client in clients:
+                start = time.perf_counter()
+                try:
+                    client.get(url)
+                except OperationalError as e:
+                    with lock:
+                        errors.append(str(e))
+                    continue
+                finally:
+                    if not persistent:
+                        connection.close()
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            connection.close()
+
+        workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+        for thread in workers:
+            thread.start()
+
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        return {'elapsed': elapsed, 'latencies': sorted(latencies), 'errors': errors}
+
+    def cleanup(self, course, users):
+        course.delete()
+        User.objects.filter(id__in=[user.id for user in users]).delete()
+
+    def report(self, results, recorded):
+        latencies = results['latencies']
+        errors = results['errors']
+        completed = len(latencies)
+
+        def percentile(p):
+            if not latencies:
+                return 0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+        self.stdout.write(f"Completed requests: {completed}")
+        self.stdout.write(f"Attendance rows recorded: {recorded}")
+        self.stdout.write(f"Throughput: {completed / results['elapsed']:.1f} check-ins/s")
+        self.stdout.write(
+            f"Latency: p50 {percentile(50):.1f} ms, p95 {percentile(95):.1f} ms, p99 {percentile(99):.1f} ms"
+        )
+        if errors:
+            locked = sum('locked' in error for error in errors)
+            self.stdout.write(self.style.ERROR(f"Database errors: {len(errors)} ({locked} 'database is locked')"))
+        else:
+            self.stdout.write(self.style.SUCCESS('No database errors'))
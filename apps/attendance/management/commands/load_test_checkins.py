@@ -0,0 +1,278 @@
+import asyncio
+import json
+import random
+import ssl
+import time
+import uuid
+from datetime import timedelta
+from urllib.parse import urlsplit, urlencode
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.middleware.csrf import get_token
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from apps.accounts.models import User
+from apps.courses.enrolled import forget_enrolled
+from apps.courses.models import Course, CourseEnrollment
+from apps.sessions.models import Session
+from apps.attendance.models import Attendance
+from utils.qr_generator import expand_token
+from utils.synthetic_data import create_users
+
+
+ARRIVAL_CURVES = ('uniform', 'burst', 'normal', 'ramp')
+
+
+def arrival_offsets(curve, count, duration, rng):
+    """Seconds after the start at which each student scans"""
+    if curve == 'burst':
+        offsets = [0.0] * count
+    elif curve == 'normal':
+        # Most students arrive around the middle of the window
+        offsets = [min(max(rng.gauss(duration / 2, duration / 6), 0), duration) for _ in range(count)]
+    elif curve == 'ramp':
+        # Arrivals grow linearly towards the end of the window
+        offsets = [duration * rng.random() ** 0.5 for _ in range(count)]
+    else:
+        offsets = [rng.uniform(0, duration) for _ in range(count)]
+    return sorted(offsets)
+
+
+async def http_request(base_url, method, path, cookies, headers=None, body=None):
+    """Minimal HTTP/1.1 client so the tool needs nothing outside the standard library"""
+    url = urlsplit(base_url)
+    secure = url.scheme == 'https'
+    port = url.port or (443 if secure else 80)
+    reader, writer = await asyncio.open_connection(
+        url.hostname, port, ssl=ssl.create_default_context() if secure else None
+    )
+
+    lines = [
+        f'{method} {path} HTTP/1.1',
+        f'Host: {url.netloc}',
+        'Connection: close',
+        'User-Agent: scaatt-load-test',
+        'Cookie: ' + '; '.join(f'{name}={value}' for name, value in cookies.items()),
+    ]
+    for name, value in (headers or {}).items():
+        lines.append(f'{name}: {value}')
+    payload = body.encode() if body else b''
+    if payload:
+        lines.append(f'Content-Length: {len(payload)}')
+
+    try:
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + payload)
+        await writer.drain()
+        raw = await reader.read()
+    finally:
+        writer.close()
+
+    head, _, content = raw.partition(b'\r\n\r\n')
+    head_lines = head.decode('latin-1').split('\r\n')
+    status = int(head_lines[0].split(' ')[1])
+    response_headers = {}
+    for line in head_lines[1:]:
+        name, _, value = line.partition(':')
+        response_headers[name.strip().lower()] = value.strip()
+    return status, response_headers, content
+
+
+class Command(BaseCommand):
+    help = 'Simulates students scanning the attendance QR code at the start of class against a running server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to load, e.g. a local gunicorn')
+        parser.add_argument('--students', type=int, default=300)
+        parser.add_argument('--duration', type=float, default=20, help='Seconds over which students arrive')
+        parser.add_argument('--curve', choices=ARRIVAL_CURVES, default='uniform', help='Arrival curve of the scans')
+        parser.add_argument('--qr-interval', type=int, default=10, help='Seconds between QR rotations (5-60)')
+        parser.add_argument('--manual-ratio', type=float, default=0.1, help='Share of students typing the code instead of scanning')
+        parser.add_argument('--concurrency', type=int, default=100, help='Maximum requests in flight')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded course, session and students')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        run_id = uuid.uuid4().hex[:8]
+        self.session_keys = []
+
+        teacher, course, session, students = self.seed(run_id, options['students'])
+        try:
+            self.stdout.write(
+                f"Load test {run_id}: {len(students)} students, {options['curve']} arrivals over "
+                f"{options['duration']}s, QR rotating every {options['qr_interval']}s against {options['base_url']}"
+            )
+            teacher_cookies = self.login(teacher)
+            student_cookies = [self.login(student) for student in students]
+
+            results, elapsed = asyncio.run(self.run(options, rng, course, session, teacher_cookies, student_cookies))
+            self.report(results, elapsed, session, len(students))
+        finally:
+            if not options['keep']:
+                course.delete()
+                User.objects.filter(id__in=[teacher.id] + [s.id for s in students]).delete()
+                for session_key in self.session_keys:
+                    SessionStore(session_key=session_key).delete()
+
+    def seed(self, run_id, count):
+        """Create a course with an active session and enrolled students"""
+        teacher = create_users(User.Role.TEACHER, 1, f'load-{run_id}-teacher')[0]
+        students = create_users(User.Role.STUDENT, count, f'load-{run_id}-student')
+        course = Course.objects.create(name=f'Load test {run_id}', teacher=teacher)
+        CourseEnrollment.objects.bulk_create(CourseEnrollment(course=course, student=s) for s in students)
+        forget_enrolled(course.id)
+
+        now = timezone.localtime()
+        session = Session.objects.create(
+            course=course,
+            title='Load test session',
+            date=now.date(),
+            start_time=now.time(),
+            end_time=min(now + timedelta(hours=1), now.replace(hour=23, minute=59)).time(),
+        )
+        return teacher, course, session, students
+
+    def login(self, user):
+        """Create an authenticated session, as logging in through the form would"""
+        store = SessionStore()
+        store[SESSION_KEY] = str(user.pk)
+        store[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+        store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        store.create()
+        self.session_keys.append(store.session_key)
+
+        # A CSRF cookie the server accepts for the POST requests
+        csrf_token = get_token(RequestFactory().get('/'))
+        return {settings.SESSION_COOKIE_NAME: store.session_key, settings.CSRF_COOKIE_NAME: csrf_token}
+
+    async def run(self, options, rng, course, session, teacher_cookies, student_cookies):
+        base_url = options['base_url']
+        interval = options['qr_interval']
+        state = {'token': session.qr_code_token, 'rotations': 0, 'rotation_errors': 0}
+        results = []
+        semaphore = asyncio.Semaphore(options['concurrency'])
+
+        refresh_path = reverse('refresh_qr_code', args=[course.id, session.id])
+
+        async def rotate_qr():
+            # Plays the projector page: refresh the QR code like qr-handler.js does
+            while True:
+                try:
+                    status, _, content = await http_request(
+                        base_url, 'POST', refresh_path, teacher_cookies,
+                        headers={
+                            'Content-Type': 'application/x-www-form-urlencoded',
+                            'X-Requested-With': 'XMLHttpRequest',
+                            'X-CSRFToken': teacher_cookies[settings.CSRF_COOKIE_NAME],
+                        },
+                        body=urlencode({'duration': interval}),
+                    )
+                    if status == 200:
+                        code = json.loads(content)['qr_url'].rstrip('/').rsplit('/', 1)[-1]
+                        state['token'] = expand_token(code) or code
+                        state['rotations'] += 1
+                    else:
+                        state['rotation_errors'] += 1
+                except OSError:
+                    state['rotation_errors'] += 1
+                await asyncio.sleep(interval)
+
+        async def check_in(offset, cookies, manual):
+            await asyncio.sleep(offset)
+            async with semaphore:
+                token = state['token']
+                if manual:
+                    method, path = 'POST', reverse('manual_attendance')
+                    headers = {
+                        'Content-Type': 'application/x-www-form-urlencoded',
+                        'X-CSRFToken': cookies[settings.CSRF_COOKIE_NAME],
+                    }
+                    body = urlencode({'attendance_code': f'{session.id}-{token}'})
+                else:
+                    method, path = 'GET', reverse('mark_attendance', args=[session.id, token])
+                    headers, body = None, None
+
+                start = time.perf_counter()
+                try:
+                    status, response_headers, content = await http_request(
+                        base_url, method, path, cookies, headers, body
+                    )
+                except OSError:
+                    results.append({'outcome': 'connection error', 'latency': time.perf_counter() - start, 'manual': manual})
+                    return
+                latency = time.perf_counter() - start
+
+            results.append({
+                'outcome': self.classify(status, response_headers.get('location', ''), content, course, session),
+                'latency': latency,
+                'manual': manual,
+            })
+
+        offsets = arrival_offsets(options['curve'], len(student_cookies), options['duration'], rng)
+        rotator = asyncio.create_task(rotate_qr())
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            check_in(offset, cookies, rng.random() < options['manual_ratio'])
+            for offset, cookies in zip(offsets, student_cookies)
+        ))
+        elapsed = time.perf_counter() - start
+        rotator.cancel()
+
+        self.stdout.write(f"QR rotations: {state['rotations']} ({state['rotation_errors']} failed)")
+        return results, elapsed
+
+    def classify(self, status, location, content, course, session):
+        """Map a check-in response to an outcome using the redirect target of each branch"""
+        if status >= 500:
+            return 'lock timeout' if b'database is locked' in content else f'server error {status}'
+        if status != 302:
+            return f'unexpected status {status}'
+
+        path = urlsplit(location).path
+        if path == reverse('session_detail', args=[course.id, session.id]):
+            return 'recorded'
+        if path in (reverse('course_detail', args=[course.id]), reverse('scanner')):
+            return 'rejected (expired, invalid or closed)'
+        if path == reverse('course_list'):
+            return 'rejected (not enrolled)'
+        return f'redirected to {path}'
+
+    def report(self, results, elapsed, session, students):
+        latencies = sorted(result['latency'] for result in results)
+
+        def percentile(p):
+            if not latencies:
+                return 0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+        outcomes = {}
+        by_path = {}
+        for result in results:
+            outcomes[result['outcome']] = outcomes.get(result['outcome'], 0) + 1
+            key = f"{'manual' if result['manual'] else 'scan'}: {result['outcome']}"
+            by_path[key] = by_path.get(key, 0) + 1
+
+        self.stdout.write(f'Requests: {len(results)} in {elapsed:.1f}s ({len(results) / elapsed:.1f} req/s)')
+        self.stdout.write(
+            f'Latency: p50 {percentile(50):.0f} ms, p90 {percentile(90):.0f} ms, '
+            f'p99 {percentile(99):.0f} ms, max {percentile(100):.0f} ms'
+        )
+        for outcome, count in sorted(by_path.items(), key=lambda item: -item[1]):
+            self.stdout.write(f'  {outcome:<48} {count:>6} ({count / len(results):.1%})')
+
+        errors = sum(count for outcome, count in outcomes.items() if not outcome.startswith(('recorded', 'rejected')))
+        locks = outcomes.get('lock timeout', 0)
+        self.stdout.write(f'Error rate: {errors / len(results):.1%} (lock timeouts: {locks / len(results):.1%})')
+
+        rows = Attendance.objects.filter(session=session)
+        duplicates = rows.values('student').annotate(n=Count('id')).filter(n__gt=1).count()
+        recorded = rows.count()
+        self.stdout.write(f'Attendance rows: {recorded} for {students} students')
+        if duplicates:
+            self.stdout.write(self.style.ERROR(f'Duplicate attendance rows for {duplicates} students'))
+        else:
+            self.stdout.write(self.style.SUCCESS('No duplicate attendance rows'))
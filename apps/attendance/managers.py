@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class AttendanceQuerySet(models.QuerySet):
+    """Queries for attendance records"""
+    
+    # Columns shown by attendance tables; notes and device details are left out
+    LIST_FIELDS = (
+        'session', 'student', 'check_in_time', 'status',
+        'session__title', 'session__date',
+        'student__first_name', 'student__last_name', 'student__email',
+    )
+    
+    def for_list(self):
+        """Rows for attendance tables, with their student and session"""
+        return self.select_related('student', 'session').only(*self.LIST_FIELDS)
+    
+    def for_export(self):
+        """Rows for attendance exports, which also include the notes"""
+        return self.select_related('student', 'session').only(*self.LIST_FIELDS, 'notes')
@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from apps.sessions.models import Session
+from .managers import AttendanceQuerySet
 
 
 class Attendance(models.Model):
@@ -34,21 +35,32 @@ class Attendance(models.Model):
     ip_address = models.GenericIPAddressField(blank=True, null=True)
     device_info = models.CharField(max_length=255, blank=True)
     
+    objects = AttendanceQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['session', 'student']
         ordering = ['session', 'check_in_time']
+        indexes = [
+            # A student's attendance across the sessions of a course
+            models.Index(fields=['student', 'session'], name='attend_student_session_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.get_full_name()} - {self.session.title} ({self.get_status_display()})"
     
+    @classmethod
+    def check_in_status(cls, session, check_in_time):
+        """Status of a student checking in at ``check_in_time``: late from 15 minutes after the session starts"""
+        session_start = timezone.make_aware(
+            timezone.datetime.combine(session.date, session.start_time)
+        )
+        if check_in_time > session_start + timezone.timedelta(minutes=15):
+            return cls.Status.LATE
+        return cls.Status.PRESENT
+    
     def save(self, *args, **kwargs):
         # Determine if the student is late
         if not self.id and self.status == self.Status.PRESENT:
-            session_start = timezone.make_aware(
-                timezone.datetime.combine(self.session.date, self.session.start_time)
-            )
-            # If check-in time is more than 15 minutes after session start, mark as late
-            if self.check_in_time > session_start + timezone.timedelta(minutes=15):
-                self.status = self.Status.LATE
+            self.status = self.check_in_status(self.session, self.check_in_time)
         
         super().save(*args, **kwargs)
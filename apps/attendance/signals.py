@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from utils.caching import bump_course_version
+from utils.live import broker, session_topic
+from .models import Attendance
+
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def invalidate_attendance_cache(sender, instance, **kwargs):
+    """Invalidate cached fragments when attendance is recorded or removed"""
+    bump_course_version(instance.session.course_id)
+
+
+@receiver(post_save, sender=Attendance)
+def publish_attendance(sender, instance, created, **kwargs):
+    """Push new attendance to the live rosters of its session once it is committed"""
+    if created:
+        transaction.on_commit(lambda: broker.publish(session_topic(instance.session_id), instance))
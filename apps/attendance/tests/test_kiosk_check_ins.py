@@ -0,0 +1,68 @@
+import json
+from datetime import time, timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from apps.accounts.models import User
+from apps.attendance.models import Attendance
+from apps.courses.models import Course, CourseEnrollment
+from apps.sessions.models import Session
+from utils.caching import get_course_version
+from utils.live import broker, session_topic
+
+
+class KioskCheckInTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user(
+            email='teacher@example.com', username='teacher', password='x', role=User.Role.TEACHER,
+        )
+        cls.students = [
+            User.objects.create_user(email=f'student{i}@example.com', username=f'student{i}', password='x')
+            for i in range(2)
+        ]
+        cls.course = Course.objects.create(name='Biology', teacher=cls.teacher)
+        for student in cls.students:
+            CourseEnrollment.objects.create(course=cls.course, student=student)
+
+        start = timezone.localtime() - timedelta(minutes=5)
+        end = start + timedelta(hours=1)
+        cls.session = Session.objects.create(
+            course=cls.course,
+            title='Lecture',
+            date=start.date(),
+            start_time=start.time(),
+            end_time=end.time() if end.date() == start.date() else time.max,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.teacher)
+
+    def post_scans(self, scans):
+        url = reverse('kiosk_check_ins', args=[self.course.id, self.session.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, json.dumps({'scans': scans}), content_type='application/json')
+
+    def test_records_new_check_ins_and_publishes_them(self):
+        version = get_course_version(self.course.id)
+        timestamp = timezone.now().isoformat()
+
+        with broker.subscribe(session_topic(self.session.id)) as published:
+            response = self.post_scans([
+                {'student': 'student0@example.com', 'timestamp': timestamp},
+                {'student': 'student1', 'timestamp': timestamp},
+            ])
+            events = [published.get_nowait(), published.get_nowait()]
+
+        self.assertEqual(response.json()['recorded'], 2)
+        self.assertEqual([item['result'] for item in response.json()['results']], ['recorded', 'recorded'])
+        self.assertEqual({event.student_id for event in events}, {student.id for student in self.students})
+        self.assertNotEqual(get_course_version(self.course.id), version)
+
+    def test_existing_check_in_is_a_duplicate(self):
+        Attendance.objects.create(session=self.session, student=self.students[0])
+
+        response = self.post_scans([{'student': 'student0', 'timestamp': timezone.now().isoformat()}])
+
+        self.assertEqual(response.json()['recorded'], 0)
+        self.assertEqual(response.json()['results'][0]['result'], 'duplicate')
@@ -0,0 +1,60 @@
+from datetime import time, timedelta
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from apps.accounts.models import User
+from apps.attendance.models import Attendance
+from apps.courses.models import Course, CourseEnrollment
+from apps.sessions.models import Session
+from apps.sessions.tokens import qr_schedule_seed, scheduled_qr_token
+
+
+class ManualAttendanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user(
+            email='teacher@example.com', username='teacher', password='x', role=User.Role.TEACHER,
+        )
+        cls.student = User.objects.create_user(email='student@example.com', username='student', password='x')
+        course = Course.objects.create(name='Biology', teacher=teacher)
+        CourseEnrollment.objects.create(course=course, student=cls.student)
+
+        start = timezone.localtime() - timedelta(minutes=5)
+        end = start + timedelta(hours=1)
+        cls.session = Session.objects.create(
+            course=course,
+            title='Lecture',
+            date=start.date(),
+            start_time=start.time(),
+            end_time=end.time() if end.date() == start.date() else time.max,
+        )
+        cls.session.refresh_qr_code(duration_seconds=60)
+
+    def setUp(self):
+        self.client.force_login(self.student)
+
+    def post_code(self, token):
+        return self.client.post(reverse('manual_attendance'), {'attendance_code': f'{self.session.id}-{token}'})
+
+    def test_valid_code_records_attendance(self):
+        response = self.post_code(self.session.qr_code_token)
+
+        self.assertRedirects(
+            response,
+            reverse('session_detail', args=[self.session.course_id, self.session.id]),
+            fetch_redirect_response=False,
+        )
+        self.assertTrue(Attendance.objects.filter(session=self.session, student=self.student).exists())
+
+    def test_scheduled_token_is_accepted(self):
+        window = int(timezone.now().timestamp()) // settings.QR_SCHEDULE_WINDOW
+        self.post_code(scheduled_qr_token(qr_schedule_seed(self.session), window))
+
+        self.assertTrue(Attendance.objects.filter(session=self.session, student=self.student).exists())
+
+    def test_unknown_token_is_rejected(self):
+        response = self.post_code('00000000-0000-0000-0000-000000000000')
+
+        self.assertRedirects(response, reverse('scanner'), fetch_redirect_response=False)
+        self.assertFalse(Attendance.objects.exists())
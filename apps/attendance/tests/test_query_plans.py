@@ -0,0 +1,76 @@
+import datetime
+from unittest import skipUnless
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from apps.accounts.models import User
+from apps.courses.models import Course, CourseEnrollment
+from apps.sessions.models import Session
+from apps.attendance.models import Attendance
+from apps.attendance.views import ATTENDANCE_LIST_ORDERING
+from apps.sessions.views import PAST_SESSIONS_ORDERING
+from utils.pagination import encode_cursor, keyset_queryset
+
+
+def hot_queries():
+    """The (name, queryset) pairs on the request and scheduler hot paths"""
+    today = datetime.date(2025, 1, 6)
+    now = datetime.time(9, 0)
+    checked_in = datetime.datetime(2025, 1, 6, 9, 5, tzinfo=datetime.timezone.utc)
+    return [
+        ('course_list: attended sessions per course',
+         Attendance.objects.filter(student_id=1, session__course_id=1)),
+        ('course_detail: active sessions today',
+         Session.objects.filter(course_id=1, date=today, start_time__lte=now, end_time__gte=now)),
+        ('session_list: sessions of a course',
+         Session.objects.filter(course_id=1)),
+        ('enrollment check: is the student enrolled',
+         CourseEnrollment.objects.filter(course_id=1, student_id=1, is_active=True)),
+        ('rosters: active enrollments of a course',
+         CourseEnrollment.objects.filter(course_id=1, is_active=True).select_related('student')),
+        ('student_attendance_report: active enrollments of a student',
+         CourseEnrollment.objects.filter(student_id=1, is_active=True).select_related('course')),
+        ('student_attendance_report: attendance of a student in a course',
+         Attendance.objects.filter(session__in=Session.objects.filter(course_id=1), student_id=1)),
+        ('mark_attendance: session by id',
+         Session.objects.filter(id=1)),
+        ('mark_attendance: duplicate check-in',
+         Attendance.objects.filter(session_id=1, student_id=1)),
+        ('session_attendance: attendance of a session',
+         Attendance.objects.filter(session_id=1).select_related('student')),
+        ('generate_upcoming_sessions: existing session',
+         Session.objects.filter(course_id=1, date=today, start_time=now, end_time=now)),
+        ('auto_manage_sessions: expired open sessions',
+         Session.objects.filter(is_closed=False, date__lte=today).filter(
+             Q(date__lt=today) | Q(date=today, end_time__lt=now))),
+        ('course_list: courses of a teacher',
+         Course.objects.filter(teacher_id=1)),
+        ('login: user by email',
+         User.objects.filter(email='student@example.com')),
+        ('attendance_list: a later page of a course',
+         keyset_queryset(
+             Attendance.objects.filter(session__in=Session.objects.filter(course_id=1)).for_list(),
+             ATTENDANCE_LIST_ORDERING, encode_cursor([today, checked_in, 1000]),
+         )[:51]),
+        ('all_sessions: a later page of past sessions',
+         keyset_queryset(
+             Session.objects.filter(course__in=Course.objects.filter(teacher_id=1)).filter(date__lt=today),
+             PAST_SESSIONS_ORDERING, encode_cursor([today, now, 1000]),
+         )[:31]),
+    ]
+
+
+def full_scans(plan):
+    """Return the plan lines that read a whole table or index"""
+    return [line.strip() for line in plan.splitlines() if line.split(' ', 3)[-1].startswith('SCAN')]
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Query plan checks only support SQLite')
+class QueryPlanTests(TestCase):
+    """Hot queries must use an index, according to SQLite's EXPLAIN QUERY PLAN"""
+
+    def test_hot_queries_use_an_index(self):
+        for name, queryset in hot_queries():
+            with self.subTest(name):
+                plan = queryset.explain()
+                self.assertEqual(full_scans(plan), [], f'{name} is planned as a full scan:\n{plan}')
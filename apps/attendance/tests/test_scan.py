@@ -0,0 +1,47 @@
+import uuid
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from utils.qr_generator import compact_token, expand_token, generate_qr_code_url
+
+
+class CompactTokenTests(TestCase):
+    def test_round_trip(self):
+        token = str(uuid.uuid4())
+        code = compact_token(token)
+
+        self.assertRegex(code, r'^[A-Z2-7]{26}$')
+        self.assertEqual(expand_token(code), token)
+
+    def test_lowercase_code_is_expanded(self):
+        token = str(uuid.uuid4())
+
+        self.assertEqual(expand_token(compact_token(token).lower()), token)
+
+    def test_tokens_that_are_not_uuids_are_not_compacted(self):
+        self.assertIsNone(compact_token('not-a-token'))
+        self.assertIsNone(compact_token(str(uuid.uuid4()).upper()))
+
+    def test_invalid_codes(self):
+        self.assertIsNone(expand_token('TOO-SHORT'))
+        self.assertIsNone(expand_token('1' * 26))
+
+    @override_settings(BASE_URL='https://example.com')
+    def test_qr_url_stays_in_the_alphanumeric_set(self):
+        token = str(uuid.uuid4())
+
+        url = generate_qr_code_url(7, token)
+
+        self.assertEqual(url, f'HTTPS://EXAMPLE.COM/S/7/{compact_token(token)}/')
+        self.assertEqual(generate_qr_code_url(7, 'legacy'), 'https://example.com/attendance/mark/7/legacy/')
+
+
+class ScanTests(TestCase):
+    def test_compact_url_redirects_to_mark_attendance(self):
+        token = str(uuid.uuid4())
+
+        response = self.client.get(reverse('scan', args=[7, compact_token(token)]))
+
+        self.assertRedirects(response, reverse('mark_attendance', args=[7, token]), fetch_redirect_response=False)
+
+    def test_invalid_code_is_not_found(self):
+        self.assertEqual(self.client.get(reverse('scan', args=[7, 'NOPE'])).status_code, 404)
@@ -4,10 +4,14 @@ from . import views
 urlpatterns = [
     path('mark/<int:session_id>/<str:token>/', views.mark_attendance, name='mark_attendance'),
     path('course/<int:course_id>/attendance/', views.attendance_list, name='attendance_list'),
+    path('course/<int:course_id>/attendance/rows/', views.attendance_list_rows, name='attendance_list_rows'),
     path('course/<int:course_id>/session/<int:session_id>/attendance/', views.session_attendance, name='session_attendance'),
     path('course/<int:course_id>/session/<int:session_id>/attendance/bulk/', views.bulk_attendance, name='bulk_attendance'),
+    path('course/<int:course_id>/session/<int:session_id>/attendance/kiosk/', views.kiosk_check_ins, name='kiosk_check_ins'),
     path('course/<int:course_id>/session/<int:session_id>/attendance/<int:attendance_id>/delete/', views.delete_attendance, name='delete_attendance'),
     path('report/', views.student_attendance_report, name='student_attendance_report'),
     path('scanner/', views.scanner, name='scanner'),
+    path('scanner/sw.js', views.scanner_service_worker, name='scanner_service_worker'),
+    path('check-ins/', views.queued_check_ins, name='queued_check_ins'),
     path('manual/', views.manual_attendance, name='manual_attendance'),
 ]
@@ -1,52 +1,96 @@
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponseForbidden, JsonResponse
+from django.http import Http404, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils import timezone
-from django.db.models import Q
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.http import require_POST
 from .models import Attendance
 from .forms import AttendanceForm, BulkAttendanceForm, AttendanceFilterForm
 from apps.sessions.models import Session
-from apps.courses.models import Course
+from apps.sessions.state import get_session_state
+from apps.sessions.tokens import qr_token_expiry
+from apps.courses.enrolled import is_enrolled
+from apps.courses.models import Course, CourseEnrollment
+from apps.accounts.search import user_search_q
+from utils.caching import bump_course_version, get_course_versions, get_or_set_course_value
+from utils.db_router import replica_reads
+from utils.live import broker, session_topic
+from utils.metrics import CHECKINS, CHECKIN_DURATION
+from utils.pagination import InvalidCursor, keyset_page
+from utils.qr_generator import expand_token
+
+
+def _scanned_session(session_id, token):
+    """
+    The session a token was scanned for, from this process's snapshot where
+    possible, and until when the token is valid (None if it is not one of
+    the session's)
+    """
+    session = get_session_state(session_id)
+    expiry_time = qr_token_expiry(session, token)
+    if expiry_time is None:
+        # The token may be newer than the snapshot
+        session = get_session_state(session_id, refresh=True)
+        expiry_time = qr_token_expiry(session, token)
+    return session, expiry_time
 
 
 @login_required
+@CHECKIN_DURATION.time(method='scan')
 def mark_attendance(request, session_id, token):
     """Mark attendance for a student by scanning a QR code"""
     
     # Get the session and verify the token
-    session = get_object_or_404(Session, id=session_id)
+    try:
+        session, expiry_time = _scanned_session(session_id, token)
+    except Session.DoesNotExist:
+        raise Http404('No session matches the given query.')
     
     # Check if the token is valid
-    if session.qr_code_token != token:
+    if expiry_time is None:
+        CHECKINS.inc(method='scan', result='invalid_token')
         messages.error(request, 'Invalid QR code. Please try again.')
-        return redirect('course_detail', course_id=session.course.id)
+        return redirect('course_detail', course_id=session.course_id)
     
     # Check if the QR code has expired
-    if not session.qr_is_valid:
+    if session.is_closed or timezone.now() > expiry_time:
+        CHECKINS.inc(method='scan', result='expired')
         messages.error(request, 'This QR code has expired. Please ask your teacher for a new one.')
-        return redirect('course_detail', course_id=session.course.id)
+        return redirect('course_detail', course_id=session.course_id)
     
     # Check if the session is closed
     if session.is_closed:
+        CHECKINS.inc(method='scan', result='closed')
         messages.error(request, 'This session has been closed by the teacher. No further attendance can be marked.')
-        return redirect('course_detail', course_id=session.course.id)
+        return redirect('course_detail', course_id=session.course_id)
     
     # Check if the user is a student
     if not request.user.is_student:
+        CHECKINS.inc(method='scan', result='not_student')
         messages.error(request, 'Only students can mark attendance.')
-        return redirect('course_detail', course_id=session.course.id)
+        return redirect('course_detail', course_id=session.course_id)
     
     # Check if the student is enrolled in the course
-    if not session.course.enrollments.filter(student=request.user, is_active=True).exists():
+    if not is_enrolled(session.course_id, request.user.id):
+        CHECKINS.inc(method='scan', result='not_enrolled')
         messages.error(request, 'You are not enrolled in this course. Attendance cannot be recorded.')
         return redirect('course_list')
     
     # Check if the student has already marked attendance for this session
     if Attendance.objects.filter(session=session, student=request.user).exists():
+        CHECKINS.inc(method='scan', result='duplicate')
         messages.info(request, 'You have already marked your attendance for this session.')
-        return redirect('session_detail', course_id=session.course.id, session_id=session.id)
+        return redirect('session_detail', course_id=session.course_id, session_id=session.id)
     
     # Create attendance record
     attendance = Attendance(
@@ -57,24 +101,38 @@ def mark_attendance(request, session_id, token):
     )
     attendance.save()
     
+    CHECKINS.inc(method='scan', result='recorded')
     messages.success(request, 'Your attendance has been recorded successfully!')
-    return redirect('session_detail', course_id=session.course.id, session_id=session.id)
+    return redirect('session_detail', course_id=session.course_id, session_id=session.id)
 
 
-@login_required
-def attendance_list(request, course_id):
-    """Display attendance records for a course"""
-    
-    course = get_object_or_404(Course, id=course_id)
-    
-    # Check permissions
+def scan(request, session_id, code):
+    """Open the compact URL of a session QR code in mark_attendance"""
+    token = expand_token(code)
+    if token is None:
+        raise Http404('Invalid QR code.')
+    return redirect('mark_attendance', session_id=session_id, token=token)
+
+
+# Newest first; id makes the ordering unique for keyset pagination
+ATTENDANCE_LIST_ORDERING = ('-session__date', '-check_in_time', '-id')
+ATTENDANCE_PAGE_SIZE = 50
+
+
+def _attendance_list_forbidden(request, course):
+    """Return a forbidden response if the user may not see the course's attendance"""
     if request.user.is_teacher:
         if request.user != course.teacher:
             return HttpResponseForbidden("You don't have permission to view attendance for this course.")
     else:
         # Check if student is enrolled
-        if not course.enrollments.filter(student=request.user, is_active=True).exists():
+        if not is_enrolled(course.id, request.user.id):
             return HttpResponseForbidden("You are not enrolled in this course.")
+    return None
+
+
+def _course_attendances(request, course):
+    """Return the attendance records of a course the user sees after the list filters, and the filter form"""
     
     # Get filter form
     filter_form = AttendanceFilterForm(request.GET)
@@ -102,11 +160,7 @@ def attendance_list(request, course_id):
             attendances = attendances.filter(status=status)
         
         if student_query:
-            attendances = attendances.filter(
-                Q(student__first_name__icontains=student_query) |
-                Q(student__last_name__icontains=student_query) |
-                Q(student__email__icontains=student_query)
-            )
+            attendances = attendances.filter(user_search_q(student_query, prefix='student__'))
     else:
         # Get all attendance records for the course
         attendances = Attendance.objects.filter(session__in=sessions)
@@ -115,10 +169,44 @@ def attendance_list(request, course_id):
     if request.user.is_student:
         attendances = attendances.filter(student=request.user)
     
+    return attendances.for_list(), filter_form
+
+
+def _next_page_url(request, view_name, cursor, **kwargs):
+    """URL of the next page, keeping the current filters"""
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query['cursor'] = cursor
+    return f"{reverse(view_name, kwargs=kwargs)}?{query.urlencode()}"
+
+
+@login_required
+def attendance_list(request, course_id):
+    """Display attendance records for a course"""
+    
+    course = get_object_or_404(Course, id=course_id)
+    
+    # Check permissions
+    forbidden = _attendance_list_forbidden(request, course)
+    if forbidden:
+        return forbidden
+    
+    attendances, filter_form = _course_attendances(request, course)
+    
+    # Read from the replica, one page at a time
+    try:
+        with replica_reads():
+            page = keyset_page(attendances, ATTENDANCE_LIST_ORDERING, request.GET.get('cursor'), ATTENDANCE_PAGE_SIZE)
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid page cursor.")
+    
     context = {
         'course': course,
-        'attendances': attendances,
+        'attendances': page.items,
         'filter_form': filter_form,
+        'next_page_url': _next_page_url(request, 'attendance_list', page.next_cursor, course_id=course.id),
+        'next_rows_url': _next_page_url(request, 'attendance_list_rows', page.next_cursor, course_id=course.id),
     }
     
     if request.user.is_teacher:
@@ -127,6 +215,37 @@ def attendance_list(request, course_id):
         return render(request, 'attendance/student_attendance_list.html', context)
 
 
+@login_required
+def attendance_list_rows(request, course_id):
+    """Return the next page of attendance rows as JSON, for infinite scrolling"""
+    
+    course = get_object_or_404(Course, id=course_id)
+    
+    # Check permissions
+    forbidden = _attendance_list_forbidden(request, course)
+    if forbidden:
+        return forbidden
+    
+    attendances, filter_form = _course_attendances(request, course)
+    
+    try:
+        with replica_reads():
+            page = keyset_page(attendances, ATTENDANCE_LIST_ORDERING, request.GET.get('cursor'), ATTENDANCE_PAGE_SIZE)
+    except InvalidCursor:
+        return JsonResponse({'error': 'Invalid page cursor.'}, status=400)
+    
+    if request.user.is_teacher:
+        template = 'attendance/teacher_attendance_rows.html'
+    else:
+        template = 'attendance/student_attendance_rows.html'
+    
+    return JsonResponse({
+        'html': render_to_string(template, {'course': course, 'attendances': page.items}, request=request),
+        'count': len(page.items),
+        'next_url': _next_page_url(request, 'attendance_list_rows', page.next_cursor, course_id=course.id),
+    })
+
+
 @login_required
 def session_attendance(request, course_id, session_id):
     """Manage attendance for a specific session"""
@@ -143,13 +262,13 @@ def session_attendance(request, course_id, session_id):
         is_active=True
     ).select_related('student')
     
-    # Get existing attendance records
+    # Get existing attendance records; the student comes from the enrollment
     attendances = Attendance.objects.filter(
         session=session
-    ).select_related('student')
+    ).only('student', 'status', 'check_in_time')
     
     # Create a dictionary of student IDs to attendance records
-    attendance_dict = {a.student.id: a for a in attendances}
+    attendance_dict = {a.student_id: a for a in attendances}
     
     # Create a list of students with their attendance status
     students_attendance = []
@@ -274,6 +393,7 @@ def delete_attendance(request, course_id, session_id, attendance_id):
 
 
 @login_required
+@replica_reads()
 def student_attendance_report(request):
     """Display attendance report for a student across all courses"""
     
@@ -284,27 +404,38 @@ def student_attendance_report(request):
     # Get all enrollments for the student
     enrollments = request.user.enrollments.filter(is_active=True).select_related('course')
     
+    versions = get_course_versions(enrollment.course_id for enrollment in enrollments)
+    
     # Get attendance records for each course
     courses_attendance = []
     for enrollment in enrollments:
         course = enrollment.course
+        version = versions[course.id]
         
         # Get all sessions for the course
         sessions = Session.objects.filter(course=course)
         
-        # Get attendance records for the student
+        # Get attendance records for the student (only evaluated on a fragment cache miss)
         attendances = Attendance.objects.filter(
             session__in=sessions,
             student=request.user
         ).select_related('session')
         
-        # Calculate attendance statistics
-        total_sessions = sessions.count()
-        attended_sessions = attendances.count()
+        # Calculate attendance statistics, cached until the course changes
+        stats = get_or_set_course_value(
+            course.id, version, ('student', request.user.id, 'stats'),
+            lambda: {
+                'session_count': sessions.count(),
+                'attended_sessions': attendances.count(),
+            }
+        )
+        total_sessions = stats['session_count']
+        attended_sessions = stats['attended_sessions']
         attendance_rate = (attended_sessions / total_sessions * 100) if total_sessions > 0 else 0
         
         courses_attendance.append({
             'course': course,
+            'cache_version': version,
             'total_sessions': total_sessions,
             'attended_sessions': attended_sessions,
             'attendance_rate': attendance_rate,
@@ -332,55 +463,63 @@ def scanner(request):
 
 @login_required
 @require_POST
+@CHECKIN_DURATION.time(method='manual')
 def manual_attendance(request):
     """Mark attendance manually using a code"""
     
     if not request.user.is_student:
+        CHECKINS.inc(method='manual', result='not_student')
         messages.error(request, 'Only students can mark attendance.')
         return redirect('dashboard')
     
     attendance_code = request.POST.get('attendance_code', '').strip()
     
     if not attendance_code:
+        CHECKINS.inc(method='manual', result='malformed')
         messages.error(request, 'Please enter an attendance code.')
         return redirect('scanner')
     
-    # Try to parse the attendance code (format: SESSION_ID-TOKEN)
+    # Try to parse the attendance code (format: SESSION_ID-TOKEN, the token itself contains hyphens)
     try:
-        parts = attendance_code.split('-')
+        parts = attendance_code.split('-', 1)
         if len(parts) != 2:
             raise ValueError("Invalid format")
         
         session_id = int(parts[0])
         token = parts[1]
         
-        # Get the session
-        session = get_object_or_404(Session, id=session_id)
+        # Get the session and verify the token like a scan
+        session, expiry_time = _scanned_session(session_id, token)
         
         # Check if the token is valid
-        if session.qr_code_token != token:
+        if expiry_time is None:
+            CHECKINS.inc(method='manual', result='invalid_token')
             messages.error(request, 'Invalid attendance code. Please check and try again.')
             return redirect('scanner')
         
         # Check if the QR code has expired
-        if not session.qr_is_valid:
+        if timezone.now() > expiry_time:
+            CHECKINS.inc(method='manual', result='expired')
             messages.error(request, 'This attendance code has expired. Please ask your teacher for a new one.')
             return redirect('scanner')
         
         # Check if the session is closed
         if session.is_closed:
+            CHECKINS.inc(method='manual', result='closed')
             messages.error(request, 'This session has been closed by the teacher. No further attendance can be marked.')
             return redirect('scanner')
         
         # Check if the student is enrolled in the course
-        if not session.course.enrollments.filter(student=request.user, is_active=True).exists():
+        if not is_enrolled(session.course_id, request.user.id):
+            CHECKINS.inc(method='manual', result='not_enrolled')
             messages.error(request, 'You are not enrolled in this course. Attendance cannot be recorded.')
             return redirect('course_list')
         
         # Check if the student has already marked attendance for this session
         if Attendance.objects.filter(session=session, student=request.user).exists():
+            CHECKINS.inc(method='manual', result='duplicate')
             messages.info(request, 'You have already marked your attendance for this session.')
-            return redirect('session_detail', course_id=session.course.id, session_id=session.id)
+            return redirect('session_detail', course_id=session.course_id, session_id=session.id)
         
         # Create attendance record
         attendance = Attendance(
@@ -391,9 +530,286 @@ def manual_attendance(request):
         )
         attendance.save()
         
+        CHECKINS.inc(method='manual', result='recorded')
         messages.success(request, 'Your attendance has been recorded successfully!')
-        return redirect('session_detail', course_id=session.course.id, session_id=session.id)
+        return redirect('session_detail', course_id=session.course_id, session_id=session.id)
         
     except (ValueError, Session.DoesNotExist):
+        CHECKINS.inc(method='manual', result='malformed')
         messages.error(request, 'Invalid attendance code. Please check and try again.')
         return redirect('scanner')
+
+
+QUEUED_CHECKIN_BATCH_SIZE = 50
+RECEIPT_SALT = 'attendance.receipt'
+
+
+def _epoch_ms(value):
+    """Datetime from a JavaScript timestamp, as sent by the scanner"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError('Timestamp must be a number')
+    return datetime.fromtimestamp(value / 1000, tz=dt_timezone.utc)
+
+
+def _queued_check_in(request, scan, offset, sessions, enrolled_course_ids, attended_session_ids):
+    """Validate and record one queued scan, returning (result, message, attendance)"""
+    
+    try:
+        session_id = scan['session_id']
+        token = scan['token']
+        # Device clocks drift, so move the capture time onto the server clock
+        captured_at = _epoch_ms(scan['captured_at']) + offset
+        if not isinstance(session_id, int) or not isinstance(token, str):
+            raise TypeError('Invalid scan')
+        # Scans of compact QR URLs carry the base32 form of the token
+        token = expand_token(token) or token
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return 'malformed', 'This scan could not be read.', None
+    
+    now = timezone.now()
+    skew = timedelta(seconds=settings.QUEUED_CHECKIN_SKEW)
+    if captured_at > now + skew:
+        return 'malformed', 'This scan has an invalid capture time.', None
+    if captured_at < now - timedelta(seconds=settings.QUEUED_CHECKIN_MAX_AGE):
+        return 'expired', 'This scan was submitted too late to be accepted.', None
+    
+    session = sessions.get(session_id)
+    expiry_time = qr_token_expiry(session, token, captured_at) if session else None
+    if expiry_time is None:
+        return 'invalid_token', 'Invalid QR code.', None
+    if captured_at > expiry_time + skew:
+        return 'expired', 'This QR code had already expired when it was scanned.', None
+    if session.is_closed:
+        return 'closed', 'This session has been closed by the teacher.', None
+    if session.course_id not in enrolled_course_ids:
+        return 'not_enrolled', 'You are not enrolled in this course.', None
+    if session.id in attended_session_ids:
+        return 'duplicate', 'You have already marked your attendance for this session.', None
+    
+    # Attendance.save() decides lateness from the time of the scan, not of the upload
+    attendance = Attendance(
+        session=session,
+        student=request.user,
+        check_in_time=min(captured_at, now),
+        ip_address=request.META.get('REMOTE_ADDR', ''),
+        device_info=request.META.get('HTTP_USER_AGENT', '')[:255]
+    )
+    try:
+        with transaction.atomic():
+            attendance.save()
+    except IntegrityError:
+        # Recorded by a concurrent request in the meantime
+        return 'duplicate', 'You have already marked your attendance for this session.', None
+    
+    attended_session_ids.add(session.id)
+    return 'recorded', 'Your attendance has been recorded.', attendance
+
+
+@login_required
+@require_POST
+@CHECKIN_DURATION.time(method='queued')
+def queued_check_ins(request):
+    """
+    Record scans that the scanner captured earlier, possibly offline, and
+    submits as a batch. Each scan is accepted if its token was valid when it
+    was captured; the response has a result and, for recorded scans, a signed
+    receipt per scan.
+    """
+    
+    if not request.user.is_student:
+        return JsonResponse({'error': 'Only students can mark attendance.'}, status=403)
+    
+    try:
+        payload = json.loads(request.body)
+        scans = payload['scans']
+        offset = timezone.now() - _epoch_ms(payload['sent_at'])
+        if not isinstance(scans, list) or len(scans) > QUEUED_CHECKIN_BATCH_SIZE:
+            raise ValueError('Invalid batch')
+        if not all(isinstance(scan, dict) for scan in scans):
+            raise ValueError('Invalid scan')
+    except (ValueError, KeyError, TypeError, OverflowError):
+        return JsonResponse({'error': 'Invalid check-in batch.'}, status=400)
+    
+    # Everything the checks need, in three queries for the whole batch
+    session_ids = [scan.get('session_id') for scan in scans]
+    sessions = Session.objects.in_bulk([i for i in session_ids if isinstance(i, int) and not isinstance(i, bool)])
+    enrolled_course_ids = set(CourseEnrollment.objects.filter(
+        student=request.user, is_active=True, course_id__in={session.course_id for session in sessions.values()}
+    ).values_list('course_id', flat=True))
+    attended_session_ids = set(Attendance.objects.filter(
+        student=request.user, session_id__in=sessions.keys()
+    ).values_list('session_id', flat=True))
+    
+    results = []
+    for scan in scans:
+        result, message, attendance = _queued_check_in(
+            request, scan, offset, sessions, enrolled_course_ids, attended_session_ids
+        )
+        CHECKINS.inc(method='queued', result=result)
+        item = {'id': scan.get('id'), 'session_id': scan.get('session_id'), 'result': result, 'message': message}
+        if attendance:
+            item['check_in_time'] = attendance.check_in_time
+            item['status'] = attendance.status
+            item['receipt'] = signing.dumps({
+                'attendance': attendance.id,
+                'session': attendance.session_id,
+                'student': attendance.student_id,
+                'check_in_time': attendance.check_in_time.isoformat(),
+                'status': attendance.status,
+            }, salt=RECEIPT_SALT)
+        results.append(item)
+    
+    return JsonResponse({'results': results})
+
+
+def scanner_service_worker(request):
+    """Service worker that keeps the scanner usable offline and submits queued scans"""
+    response = render(request, 'attendance/scanner_sw.js', content_type='application/javascript')
+    # Browsers check for a new worker on navigation; never serve them a stale copy
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+KIOSK_BATCH_SIZE = 1000
+
+
+def _kiosk_scan_time(value):
+    """Aware datetime from an ISO 8601 kiosk timestamp, or None if it cannot be read"""
+    try:
+        check_in_time = parse_datetime(value) if isinstance(value, str) else None
+    except ValueError:
+        return None
+    if check_in_time is not None and timezone.is_naive(check_in_time):
+        check_in_time = timezone.make_aware(check_in_time)
+    return check_in_time
+
+
+@login_required
+@require_POST
+@CHECKIN_DURATION.time(method='kiosk')
+def kiosk_check_ins(request, course_id, session_id):
+    """
+    Record a batch of check-ins from a teacher's kiosk. The body is JSON
+    {"scans": [{"student": <email or username>, "timestamp": <ISO 8601>}]}.
+    Students are resolved in one query and everything is written in one
+    transaction. Absent records are turned into check-ins; other existing
+    records are left as they are.
+    """
+    
+    course = get_object_or_404(Course, id=course_id)
+    session = get_object_or_404(Session, id=session_id, course=course)
+    
+    if not request.user.is_teacher or request.user != course.teacher:
+        return JsonResponse({'error': "You don't have permission to manage attendance for this session."}, status=403)
+    
+    try:
+        scans = json.loads(request.body)['scans']
+        if not isinstance(scans, list) or len(scans) > KIOSK_BATCH_SIZE:
+            raise ValueError('Invalid batch')
+        if not all(isinstance(scan, dict) for scan in scans):
+            raise ValueError('Invalid scan')
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'Invalid check-in batch.'}, status=400)
+    
+    # Active students of the course matching any identifier of the batch, by email or username
+    identifiers = {str(scan.get('student', '')).strip() for scan in scans} - {''}
+    enrollments = CourseEnrollment.objects.filter(course=course, is_active=True).annotate(
+        student_email=Lower('student__email')
+    ).filter(
+        Q(student__username__in=identifiers) | Q(student_email__in={identifier.lower() for identifier in identifiers})
+    ).values_list('student_id', 'student__username', 'student_email')
+    students = {}
+    for student_id, username, email in enrollments:
+        students[username] = student_id
+        students[email] = student_id
+    
+    session_start = timezone.make_aware(datetime.combine(session.date, session.start_time))
+    session_end = timezone.make_aware(datetime.combine(session.date, session.end_time))
+    latest = timezone.now() + timedelta(seconds=settings.QUEUED_CHECKIN_SKEW)
+    
+    # The earliest valid scan of each student wins
+    results = [None] * len(scans)
+    first_scans = {}
+    for index, scan in enumerate(scans):
+        identifier = str(scan.get('student', '')).strip()
+        student_id = students.get(identifier, students.get(identifier.lower()))
+        check_in_time = _kiosk_scan_time(scan.get('timestamp'))
+        if student_id is None:
+            results[index] = 'unknown_student'
+        elif check_in_time is None or check_in_time > latest:
+            results[index] = 'invalid_time'
+        elif not session_start - timedelta(minutes=15) <= check_in_time <= session_end:
+            results[index] = 'outside_session'
+        elif student_id in first_scans and first_scans[student_id][1] <= check_in_time:
+            results[index] = 'duplicate'
+        else:
+            if student_id in first_scans:
+                results[first_scans[student_id][0]] = 'duplicate'
+            first_scans[student_id] = (index, check_in_time)
+    
+    with transaction.atomic():
+        existing = {
+            attendance.student_id: attendance
+            for attendance in Attendance.objects.filter(
+                session=session, student_id__in=first_scans.keys()
+            ).only('id', 'student_id', 'status')
+        }
+        
+        new, updated = [], []
+        for student_id, (index, check_in_time) in first_scans.items():
+            status = Attendance.check_in_status(session, check_in_time)
+            attendance = existing.get(student_id)
+            if attendance is None:
+                new.append(Attendance(
+                    session=session,
+                    student_id=student_id,
+                    check_in_time=check_in_time,
+                    status=status,
+                    ip_address=request.META.get('REMOTE_ADDR', ''),
+                    device_info=request.META.get('HTTP_USER_AGENT', '')[:255]
+                ))
+            elif attendance.status == Attendance.Status.ABSENT:
+                attendance.check_in_time = check_in_time
+                attendance.status = status
+                updated.append(attendance)
+                results[index] = 'recorded'
+            else:
+                results[index] = 'duplicate'
+        
+        # Only a check-in racing this batch can conflict; it is kept as it is
+        Attendance.objects.bulk_create(new, ignore_conflicts=True)
+        Attendance.objects.bulk_update(updated, ['check_in_time', 'status'])
+        
+        # Ignored conflicts are not reported, so look up which rows are this batch's
+        inserted = []
+        if new:
+            check_in_times = {attendance.student_id: attendance.check_in_time for attendance in new}
+            for attendance in Attendance.objects.filter(
+                session=session, student_id__in=check_in_times.keys()
+            ).select_related('student'):
+                if attendance.check_in_time == check_in_times[attendance.student_id]:
+                    inserted.append(attendance)
+            inserted_ids = {attendance.student_id for attendance in inserted}
+            for student_id in check_in_times:
+                results[first_scans[student_id][0]] = 'recorded' if student_id in inserted_ids else 'duplicate'
+        
+        # Bulk writes bypass the signals that invalidate the course's cached
+        # pages and push new rows to the live rosters
+        def committed():
+            bump_course_version(course.id)
+            for attendance in inserted:
+                broker.publish(session_topic(session.id), attendance)
+        
+        if inserted or updated:
+            transaction.on_commit(committed)
+    
+    statuses = {first_scans[attendance.student_id][0]: attendance.status for attendance in inserted + updated}
+    response = []
+    for index, scan in enumerate(scans):
+        CHECKINS.inc(method='kiosk', result=results[index])
+        item = {'student': scan.get('student'), 'result': results[index]}
+        if index in statuses:
+            item['status'] = statuses[index]
+        response.append(item)
+    
+    return JsonResponse({'results': response, 'recorded': len(statuses)})
@@ -12,8 +12,8 @@ class CourseEnrollmentInline(admin.TabularInline):
 class CourseAdmin(admin.ModelAdmin):
     list_display = ('name', 'code', 'teacher', 'student_count', 'is_active', 'created_at')
     list_filter = ('is_active', 'created_at')
-    search_fields = ('name', 'code', 'description', 'teacher__email', 'teacher__first_name', 'teacher__last_name')
-    readonly_fields = ('created_at', 'updated_at')
+    search_fields = ('name', 'code', 'join_code', 'description', 'teacher__email', 'teacher__first_name', 'teacher__last_name')
+    readonly_fields = ('join_code', 'created_at', 'updated_at')
     inlines = [CourseEnrollmentInline]
 
 
@@ -0,0 +1,93 @@
+from array import array
+from bisect import bisect_left
+from django.conf import settings
+from django.core.cache import cache
+from utils.caching import bump_version, get_version
+from .models import CourseEnrollment
+
+
+# The active students of a course as a sorted array of ids, shared through the
+# cache. Keys carry a generation: bumping it drops the set, and with it any
+# copy a racing writer is about to store under the old key. Sets also expire
+# after ENROLLED_CACHE_TTL seconds, so changes made where the cache is not
+# shared (another process with the locmem backend) are seen after that.
+ENROLLED_KEY = 'course:{course_id}:enrolled:{generation}'
+ENROLLED_GENERATION_KEY = 'course:{course_id}:enrolled'
+ENROLLED_LOCK_KEY = 'course:{course_id}:enrolled:lock'
+ENROLLED_LOCK_TIMEOUT = 5
+
+
+def _key(course_id):
+    generation = get_version(ENROLLED_GENERATION_KEY.format(course_id=course_id))
+    return ENROLLED_KEY.format(course_id=course_id, generation=generation)
+
+
+def _unpack(data):
+    ids = array('q')
+    ids.frombytes(data)
+    return ids
+
+
+def enrolled_student_ids(course_id):
+    """Return the sorted ids of the course's active students, loading them on a cache miss"""
+    key = _key(course_id)
+    data = cache.get(key)
+    if data is not None:
+        return _unpack(data)
+
+    ids = array('q', CourseEnrollment.objects.filter(
+        course_id=course_id, is_active=True
+    ).order_by('student_id').values_list('student_id', flat=True))
+    # add(), not set(): a set updated while this one was loading is more recent
+    cache.add(key, ids.tobytes(), timeout=settings.ENROLLED_CACHE_TTL)
+    return ids
+
+
+def is_enrolled(course_id, student_id):
+    """Whether a student is actively enrolled in a course, by binary search of its cached set"""
+    ids = enrolled_student_ids(course_id)
+    position = bisect_left(ids, student_id)
+    return position < len(ids) and ids[position] == student_id
+
+
+def forget_enrolled(course_id):
+    """Drop the cached set of a course, e.g. after a bulk write; it is reloaded on next use"""
+    bump_version(ENROLLED_GENERATION_KEY.format(course_id=course_id))
+
+
+def _update(course_id, student_id, enrolled):
+    """Add or remove one student in the cached set, or drop the set if that cannot be done safely"""
+    lock = ENROLLED_LOCK_KEY.format(course_id=course_id)
+    if not cache.add(lock, True, timeout=ENROLLED_LOCK_TIMEOUT):
+        # Another process is updating the set
+        forget_enrolled(course_id)
+        return
+    try:
+        key = _key(course_id)
+        data = cache.get(key)
+        if data is None:
+            # A set may be loading from before this change
+            forget_enrolled(course_id)
+            return
+        ids = _unpack(data)
+        position = bisect_left(ids, student_id)
+        present = position < len(ids) and ids[position] == student_id
+        if enrolled and not present:
+            ids.insert(position, student_id)
+        elif not enrolled and present:
+            del ids[position]
+        else:
+            return
+        cache.set(key, ids.tobytes(), timeout=settings.ENROLLED_CACHE_TTL)
+    finally:
+        cache.delete(lock)
+
+
+def add_enrolled(course_id, student_id):
+    """Record in the cached set that a student joined a course"""
+    _update(course_id, student_id, True)
+
+
+def remove_enrolled(course_id, student_id):
+    """Record in the cached set that a student left a course"""
+    _update(course_id, student_id, False)
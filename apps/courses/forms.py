@@ -1,4 +1,5 @@
 from django import forms
+from .join_codes import normalize_join_code
 from .models import Course, CourseEnrollment
 
 
@@ -55,36 +56,50 @@ class CourseEnrollmentForm(forms.ModelForm):
 
 
 class CourseJoinForm(forms.Form):
-    """Form for students to join a course using a course code"""
+    """Form for students to join a course using its join code"""
     
     course_code = forms.CharField(
-        max_length=40,  # Increased to accommodate longer QR format
-        label='Course Code',
-        help_text='Enter the full extended code provided by your teacher (includes a hyphen)',
-        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'e.g., MATH101-ABC123DEF456'})
+        max_length=40,
+        label='Join Code',
+        help_text='The 8-character join code shown by your teacher',
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'e.g., K7QM-3XHD',
+            'autocapitalize': 'characters',
+            'autocomplete': 'off',
+        })
     )
     
     def __init__(self, *args, **kwargs):
         self.student = kwargs.pop('student', None)
+        self.course = None
         super().__init__(*args, **kwargs)
     
     def clean_course_code(self):
-        code = self.cleaned_data.get('course_code')
+        code = self.cleaned_data.get('course_code', '').strip()
+        courses = Course.objects.filter(is_active=True).only('id', 'name')
         
-        # Require the code to be in the extended format (course_code-longerqrcode)
-        if '-' not in code:
-            raise forms.ValidationError('Please enter the full extended code. It should contain a hyphen (-).')
+        self.course = courses.filter(join_code=normalize_join_code(code)).first()
+        if self.course is None:
+            # Course codes shared before join codes existed still work
+            self.course = courses.filter(code=code).first()
+        if self.course is None:
+            raise forms.ValidationError('Invalid join code. Please check and try again.')
         
-        # Extract the actual course code from the QR format
-        actual_code = code.split('-')[0]
-        
-        try:
-            course = Course.objects.get(code=actual_code, is_active=True)
-            
-            # Check if student is already enrolled
-            if self.student and CourseEnrollment.objects.filter(course=course, student=self.student).exists():
-                raise forms.ValidationError('You are already enrolled in this course.')
-                
-            return code  # Return the original extended code
-        except Course.DoesNotExist:
-            raise forms.ValidationError('Invalid course code. Please check and try again.')
+        return code
+
+
+class RosterImportForm(forms.Form):
+    """Form for teachers to enroll a class list in a course"""
+    
+    roster = forms.FileField(
+        label='Class List',
+        help_text='A CSV or XLSX file with an "email" column and, optionally, "first name" and "last name" columns',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'})
+    )
+    
+    def clean_roster(self):
+        roster = self.cleaned_data.get('roster')
+        if roster and not roster.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError('Please upload a CSV or XLSX file.')
+        return roster
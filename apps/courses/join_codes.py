@@ -0,0 +1,43 @@
+import re
+import secrets
+from django.core import signing
+
+
+# Letters and digits that cannot be mistaken for one another when read off a
+# projector or typed on a phone: no 0/O, 1/I/L or U/V
+JOIN_CODE_ALPHABET = '23456789ABCDEFGHJKMNPQRSTWXYZ'
+JOIN_CODE_LENGTH = 8
+
+JOIN_TOKEN_SALT = 'courses.join'
+
+_SEPARATORS = re.compile(r'[\s-]+')
+
+
+def generate_join_code():
+    """A random join code, e.g. ``K7QM3XHD``"""
+    return ''.join(secrets.choice(JOIN_CODE_ALPHABET) for _ in range(JOIN_CODE_LENGTH))
+
+
+def normalize_join_code(value):
+    """Uppercase a typed join code and drop the spaces and hyphens it was shown with"""
+    return _SEPARATORS.sub('', value or '').upper()
+
+
+def format_join_code(code):
+    """Split a join code in two halves for display, e.g. ``K7QM-3XHD``"""
+    half = len(code) // 2
+    return f'{code[:half]}-{code[half:]}'
+
+
+def make_join_token(course):
+    """Signed token for a course's join link; it stops working when the join code changes"""
+    return signing.Signer(salt=JOIN_TOKEN_SALT).sign(f'{course.id}.{course.join_code}')
+
+
+def read_join_token(token):
+    """Return the (course id, join code) of a join token, or None if it was not signed by us"""
+    try:
+        course_id, join_code = signing.Signer(salt=JOIN_TOKEN_SALT).unsign(token).split('.', 1)
+        return int(course_id), join_code
+    except (signing.BadSignature, ValueError):
+        return None
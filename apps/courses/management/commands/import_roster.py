@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.courses.models import Course
+from apps.courses.roster import ROSTER_BATCH_SIZE, RosterError, import_roster, read_roster
+
+
+class Command(BaseCommand):
+    help = 'Enrolls the students listed in CSV or XLSX rosters (email, first name, last name) in a course'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course', help='Course code or id')
+        parser.add_argument('files', nargs='+', help='CSV or XLSX roster files with an "email" column')
+        parser.add_argument('--batch-size', type=int, default=ROSTER_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        course = Course.objects.filter(code=options['course']).first()
+        if course is None and options['course'].isdigit():
+            course = Course.objects.filter(id=int(options['course'])).first()
+        if course is None:
+            raise CommandError(f"No course with the code or id {options['course']}.")
+
+        for path in options['files']:
+            try:
+                with open(path, 'rb') as file:
+                    result = import_roster(course, read_roster(file, path), batch_size=options['batch_size'])
+            except (OSError, RosterError) as e:
+                raise CommandError(f'{path}: {e}')
+
+            for row, email, reason in result.skipped:
+                self.stdout.write(self.style.WARNING(f'{path}:{row}: skipped {email or "(no email)"}: {reason}'))
+            self.stdout.write(self.style.SUCCESS(f'{path}: {result.summary()}'))
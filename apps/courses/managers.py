@@ -0,0 +1,37 @@
+from django.db import models
+from django.db.models.functions import Substr
+
+
+# List cards show descriptions through truncatechars:100; one extra character
+# keeps the ellipsis when the full description is longer.
+DESCRIPTION_PREVIEW_LENGTH = 101
+
+
+def description_preview(field='description'):
+    """The start of a description, enough for a list card"""
+    return Substr(field, 1, DESCRIPTION_PREVIEW_LENGTH)
+
+
+class CourseQuerySet(models.QuerySet):
+    """Queries for courses"""
+    
+    def for_list(self):
+        """Course cards: the description is replaced by its preview"""
+        return self.defer('description').annotate(description_preview=description_preview())
+
+
+class CourseEnrollmentQuerySet(models.QuerySet):
+    """Queries for enrollments"""
+    
+    def enroll(self, course_id, student):
+        """
+        Enroll a student, or re-activate a student who left, in one upsert.
+        Like any bulk write it skips the signals, so the caller bumps the
+        course version.
+        """
+        self.bulk_create(
+            [self.model(course_id=course_id, student=student, is_active=True)],
+            update_conflicts=True,
+            unique_fields=['course', 'student'],
+            update_fields=['is_active'],
+        )
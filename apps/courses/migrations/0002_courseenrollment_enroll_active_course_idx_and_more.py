@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='courseenrollment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['course'], name='enroll_active_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='courseenrollment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['student'], name='enroll_active_student_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+from apps.courses.join_codes import generate_join_code
+
+
+def fill_join_codes(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    courses = list(Course.objects.only('id'))
+    used = set()
+    for course in courses:
+        code = generate_join_code()
+        while code in used:
+            code = generate_join_code()
+        used.add(code)
+        course.join_code = code
+    Course.objects.bulk_update(courses, ['join_code'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_courseenrollment_enroll_active_course_idx_and_more'),
+    ]
+
+    operations = [
+        # Added nullable first: a callable default would give every existing course the same code
+        migrations.AddField(
+            model_name='course',
+            name='join_code',
+            field=models.CharField(editable=False, max_length=8, null=True),
+        ),
+        migrations.RunPython(fill_join_codes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='course',
+            name='join_code',
+            field=models.CharField(default=generate_join_code, editable=False, max_length=8, unique=True),
+        ),
+    ]
@@ -2,6 +2,8 @@ import uuid
 from django.db import models
 from django.conf import settings
 from django.utils.text import slugify
+from .join_codes import generate_join_code
+from .managers import CourseEnrollmentQuerySet, CourseQuerySet
 
 
 class Course(models.Model):
@@ -9,6 +11,8 @@ class Course(models.Model):
     
     name = models.CharField(max_length=100)
     code = models.CharField(max_length=20, unique=True)
+    # What students type or scan to enroll; see join_codes.py
+    join_code = models.CharField(max_length=8, unique=True, default=generate_join_code, editable=False)
     description = models.TextField(blank=True)
     teacher = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -20,6 +24,8 @@ class Course(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
+    objects = CourseQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
     
@@ -57,9 +63,16 @@ class CourseEnrollment(models.Model):
     enrollment_date = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
     
+    objects = CourseEnrollmentQuerySet.as_manager()
+    
     class Meta:
         unique_together = ['course', 'student']
         ordering = ['-enrollment_date']
+        indexes = [
+            # Active rosters and a student's active courses; partial where the database supports it
+            models.Index(fields=['course'], condition=models.Q(is_active=True), name='enroll_active_course_idx'),
+            models.Index(fields=['student'], condition=models.Q(is_active=True), name='enroll_active_student_idx'),
+        ]
     
     def __str__(self):
         return f"{self.student.get_full_name()} enrolled in {self.course.name}"
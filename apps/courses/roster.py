@@ -0,0 +1,212 @@
+import csv
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+from apps.accounts.models import User
+from utils.caching import bump_course_version
+from .enrolled import forget_enrolled
+from .models import CourseEnrollment
+
+
+ROSTER_BATCH_SIZE = 500
+
+# Accepted spellings of the roster columns; only the email column is required
+COLUMNS = {
+    'email': {'email', 'email address', 'e-mail'},
+    'first_name': {'first_name', 'first name', 'firstname', 'given name'},
+    'last_name': {'last_name', 'last name', 'lastname', 'surname', 'family name'},
+}
+
+
+class RosterError(ValueError):
+    """A roster file that cannot be read"""
+
+
+@dataclass
+class RosterImportResult:
+    """Counts of a roster import"""
+
+    rows: int = 0
+    created_users: int = 0
+    enrolled: int = 0
+    reactivated: int = 0
+    already_enrolled: int = 0
+    skipped: list = field(default_factory=list)
+    seconds: float = 0
+
+    def summary(self):
+        return (
+            f'{self.rows} rows: {self.enrolled} enrolled, {self.reactivated} re-enrolled, '
+            f'{self.already_enrolled} already enrolled, {len(self.skipped)} skipped, '
+            f'{self.created_users} new accounts in {self.seconds:.2f}s'
+        )
+
+
+def _records(rows):
+    """Turn rows of cells, the first being the header, into column dicts"""
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        raise RosterError('The roster file is empty.')
+
+    positions = {}
+    for position, title in enumerate(header):
+        title = str(title or '').strip().lower()
+        for column, spellings in COLUMNS.items():
+            if title in spellings:
+                positions.setdefault(column, position)
+    if 'email' not in positions:
+        raise RosterError('The roster needs an "email" column.')
+
+    for row in rows:
+        yield {
+            column: str(row[position] or '').strip() if position < len(row) else ''
+            for column, position in positions.items()
+        }
+
+
+def read_roster(file, name):
+    """
+    Yield {'email', 'first_name', 'last_name'} dicts from a CSV or XLSX
+    upload, streaming it rather than loading it whole
+    """
+    if name.lower().endswith('.xlsx'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise RosterError('Reading XLSX rosters requires openpyxl; upload a CSV file instead.')
+        try:
+            sheet = load_workbook(file, read_only=True, data_only=True).active
+        except Exception as e:
+            raise RosterError(f'The XLSX file could not be read: {e}')
+        return _records(sheet.iter_rows(values_only=True))
+
+    return _records(_csv_rows(file))
+
+
+def _decoded_lines(file):
+    """Lines of a binary upload as text, decoded one at a time so errors point at their line"""
+    for number, line in enumerate(file, 1):
+        yield line.decode('utf-8-sig' if number == 1 else 'utf-8')
+
+
+def _csv_rows(file):
+    """Rows of a CSV upload, with files that cannot be decoded or parsed reported as RosterError"""
+    reader = csv.reader(_decoded_lines(file))
+    row = 0
+    while True:
+        row += 1
+        try:
+            cells = next(reader)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            raise RosterError(f'Row {row} is not UTF-8 text. Save the class list as "CSV UTF-8" and upload it again.')
+        except csv.Error as e:
+            raise RosterError(f'Row {row} could not be read: {e}')
+        yield cells
+
+
+def _batches(records, size):
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+def _import_batch(course, batch, result, seen):
+    """Import one batch of roster records, adding to ``result``"""
+    rows = {}
+    for record in batch:
+        result.rows += 1
+        # Row numbers as in a spreadsheet, where the header is row 1
+        row = result.rows + 1
+        email = record.get('email', '').lower()
+        try:
+            validate_email(email)
+        except ValidationError:
+            result.skipped.append((row, record.get('email', ''), 'invalid email'))
+            continue
+        if email in seen:
+            result.skipped.append((row, email, 'duplicate row'))
+            continue
+        seen.add(email)
+        rows[email] = (row, record)
+
+    users = {
+        email: (user_id, role)
+        for user_id, email, role in User.objects.annotate(email_lower=Lower('email')).filter(
+            email_lower__in=rows.keys()
+        ).values_list('id', 'email_lower', 'role')
+    }
+
+    # New accounts use the email as username, which another account may already have
+    unknown = rows.keys() - users.keys()
+    for email in User.objects.filter(username__in=unknown).values_list('username', flat=True):
+        unknown.discard(email)
+        result.skipped.append((rows[email][0], email, 'username taken by an account with another email'))
+
+    new_users = User.objects.bulk_create_users(
+        User(
+            email=email,
+            username=email,
+            first_name=rows[email][1].get('first_name', '')[:150],
+            last_name=rows[email][1].get('last_name', '')[:150],
+            role=User.Role.STUDENT,
+        )
+        for email in unknown
+    )
+    result.created_users += len(new_users)
+    users.update((user.email.lower(), (user.id, user.role)) for user in new_users)
+
+    student_ids = set()
+    for email, (user_id, role) in users.items():
+        if role == User.Role.STUDENT:
+            student_ids.add(user_id)
+        else:
+            result.skipped.append((rows[email][0], email, 'not a student account'))
+
+    enrolled = dict(CourseEnrollment.objects.filter(
+        course=course, student_id__in=student_ids
+    ).values_list('student_id', 'is_active'))
+    result.already_enrolled += sum(enrolled.values())
+
+    reactivate = [student_id for student_id, is_active in enrolled.items() if not is_active]
+    if reactivate:
+        result.reactivated += CourseEnrollment.objects.filter(
+            course=course, student_id__in=reactivate
+        ).update(is_active=True)
+
+    # Conflicts can only come from students joining while the import runs
+    new = CourseEnrollment.objects.bulk_create(
+        (CourseEnrollment(course=course, student_id=student_id) for student_id in student_ids - enrolled.keys()),
+        ignore_conflicts=True,
+    )
+    result.enrolled += len(new)
+
+
+def import_roster(course, records, batch_size=ROSTER_BATCH_SIZE):
+    """
+    Enroll the students of a roster in a course. Users are matched by email,
+    ignoring case, and created with an unusable password for unknown emails.
+    Each batch costs a handful of queries whatever its size, and is committed
+    on its own so that check-ins are not held up for the whole file.
+    """
+    start = time.perf_counter()
+    result = RosterImportResult()
+    seen = set()
+
+    try:
+        for batch in _batches(iter(records), batch_size):
+            with transaction.atomic():
+                _import_batch(course, batch, result, seen)
+    finally:
+        # Bulk writes bypass the signals that invalidate the course's cached pages
+        if result.enrolled or result.reactivated:
+            bump_course_version(course.id)
+            forget_enrolled(course.id)
+
+    result.seconds = time.perf_counter() - start
+    return result
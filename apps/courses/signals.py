@@ -0,0 +1,33 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from utils.caching import bump_course_version
+from .enrolled import add_enrolled, remove_enrolled
+from .models import Course, CourseEnrollment
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_cache(sender, instance, **kwargs):
+    """Invalidate cached fragments when a course changes"""
+    bump_course_version(instance.id)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def invalidate_enrollment_cache(sender, instance, **kwargs):
+    """Invalidate cached fragments when a student joins or leaves a course"""
+    bump_course_version(instance.course_id)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def update_enrolled_set(sender, instance, **kwargs):
+    """Add or remove the student in the course's cached enrollment set once the change is committed"""
+    update = add_enrolled if instance.is_active else remove_enrolled
+    transaction.on_commit(lambda: update(instance.course_id, instance.student_id))
+
+
+@receiver(post_delete, sender=CourseEnrollment)
+def remove_from_enrolled_set(sender, instance, **kwargs):
+    """Remove the student from the course's cached enrollment set once the deletion is committed"""
+    transaction.on_commit(lambda: remove_enrolled(instance.course_id, instance.student_id))
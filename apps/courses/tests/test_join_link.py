@@ -0,0 +1,45 @@
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from apps.accounts.models import User
+from apps.courses.join_codes import make_join_token
+from apps.courses.models import Course, CourseEnrollment
+
+
+# Pages are rendered without running collectstatic first
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+class JoinCourseLinkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user(
+            email='teacher@example.com', username='teacher', password='x', role=User.Role.TEACHER,
+        )
+        cls.student = User.objects.create_user(email='student@example.com', username='student', password='x')
+        cls.course = Course.objects.create(name='Biology', teacher=teacher)
+        cls.url = reverse('join_course_link', args=[make_join_token(cls.course)])
+
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.force_login(self.student)
+
+    def test_get_asks_for_confirmation_without_enrolling(self):
+        response = self.client.get(self.url)
+
+        self.assertContains(response, 'Biology')
+        self.assertFalse(CourseEnrollment.objects.filter(course=self.course, student=self.student).exists())
+
+    def test_post_enrolls(self):
+        token = self.client.get(self.url).context['csrf_token']
+
+        response = self.client.post(self.url, {'csrfmiddlewaretoken': token})
+
+        self.assertRedirects(response, reverse('course_detail', args=[self.course.id]), fetch_redirect_response=False)
+        self.assertTrue(CourseEnrollment.objects.filter(course=self.course, student=self.student).exists())
+
+    def test_post_without_csrf_token_is_refused(self):
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(CourseEnrollment.objects.filter(course=self.course, student=self.student).exists())
@@ -0,0 +1,81 @@
+import io
+from django.test import TestCase
+from apps.accounts.models import User
+from apps.courses.models import Course, CourseEnrollment
+from apps.courses.roster import RosterError, import_roster, read_roster
+
+
+def csv_file(text, encoding='utf-8'):
+    return io.BytesIO(text.encode(encoding))
+
+
+class ReadRosterTests(TestCase):
+    def test_reads_columns_by_header(self):
+        records = list(read_roster(csv_file('Surname,E-mail\nCurie,marie@example.com\n'), 'roster.csv'))
+
+        self.assertEqual(records, [{'last_name': 'Curie', 'email': 'marie@example.com'}])
+
+    def test_missing_email_column(self):
+        with self.assertRaisesMessage(RosterError, 'email'):
+            list(read_roster(csv_file('name\nMarie\n'), 'roster.csv'))
+
+    def test_undecodable_row_is_reported_with_its_number(self):
+        with self.assertRaisesMessage(RosterError, 'Row 3 is not UTF-8 text'):
+            list(read_roster(csv_file('email\na@example.com\nb\xe9@example.com\n', 'latin-1'), 'roster.csv'))
+
+
+class ImportRosterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user(
+            email='teacher@example.com', username='teacher', password='x', role=User.Role.TEACHER,
+        )
+        cls.course = Course.objects.create(name='Biology', teacher=teacher)
+
+    def import_csv(self, text, **kwargs):
+        return import_roster(self.course, read_roster(csv_file(text), 'roster.csv'), **kwargs)
+
+    def test_creates_and_enrolls_students(self):
+        existing = User.objects.create_user(email='Known@Example.com', username='known', password='x')
+
+        result = self.import_csv('email,first name\nknown@example.com,\nnew@example.com,Ada\n')
+
+        self.assertEqual((result.rows, result.created_users, result.enrolled), (2, 1, 2))
+        self.assertEqual(User.objects.get(email='new@example.com').first_name, 'Ada')
+        self.assertTrue(CourseEnrollment.objects.filter(course=self.course, student=existing, is_active=True).exists())
+
+    def test_reactivates_and_counts_enrolled_students(self):
+        student = User.objects.create_user(email='a@example.com', username='a', password='x')
+        CourseEnrollment.objects.create(course=self.course, student=student, is_active=False)
+
+        result = self.import_csv('email\na@example.com\n')
+
+        self.assertEqual((result.reactivated, result.enrolled), (1, 0))
+        self.assertEqual(self.import_csv('email\na@example.com\n').already_enrolled, 1)
+
+    def test_skips_invalid_duplicate_and_teacher_rows(self):
+        result = self.import_csv('email\nnot-an-email\na@example.com\nA@example.com\nteacher@example.com\n')
+
+        self.assertEqual(
+            [(row, reason) for row, _, reason in result.skipped],
+            [(2, 'invalid email'), (4, 'duplicate row'), (5, 'not a student account')],
+        )
+        self.assertEqual(result.enrolled, 1)
+
+    def test_skips_emails_used_as_another_accounts_username(self):
+        User.objects.create_user(email='other@example.com', username='taken@example.com', password='x')
+
+        result = self.import_csv('email\ntaken@example.com\nfree@example.com\n')
+
+        self.assertEqual([(row, reason) for row, _, reason in result.skipped], [
+            (2, 'username taken by an account with another email'),
+        ])
+        self.assertEqual(result.enrolled, 1)
+
+    def test_batches_before_an_unreadable_row_are_kept(self):
+        file = io.BytesIO(b'email\na@example.com\nb@example.com\nc\xe9@example.com\n')
+
+        with self.assertRaises(RosterError):
+            import_roster(self.course, read_roster(file, 'roster.csv'), batch_size=1)
+
+        self.assertEqual(CourseEnrollment.objects.filter(course=self.course).count(), 2)
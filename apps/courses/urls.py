@@ -7,6 +7,8 @@ urlpatterns = [
     path('<int:course_id>/', views.course_detail, name='course_detail'),
     path('<int:course_id>/edit/', views.edit_course, name='edit_course'),
     path('<int:course_id>/delete/', views.delete_course, name='delete_course'),
+    path('<int:course_id>/roster/import/', views.import_course_roster, name='import_course_roster'),
     path('join/', views.join_course, name='join_course'),
+    path('join/<str:token>/', views.join_course_link, name='join_course_link'),
     path('<int:course_id>/leave/', views.leave_course, name='leave_course'),
 ]
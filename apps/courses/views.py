@@ -3,11 +3,17 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Count
 from django.http import HttpResponseForbidden
+from django.urls import reverse
 from .models import Course, CourseEnrollment
+from .managers import description_preview
 from apps.attendance.models import Attendance
-from .forms import CourseForm, CourseJoinForm
+from .forms import CourseForm, CourseJoinForm, RosterImportForm
+from .enrolled import add_enrolled
+from .join_codes import format_join_code, make_join_token, read_join_token
+from .roster import RosterError, import_roster, read_roster
 from django.utils import timezone
 from django.db.models import Q
+from utils.caching import bump_course_version, get_course_versions, get_or_set_course_value
 
 
 @login_required
@@ -16,16 +22,12 @@ def course_list(request):
     
     if request.user.is_teacher:
         # For teachers, show courses they created
-        courses = Course.objects.filter(teacher=request.user)
+        courses = list(Course.objects.filter(teacher=request.user).for_list())
         
-        # Add session counts to each course
+        # Course cards are fragment-cached per course version
+        versions = get_course_versions(course.id for course in courses)
         for course in courses:
-            course.session_count = course.sessions.count()
-            course.active_session_count = course.sessions.filter(
-                date=timezone.now().date(),
-                start_time__lte=timezone.now().time(),
-                end_time__gte=timezone.now().time()
-            ).count()
+            course.cache_version = versions[course.id]
         
         template = 'courses/teacher_course_list.html'
     else:
@@ -33,33 +35,45 @@ def course_list(request):
         enrollments = CourseEnrollment.objects.filter(
             student=request.user,
             is_active=True
-        ).select_related('course')
+        ).select_related('course__teacher').defer('course__description').annotate(
+            description_preview=description_preview('course__description')
+        )
         
         courses = []
         for enrollment in enrollments:
-            course = enrollment.course
+            enrollment.course.description_preview = enrollment.description_preview
+            courses.append(enrollment.course)
+        versions = get_course_versions(course.id for course in courses)
+        
+        for course in courses:
+            course.cache_version = versions[course.id]
+            
+            # Add session and attendance counts, cached until the course changes
+            stats = get_or_set_course_value(
+                course.id, course.cache_version, ('student', request.user.id, 'stats'),
+                lambda: {
+                    'session_count': course.sessions.count(),
+                    'attended_sessions': Attendance.objects.filter(
+                        student=request.user,
+                        session__course=course
+                    ).count(),
+                }
+            )
+            course.session_count = stats['session_count']
+            course.attended_sessions = stats['attended_sessions']
             
-            # Add session counts to each course
-            course.session_count = course.sessions.count()
+            # Active sessions depend on the current time, so they are never cached
             course.active_session_count = course.sessions.filter(
                 date=timezone.now().date(),
                 start_time__lte=timezone.now().time(),
                 end_time__gte=timezone.now().time()
             ).count()
             
-            # Add attendance info
-            course.attended_sessions = Attendance.objects.filter(
-                student=request.user,
-                session__course=course
-            ).count()
-            
             # Calculate attendance rate
             if course.session_count > 0:
                 course.attendance_rate = (course.attended_sessions / course.session_count) * 100
             else:
                 course.attendance_rate = 0
-                
-            courses.append(course)
         
         template = 'courses/student_course_list.html'
     
@@ -95,6 +109,8 @@ def course_detail(request, course_id):
             'enrollments': enrollments,
             'recent_sessions': recent_sessions,
             'session_count': course.sessions.count(),
+            'join_code': format_join_code(course.join_code),
+            'join_url': request.build_absolute_uri(reverse('join_course_link', args=[make_join_token(course)])),
         }
         
         return render(request, 'courses/teacher_course_detail.html', context)
@@ -207,6 +223,40 @@ def edit_course(request, course_id):
     return render(request, 'courses/course_form.html', context)
 
 
+@login_required
+def import_course_roster(request, course_id):
+    """Enroll the students of an uploaded class list (teachers only)"""
+    
+    course = get_object_or_404(Course, id=course_id)
+    
+    # Check permissions
+    if not request.user.is_teacher or request.user != course.teacher:
+        return HttpResponseForbidden("You don't have permission to manage this course's students.")
+    
+    if request.method == 'POST':
+        form = RosterImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            roster = form.cleaned_data['roster']
+            try:
+                result = import_roster(course, read_roster(roster.file, roster.name))
+            except RosterError as e:
+                form.add_error('roster', str(e))
+            else:
+                messages.success(request, f'Class list imported: {result.summary()}.')
+                for row, email, reason in result.skipped[:10]:
+                    messages.warning(request, f'Row {row}: skipped {email or "(no email)"}: {reason}.')
+                return redirect('course_detail', course_id=course.id)
+    else:
+        form = RosterImportForm()
+    
+    context = {
+        'form': form,
+        'course': course,
+    }
+    
+    return render(request, 'courses/import_roster.html', context)
+
+
 @login_required
 def delete_course(request, course_id):
     """Delete a course (teachers only)"""
@@ -230,9 +280,18 @@ def delete_course(request, course_id):
     return render(request, 'courses/course_confirm_delete.html', context)
 
 
+def _join(request, course):
+    """Enroll the current student in a course and send them to it"""
+    CourseEnrollment.objects.enroll(course.id, request.user)
+    bump_course_version(course.id)
+    add_enrolled(course.id, request.user.id)
+    messages.success(request, f'You have joined the course "{course.name}"!')
+    return redirect('course_detail', course_id=course.id)
+
+
 @login_required
 def join_course(request):
-    """Allow students to join a course using a course code"""
+    """Allow students to join a course using its join code"""
     
     if not request.user.is_student:
         return HttpResponseForbidden("Only students can join courses.")
@@ -240,25 +299,7 @@ def join_course(request):
     if request.method == 'POST':
         form = CourseJoinForm(request.POST, student=request.user)
         if form.is_valid():
-            course_code = form.cleaned_data['course_code']
-            
-            # Check if the code is in the QR format (course_code-longerqrcode)
-            if '-' in course_code:
-                # Extract the actual course code from the QR format
-                course_code = course_code.split('-')[0]
-            
-            try:
-                course = Course.objects.get(code=course_code, is_active=True)
-                
-                # Create enrollment
-                enrollment = CourseEnrollment(course=course, student=request.user)
-                enrollment.save()
-                
-                messages.success(request, f'You have successfully joined the course "{course.name}"!')
-                return redirect('course_detail', course_id=course.id)
-            except Course.DoesNotExist:
-                messages.error(request, 'Invalid course code. Please check and try again.')
-                return redirect('join_course')
+            return _join(request, form.course)
     else:
         form = CourseJoinForm(student=request.user)
     
@@ -269,6 +310,33 @@ def join_course(request):
     return render(request, 'courses/join_course.html', context)
 
 
+@login_required
+def join_course_link(request, token):
+    """Join the course of a scanned enrollment QR code, once the student confirms"""
+    
+    if not request.user.is_student:
+        return HttpResponseForbidden("Only students can join courses.")
+    
+    # The token carries the course id, so a valid one is a primary key lookup
+    decoded = read_join_token(token)
+    course = decoded and Course.objects.filter(
+        id=decoded[0], join_code=decoded[1], is_active=True
+    ).only('id', 'name').first()
+    if not course:
+        messages.error(request, 'This enrollment QR code is no longer valid. Ask your teacher for the join code.')
+        return redirect('join_course')
+    
+    # Opening the link only asks; a GET from another site must not enroll anyone
+    if request.method == 'POST':
+        return _join(request, course)
+    
+    context = {
+        'course': course
+    }
+    
+    return render(request, 'courses/join_course_confirm.html', context)
+
+
 @login_required
 def leave_course(request, course_id):
     """Allow students to leave a course"""
@@ -4,4 +4,7 @@ class SessionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.sessions'
     label = 'course_sessions'
-    verbose_name = 'Session Management'
\ No newline at end of file
+    verbose_name = 'Session Management'
+
+    def ready(self):
+        import apps.sessions.signals  # noqa
\ No newline at end of file
@@ -1,8 +1,11 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from apps.sessions.models import Session, CourseSchedule
+from apps.sessions.state import invalidate_session_state
 from apps.sessions.views import generate_upcoming_sessions
 from apps.courses.models import Course
+from utils.caching import bump_course_version
+from utils.metrics import SCHEDULER_DURATION, SESSIONS_CLOSED, SESSIONS_GENERATED
 from datetime import timedelta, date
 import logging
 from django.db.models import Q
@@ -12,6 +15,7 @@ logger = logging.getLogger(__name__)
 class Command(BaseCommand):
     help = 'Automatically manages sessions - closes expired ones and generates upcoming sessions'
 
+    @SCHEDULER_DURATION.time()
     def handle(self, *args, **options):
         self.stdout.write('Running automatic session management...')
         
@@ -41,7 +45,14 @@ class Command(BaseCommand):
         
         count = expired_sessions.count()
         if count > 0:
+            # update() bypasses post_save, so invalidate the affected courses here
+            closed = list(expired_sessions.values_list('id', 'course_id'))
             expired_sessions.update(is_closed=True)
+            SESSIONS_CLOSED.inc(count)
+            for session_id, _ in closed:
+                invalidate_session_state(session_id)
+            for course_id in {course_id for _, course_id in closed}:
+                bump_course_version(course_id)
             self.stdout.write(f'Auto-closed {count} expired sessions')
         else:
             self.stdout.write('No expired sessions to close')
@@ -61,4 +72,5 @@ class Command(BaseCommand):
             if count > 0:
                 self.stdout.write(f'Generated {count} upcoming sessions for {course.name}')
         
+        SESSIONS_GENERATED.inc(total_generated)
         self.stdout.write(f'Total generated sessions: {total_generated}') 
\ No newline at end of file
@@ -0,0 +1,83 @@
+import base64
+import io
+import time
+import qrcode
+from qrcode import util
+from django.core.management.base import BaseCommand, CommandError
+from utils.qr_encoder import encoder_for
+from utils.qr_generator import generate_qr_code_url, generate_session_token
+
+
+def legacy_qr_code_image(url, size=10, border=1):
+    """The encoding used before QREncoder: fit the version and search the mask on every call"""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=size,
+        border=border,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+class Command(BaseCommand):
+    help = 'Measures the per-call cost of encoding session QR codes, against the previous encoder'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=300, help='QR codes encoded by each variant')
+        parser.add_argument('--size', type=int, default=10, help='Box size in pixels, as on the session page')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        size = options['size']
+        if iterations < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        # A fresh token for every call, as after each QR rotation
+        urls = [generate_qr_code_url(1, generate_session_token()) for _ in range(iterations)]
+        encoder = encoder_for(urls[0])
+        self.stdout.write(
+            f"Encoding {iterations} QR codes of {len(urls[0])} characters "
+            f"(version {encoder.version}, mask {encoder.mask_pattern})..."
+        )
+
+        self.check_matrices(urls[:20])
+
+        results = {
+            'previous encoder': self.measure(lambda url: legacy_qr_code_image(url, size=size), urls),
+            'matrix only': self.measure(encoder.matrix, urls),
+            'pinned encoder': self.measure(lambda url: encoder.png_data_uri(url, box_size=size), urls),
+        }
+
+        baseline = results['previous encoder']
+        for name, (per_call, image_bytes) in results.items():
+            line = f"{name:<18} {per_call * 1000:8.3f} ms/call  {baseline[0] / per_call:6.1f}x"
+            if image_bytes:
+                line += f"  {image_bytes} bytes"
+            self.stdout.write(line)
+
+    def measure(self, encode, urls):
+        """Return the mean seconds per call and the size of the last data URI, if it returned one"""
+        start = time.perf_counter()
+        for url in urls:
+            result = encode(url)
+        per_call = (time.perf_counter() - start) / len(urls)
+        return per_call, len(result) if isinstance(result, str) else None
+
+    def check_matrices(self, urls):
+        """Compare the pinned encoder's output with a full encoding at the same version and mask"""
+        for url in urls:
+            encoder = encoder_for(url)
+            qr = qrcode.QRCode(
+                version=encoder.version,
+                error_correction=encoder.error_correction,
+                mask_pattern=encoder.mask_pattern,
+            )
+            qr.add_data(util.QRData(url))
+            qr.make(fit=False)
+            if qr.modules != encoder.matrix(url):
+                raise CommandError(f'The pinned encoder produced a different QR code for {url}')
+        self.stdout.write(self.style.SUCCESS(f'Pinned encoder matches a full encoding on {len(urls)} payloads'))
@@ -0,0 +1,10 @@
+from django.db import models
+from apps.courses.managers import description_preview
+
+
+class SessionQuerySet(models.QuerySet):
+    """Queries for sessions"""
+    
+    def for_list(self):
+        """Session cards: the description is replaced by its preview"""
+        return self.defer('description').annotate(description_preview=description_preview())
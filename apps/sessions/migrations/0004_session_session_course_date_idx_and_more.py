@@ -0,0 +1,22 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_sessions', '0003_courseschedule_session_schedule'),
+        ('courses', '0002_courseenrollment_enroll_active_course_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['course', 'date', 'start_time'], name='session_course_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(condition=models.Q(('is_closed', False)), fields=['date', 'end_time'], name='session_open_date_idx'),
+        ),
+    ]
@@ -5,6 +5,8 @@ from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from apps.courses.models import Course
 from utils.qr_generator import generate_session_token, calculate_expiry_time
+from .tokens import retire_qr_token
+from .managers import SessionQuerySet
 
 
 class CourseSchedule(models.Model):
@@ -70,8 +72,16 @@ class Session(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = SessionQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-date', '-start_time']
+        indexes = [
+            # Session lists and the schedule-based session generator
+            models.Index(fields=['course', 'date', 'start_time'], name='session_course_date_idx'),
+            # Open sessions for auto_manage_sessions
+            models.Index(fields=['date', 'end_time'], condition=models.Q(is_closed=False), name='session_open_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.course.name} ({self.date})"
@@ -137,9 +147,10 @@ class Session(models.Model):
     
     def refresh_qr_code(self, duration_seconds=10):
         """Generate a new QR code token and update expiry time"""
+        retire_qr_token(self.id, self.qr_code_token, self.qr_expiry_time)
         self.qr_code_token = generate_session_token()
         self.qr_expiry_time = calculate_expiry_time(duration_seconds)
-        self.save()
+        self.save(update_fields=['qr_code_token', 'qr_expiry_time', 'updated_at'])
     
     def get_attendance_count(self):
         """Get the number of students who have marked attendance"""
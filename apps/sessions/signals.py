@@ -0,0 +1,29 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from utils.caching import bump_course_version
+from .models import Session
+from .state import invalidate_session_state
+
+# QR rotations happen every few seconds and never show up in cached fragments
+QR_FIELDS = {'qr_code_token', 'qr_expiry_time', 'updated_at'}
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def invalidate_session_snapshots(sender, instance, **kwargs):
+    """Drop the copies of the session kept by the scan path, including on QR rotations"""
+    invalidate_session_state(instance.id)
+
+
+@receiver(post_save, sender=Session)
+def invalidate_session_cache(sender, instance, update_fields=None, **kwargs):
+    """Invalidate cached fragments when a session changes"""
+    if update_fields and set(update_fields) <= QR_FIELDS:
+        return
+    bump_course_version(instance.course_id)
+
+
+@receiver(post_delete, sender=Session)
+def invalidate_deleted_session_cache(sender, instance, **kwargs):
+    """Invalidate cached fragments when a session is deleted"""
+    bump_course_version(instance.course_id)
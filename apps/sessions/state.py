@@ -0,0 +1,47 @@
+import time
+from django.conf import settings
+from utils.caching import bump_version, get_version
+from .models import Session
+
+
+SESSION_STATE_KEY = 'session:{session_id}:state'
+
+# What a scan needs to validate its token and record attendance, in the
+# order of the model's fields as Model.from_db() expects
+SESSION_STATE_FIELDS = (
+    'id', 'course_id', 'title', 'date', 'start_time', 'end_time',
+    'qr_code_token', 'qr_expiry_time', 'is_closed',
+)
+
+# Snapshots of this process: {session_id: (loaded_at, version, values)}
+_snapshots = {}
+MAX_SNAPSHOTS = 1000
+
+
+def invalidate_session_state(session_id):
+    """Make every process reload the session on its next scan"""
+    _snapshots.pop(session_id, None)
+    bump_version(SESSION_STATE_KEY.format(session_id=session_id))
+
+
+def get_session_state(session_id, refresh=False):
+    """
+    Return the session with only SESSION_STATE_FIELDS loaded, taken from this
+    process's snapshot unless the session changed since or the snapshot is
+    older than SESSION_STATE_TTL. Raises Session.DoesNotExist.
+    """
+    # Read the version first: a change made while the row is loaded then
+    # leaves a snapshot that is already out of date, never a stale current one
+    version = get_version(SESSION_STATE_KEY.format(session_id=session_id))
+    now = time.monotonic()
+
+    snapshot = None if refresh else _snapshots.get(session_id)
+    if snapshot is None or snapshot[1] != version or now - snapshot[0] > settings.SESSION_STATE_TTL:
+        values = Session.objects.filter(id=session_id).values_list(*SESSION_STATE_FIELDS).first()
+        if values is None:
+            raise Session.DoesNotExist(f'Session {session_id} does not exist.')
+        if len(_snapshots) >= MAX_SNAPSHOTS:
+            _snapshots.clear()
+        snapshot = _snapshots[session_id] = (now, version, values)
+
+    return Session.from_db('default', SESSION_STATE_FIELDS, snapshot[2])
@@ -0,0 +1,86 @@
+import uuid
+from datetime import date, datetime, time, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from apps.accounts.models import User
+from apps.courses.models import Course
+from apps.sessions.models import Session
+from apps.sessions.tokens import qr_schedule_seed, qr_token_expiry, scheduled_qr_token, session_opens
+
+
+class ScheduledQrTokenTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user(
+            email='teacher@example.com', username='teacher', password='x', role=User.Role.TEACHER,
+        )
+        course = Course.objects.create(name='Biology', teacher=teacher)
+        cls.session = Session.objects.create(
+            course=course, title='Lecture', date=date(2025, 1, 6), start_time=time(9, 0), end_time=time(10, 0),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def at(self, hour, minute, second=0):
+        return timezone.make_aware(datetime(2025, 1, 6, hour, minute, second))
+
+    def token_at(self, moment, session=None):
+        window = int(moment.timestamp()) // settings.QR_SCHEDULE_WINDOW
+        return scheduled_qr_token(qr_schedule_seed(session or self.session), window)
+
+    def test_token_is_a_uuid_derived_from_seed_and_window(self):
+        seed = qr_schedule_seed(self.session)
+
+        self.assertEqual(str(uuid.UUID(scheduled_qr_token(seed, 1))), scheduled_qr_token(seed, 1))
+        self.assertEqual(scheduled_qr_token(seed, 1), scheduled_qr_token(seed, 1))
+        self.assertNotEqual(scheduled_qr_token(seed, 1), scheduled_qr_token(seed, 2))
+
+    def test_current_window_is_accepted_until_its_end_plus_skew(self):
+        moment = self.at(9, 30, 3)
+        window_end = self.at(9, 30, 10)
+
+        expiry = qr_token_expiry(self.session, self.token_at(moment), moment)
+
+        self.assertEqual(expiry, window_end + timedelta(seconds=settings.QR_SCHEDULE_SKEW))
+
+    def test_neighbouring_window_is_accepted_within_skew(self):
+        moment = self.at(9, 30, 3)
+        earlier = moment - timedelta(seconds=settings.QR_SCHEDULE_WINDOW)
+
+        self.assertIsNotNone(qr_token_expiry(self.session, self.token_at(earlier), moment))
+
+    def test_distant_window_is_rejected(self):
+        moment = self.at(9, 30)
+
+        self.assertIsNone(qr_token_expiry(self.session, self.token_at(self.at(9, 20)), moment))
+
+    def test_windows_before_check_in_opens_are_rejected(self):
+        early = session_opens(self.session) - timedelta(minutes=1)
+
+        self.assertIsNone(qr_token_expiry(self.session, self.token_at(early), early))
+
+    def test_windows_after_the_end_are_rejected(self):
+        late = self.at(10, 5)
+
+        self.assertIsNone(qr_token_expiry(self.session, self.token_at(late), late))
+
+    def test_tokens_of_another_session_are_rejected(self):
+        other = Session.objects.create(
+            course=self.session.course, title='Lab', date=self.session.date, start_time=time(9, 0), end_time=time(10, 0),
+        )
+        moment = self.at(9, 30)
+
+        self.assertIsNone(qr_token_expiry(self.session, self.token_at(moment, other), moment))
+
+    def test_stored_and_retired_tokens(self):
+        self.assertEqual(qr_token_expiry(self.session, self.session.qr_code_token), self.session.qr_expiry_time)
+
+        retired = self.session.qr_code_token
+        expiry = self.session.qr_expiry_time
+        self.session.refresh_qr_code(duration_seconds=10)
+
+        self.assertEqual(qr_token_expiry(self.session, retired), expiry)
+        self.assertIsNone(qr_token_expiry(self.session, str(uuid.uuid4())))
@@ -0,0 +1,95 @@
+import hashlib
+import hmac
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+
+RETIRED_TOKEN_KEY = 'session:{session_id}:qr:{token}'
+QR_SCHEDULE_SALT = 'sessions.qr_schedule'
+
+
+def retire_qr_token(session_id, token, expiry_time):
+    """
+    Remember until when a rotated-out QR token was valid, so scans captured
+    while it was on screen and submitted later can still be accepted
+    """
+    if not token or expiry_time is None:
+        return
+    cache.set(
+        RETIRED_TOKEN_KEY.format(session_id=session_id, token=token),
+        expiry_time,
+        timeout=settings.QUEUED_CHECKIN_MAX_AGE + settings.QUEUED_CHECKIN_SKEW,
+    )
+
+
+def qr_schedule_seed(session):
+    """
+    Return the secret from which a projector display derives the session's
+    QR tokens itself, one per QR_SCHEDULE_WINDOW seconds. Only the tokens of
+    windows between session_opens() and session_end() are accepted.
+    """
+    return salted_hmac(QR_SCHEDULE_SALT, f'{session.id}:{session.date}', algorithm='sha256').digest()
+
+
+def scheduled_qr_token(seed, window):
+    """
+    Return the token of one window, counted in QR_SCHEDULE_WINDOW seconds
+    since the Unix epoch: the first 16 bytes of HMAC-SHA256(seed, window as
+    8 big-endian bytes), as a UUID. qr-handler.js derives the same.
+    """
+    digest = hmac.new(seed, window.to_bytes(8, 'big'), hashlib.sha256).digest()
+    return str(uuid.UUID(bytes=digest[:16]))
+
+
+def session_opens(session):
+    """Return when check-in opens, 15 minutes before the start like Session.is_active"""
+    start = timezone.make_aware(datetime.combine(session.date, session.start_time))
+    return start - timedelta(minutes=15)
+
+
+def session_end(session):
+    """Return when the session is scheduled to end, as an aware datetime"""
+    return timezone.make_aware(datetime.combine(session.date, session.end_time))
+
+
+def scheduled_qr_token_expiry(session, token, at=None):
+    """
+    Return until when ``token`` is accepted if it is the session's scheduled
+    token for a window within QR_SCHEDULE_SKEW seconds of ``at`` (default
+    now), or None
+    """
+    window_seconds = settings.QR_SCHEDULE_WINDOW
+    skew = settings.QR_SCHEDULE_SKEW
+    at = (at or timezone.now()).timestamp()
+    opens = session_opens(session).timestamp()
+    end = session_end(session)
+
+    seed = qr_schedule_seed(session)
+    for window in range(int((at - skew) // window_seconds), int((at + skew) // window_seconds) + 1):
+        # Windows of other days, or before check-in opens, never had a valid token
+        if (window + 1) * window_seconds <= opens:
+            continue
+        if window * window_seconds > end.timestamp():
+            break
+        if hmac.compare_digest(scheduled_qr_token(seed, window), token):
+            window_end = datetime.fromtimestamp((window + 1) * window_seconds, tz=dt_timezone.utc)
+            return min(window_end, end) + timedelta(seconds=skew)
+    return None
+
+
+def qr_token_expiry(session, token, at=None):
+    """
+    Return until when ``token`` was valid for the session, or None if it is
+    neither one of its recent tokens nor a scheduled token of the windows
+    around ``at`` (default now)
+    """
+    if token == session.qr_code_token:
+        return session.qr_expiry_time
+    expiry_time = scheduled_qr_token_expiry(session, token, at)
+    if expiry_time is not None:
+        return expiry_time
+    return cache.get(RETIRED_TOKEN_KEY.format(session_id=session.id, token=token))
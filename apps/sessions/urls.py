@@ -15,9 +15,12 @@ urlpatterns = [
     path('courses/<int:course_id>/sessions/<int:session_id>/edit/', views.edit_session, name='edit_session'),
     path('courses/<int:course_id>/sessions/<int:session_id>/delete/', views.delete_session, name='delete_session'),
     path('courses/<int:course_id>/sessions/<int:session_id>/', views.session_detail, name='session_detail'),
+    path('courses/<int:course_id>/sessions/<int:session_id>/attendance-stream/', views.session_attendance_stream, name='session_attendance_stream'),
     path('courses/<int:course_id>/sessions/<int:session_id>/close/', views.close_session, name='close_session'),
     path('courses/<int:course_id>/sessions/<int:session_id>/reopen/', views.reopen_session, name='reopen_session'),
     path('courses/<int:course_id>/sessions/<int:session_id>/refresh-qr/', views.refresh_qr_code, name='refresh_qr_code'),
+    path('courses/<int:course_id>/sessions/<int:session_id>/qr-token/', views.qr_code_token, name='qr_code_token'),
     path('courses/<int:course_id>/sessions/<int:session_id>/qr-display/', views.qr_code_display, name='qr_code_display'),
     path('all-sessions/', views.all_sessions, name='all_sessions'),
+    path('all-sessions/rows/', views.all_sessions_rows, name='all_sessions_rows'),
 ]
@@ -1,15 +1,29 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponseForbidden, JsonResponse
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
+from django.views.decorators.http import require_POST
 from django.db.models import Q
 from datetime import timedelta, datetime, date
+import base64
+import json
+import queue
+import threading
+import time
 from .models import Session, CourseSchedule
 from .forms import SessionForm, QRCodeRefreshForm, CourseScheduleForm
+from .tokens import qr_schedule_seed, scheduled_qr_token, session_end, session_opens
+from apps.courses.enrolled import is_enrolled
 from apps.courses.models import Course
 from utils.qr_generator import generate_qr_code_url, generate_qr_code_image
+from utils.caching import get_course_version, get_course_versions
+from utils.live import broker, session_topic
+from utils.metrics import QR_REFRESHES
+from utils.pagination import InvalidCursor, keyset_page
 
 
 @login_required
@@ -24,11 +38,11 @@ def session_list(request, course_id):
             return HttpResponseForbidden("You don't have permission to view sessions for this course.")
     else:
         # Check if student is enrolled
-        if not course.enrollments.filter(student=request.user, is_active=True).exists():
+        if not is_enrolled(course.id, request.user.id):
             return HttpResponseForbidden("You are not enrolled in this course.")
     
     # Get sessions
-    sessions = Session.objects.filter(course=course)
+    sessions = Session.objects.filter(course=course).for_list()
     
     # Group sessions by status
     upcoming_sessions = [s for s in sessions if s.is_upcoming]
@@ -37,6 +51,7 @@ def session_list(request, course_id):
     
     context = {
         'course': course,
+        'cache_version': get_course_version(course.id),
         'upcoming_sessions': upcoming_sessions,
         'active_sessions': active_sessions,
         'past_sessions': past_sessions,
@@ -95,8 +110,8 @@ def session_detail(request, course_id, session_id):
         qr_url = generate_qr_code_url(session.id, session.qr_code_token)
         qr_image = generate_qr_code_image(qr_url)
         
-        # Get attendance records
-        attendances = session.attendances.all().select_related('student')
+        # Get attendance records; later check-ins arrive through session_attendance_stream
+        attendances = list(session.attendances.all().select_related('student').order_by('id'))
         
         context = {
             'course': course,
@@ -105,12 +120,13 @@ def session_detail(request, course_id, session_id):
             'qr_image': qr_image,
             'qr_refresh_form': qr_refresh_form,
             'attendances': attendances,
+            'last_attendance_id': attendances[-1].id if attendances else 0,
         }
         
         return render(request, 'sessions/teacher_session_detail.html', context)
     else:
         # Check if student is enrolled
-        if not course.enrollments.filter(student=request.user, is_active=True).exists():
+        if not is_enrolled(course.id, request.user.id):
             return HttpResponseForbidden("You are not enrolled in this course.")
         
         # For students, show session details and attendance status
@@ -129,6 +145,103 @@ def session_detail(request, course_id, session_id):
         return render(request, 'sessions/student_session_detail.html', context)
 
 
+# Seconds between database catch-ups, which pick up check-ins handled by other
+# worker processes, and after which a stream ends so the browser reconnects.
+# Each open stream holds a worker thread, so streams are short long-polls and
+# only ATTENDANCE_STREAM_LIMIT of them run at once in a process.
+ATTENDANCE_STREAM_POLL_SECONDS = 5
+ATTENDANCE_STREAM_SECONDS = 10
+ATTENDANCE_STREAM_RETRY_SECONDS = 10
+
+_stream_slots = threading.BoundedSemaphore(settings.ATTENDANCE_STREAM_LIMIT)
+
+
+class _StreamSlot:
+    """Events of one stream; closing the response gives its slot back"""
+    
+    def __init__(self, events):
+        self.events = events
+        self.released = False
+    
+    def __iter__(self):
+        return iter(self.events)
+    
+    def close(self):
+        self.events.close()
+        if not self.released:
+            self.released = True
+            _stream_slots.release()
+
+
+def _attendance_event(course, attendance, cursor):
+    row = render_to_string('sessions/session_attendance_row.html', {'course': course, 'attendance': attendance})
+    data = json.dumps({'id': attendance.id, 'html': row})
+    return f'id: {cursor}\nevent: attendance\ndata: {data}\n\n'
+
+
+@login_required
+def session_attendance_stream(request, course_id, session_id):
+    """Server-sent events with the attendance recorded in a session after the page was rendered"""
+    
+    course = get_object_or_404(Course, id=course_id)
+    session = get_object_or_404(Session.objects.only('id', 'course_id'), id=session_id, course=course)
+    
+    if not request.user.is_teacher or request.user != course.teacher:
+        return HttpResponseForbidden("You don't have permission to view this session.")
+    
+    # EventSource sends the last event id when it reconnects
+    try:
+        cursor = int(request.headers.get('Last-Event-ID') or request.GET.get('after', 0))
+    except ValueError:
+        return HttpResponseBadRequest('Invalid event id.')
+    
+    def events():
+        # Published rows can overtake rows committed by other workers, so only the
+        # database catch-up advances the cursor and sent ids are remembered instead
+        position = cursor
+        sent = set()
+        deadline = time.monotonic() + ATTENDANCE_STREAM_SECONDS
+        
+        with broker.subscribe(session_topic(session.id)) as published:
+            yield 'retry: 3000\n\n'
+            # Catch up right away for rows written between the page render and the subscription
+            next_catch_up = time.monotonic()
+            while time.monotonic() < deadline:
+                timeout = next_catch_up - time.monotonic()
+                if timeout <= 0:
+                    chunks = []
+                    new = session.attendances.filter(id__gt=position).select_related('student').order_by('id')
+                    for attendance in new:
+                        position = attendance.id
+                        if attendance.id not in sent:
+                            sent.add(attendance.id)
+                            chunks.append(_attendance_event(course, attendance, position))
+                    next_catch_up = time.monotonic() + ATTENDANCE_STREAM_POLL_SECONDS
+                    # A comment line keeps proxies from closing an idle connection
+                    yield ''.join(chunks) or ': keep-alive\n\n'
+                    continue
+                
+                try:
+                    attendance = published.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                if attendance.id > cursor and attendance.id not in sent:
+                    sent.add(attendance.id)
+                    yield _attendance_event(course, attendance, position)
+    
+    if not _stream_slots.acquire(blocking=False):
+        # Every slot is taken; the page opens the stream again later
+        response = HttpResponse('Too many live rosters are open. Try again shortly.', status=503, content_type='text/plain')
+        response['Retry-After'] = ATTENDANCE_STREAM_RETRY_SECONDS
+        return response
+    
+    response = StreamingHttpResponse(_StreamSlot(events()), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Ask nginx-style proxies not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required
 def edit_session(request, course_id, session_id):
     """Edit an existing session"""
@@ -200,6 +313,7 @@ def refresh_qr_code(request, course_id, session_id):
         if form.is_valid():
             duration = form.cleaned_data['duration']
             session.refresh_qr_code(duration_seconds=duration)
+            QR_REFRESHES.inc()
             
             # Generate new QR code URL and image
             qr_url = generate_qr_code_url(session.id, session.qr_code_token)
@@ -219,6 +333,35 @@ def refresh_qr_code(request, course_id, session_id):
     return redirect('session_detail', course_id=course.id, session_id=session.id)
 
 
+@login_required
+@require_POST
+def qr_code_token(request, course_id, session_id):
+    """Rotate the QR code and return only its token, URL and expiry; the page draws the QR code itself"""
+    
+    course = get_object_or_404(Course, id=course_id)
+    session = get_object_or_404(Session, id=session_id, course=course)
+    
+    # Check permissions
+    if not request.user.is_teacher or request.user != course.teacher:
+        return HttpResponseForbidden("You don't have permission to refresh the QR code for this session.")
+    
+    if session.is_closed:
+        return JsonResponse({'error': 'This session has been closed.'}, status=409)
+    
+    form = QRCodeRefreshForm(request.POST)
+    if not form.is_valid():
+        return JsonResponse({'error': 'Invalid duration.'}, status=400)
+    
+    session.refresh_qr_code(duration_seconds=form.cleaned_data['duration'])
+    QR_REFRESHES.inc()
+    
+    return JsonResponse({
+        'token': session.qr_code_token,
+        'url': generate_qr_code_url(session.id, session.qr_code_token),
+        'expires': int(session.qr_expiry_time.timestamp()),
+    })
+
+
 @login_required
 def qr_code_display(request, course_id, session_id):
     """Display QR code in fullscreen for easy scanning"""
@@ -230,14 +373,25 @@ def qr_code_display(request, course_id, session_id):
     if not request.user.is_teacher or request.user != course.teacher:
         return HttpResponseForbidden("You don't have permission to view the QR code for this session.")
     
-    # Generate QR code URL and image
-    qr_url = generate_qr_code_url(session.id, session.qr_code_token)
-    qr_image = generate_qr_code_image(qr_url, size=20)
+    # The seed lets the page derive each window's token without calling back.
+    # Browsers that can't fetch a code from qr_code_token instead, so no image
+    # is rendered here.
+    now = timezone.now()
+    seed = qr_schedule_seed(session)
+    window = int(now.timestamp()) // settings.QR_SCHEDULE_WINDOW
+    qr_schedule = {
+        'seed': base64.b64encode(seed).decode(),
+        'window': settings.QR_SCHEDULE_WINDOW,
+        'url': generate_qr_code_url(session.id, scheduled_qr_token(seed, window)),
+        'now': int(now.timestamp()),
+        'opens': int(session_opens(session).timestamp()),
+        'expires': int(session_end(session).timestamp()),
+    }
     
     context = {
         'course': course,
         'session': session,
-        'qr_image': qr_image,
+        'qr_schedule': qr_schedule,
     }
     
     return render(request, 'sessions/qr_code_display.html', context)
@@ -306,6 +460,39 @@ def reopen_session(request, course_id, session_id):
     return redirect('session_detail', course_id=course.id, session_id=session.id)
 
 
+# Newest first; id makes the ordering unique for keyset pagination
+PAST_SESSIONS_ORDERING = ('-date', '-start_time', '-id')
+PAST_SESSIONS_PAGE_SIZE = 30
+
+
+def _teacher_sessions(teacher):
+    """Sessions across all courses of a teacher, split into (current, past) querysets"""
+    
+    # Get all courses taught by this teacher
+    courses = Course.objects.filter(teacher=teacher)
+    
+    # Get all sessions for these courses
+    sessions = Session.objects.filter(course__in=courses).for_list().select_related('course').defer(
+        'course__description'
+    )
+    
+    # Matches Session.is_past, so the past sessions can be paginated in the database
+    now = timezone.localtime()
+    ended = Q(date__lt=now.date()) | Q(date=now.date(), end_time__lt=now.time())
+    return sessions.exclude(ended), sessions.filter(ended)
+
+
+def _past_sessions_page(request, past_sessions):
+    """Return a page of past sessions with their fragment cache versions"""
+    page = keyset_page(past_sessions, PAST_SESSIONS_ORDERING, request.GET.get('cursor'), PAST_SESSIONS_PAGE_SIZE)
+    
+    # Past session cards are fragment-cached per course version
+    versions = get_course_versions(s.course_id for s in page.items)
+    for s in page.items:
+        s.cache_version = versions[s.course_id]
+    return page
+
+
 @login_required
 def all_sessions(request):
     """Display all sessions across all courses for a teacher"""
@@ -314,26 +501,53 @@ def all_sessions(request):
     if not request.user.is_teacher:
         return HttpResponseForbidden("You don't have permission to view this page.")
     
-    # Get all courses taught by this teacher
-    courses = Course.objects.filter(teacher=request.user)
+    current_sessions, past_sessions = _teacher_sessions(request.user)
+    current_sessions = current_sessions.order_by('-date', '-start_time')
     
-    # Get all sessions for these courses
-    sessions = Session.objects.filter(course__in=courses).order_by('-date', '-start_time')
+    # Group sessions by status; past sessions are shown one page at a time
+    upcoming_sessions = [s for s in current_sessions if s.is_upcoming]
+    active_sessions = [s for s in current_sessions if s.is_active]
+    try:
+        page = _past_sessions_page(request, past_sessions)
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid page cursor.")
     
-    # Group sessions by status
-    upcoming_sessions = [s for s in sessions if s.is_upcoming]
-    active_sessions = [s for s in sessions if s.is_active]
-    past_sessions = [s for s in sessions if s.is_past]
+    next_page_url = next_rows_url = None
+    if page.has_next:
+        next_page_url = f"{reverse('all_sessions')}?cursor={page.next_cursor}"
+        next_rows_url = f"{reverse('all_sessions_rows')}?cursor={page.next_cursor}"
     
     context = {
         'upcoming_sessions': upcoming_sessions,
         'active_sessions': active_sessions,
-        'past_sessions': past_sessions,
+        'past_sessions': page.items,
+        'next_page_url': next_page_url,
+        'next_rows_url': next_rows_url,
     }
     
     return render(request, 'sessions/all_sessions.html', context)
 
 
+@login_required
+def all_sessions_rows(request):
+    """Return the next page of past session cards as JSON, for infinite scrolling"""
+    
+    if not request.user.is_teacher:
+        return HttpResponseForbidden("You don't have permission to view this page.")
+    
+    _, past_sessions = _teacher_sessions(request.user)
+    try:
+        page = _past_sessions_page(request, past_sessions)
+    except InvalidCursor:
+        return JsonResponse({'error': 'Invalid page cursor.'}, status=400)
+    
+    return JsonResponse({
+        'html': render_to_string('sessions/all_sessions_past_cards.html', {'past_sessions': page.items}, request=request),
+        'count': len(page.items),
+        'next_url': f"{reverse('all_sessions_rows')}?cursor={page.next_cursor}" if page.has_next else None,
+    })
+
+
 @login_required
 def course_schedule(request, course_id):
     """Manage course schedules"""
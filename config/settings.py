@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -28,7 +29,8 @@ BASE_URL = "https://web-production-9a574.up.railway.app"
 SECRET_KEY = 'your-secret-key'  # Change this in production
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# Set DJANGO_DEBUG=False there; static files are then served under hashed names.
+DEBUG = os.environ.get('DJANGO_DEBUG', 'True') == 'True'
 
 ALLOWED_HOSTS = ["*", "web-production-9a574.up.railway.app"]
 
@@ -54,12 +56,16 @@ INSTALLED_APPS = [
     'apps.courses',
     'apps.sessions',  # Your custom sessions app (now with a different label)
     'apps.attendance',
+    'apps.api',
+    'utils',
 ]
 
 MIDDLEWARE = [
+    'utils.instrumentation.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'utils.db_router.ReplicaPinningMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -71,9 +77,8 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'utils.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -82,6 +87,16 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'django.template.context_processors.media',
                 'utils.context_processors.media_url',
+                'utils.context_processors.cache_settings',
+            ],
+            # Templates are compiled once per process (config/wsgi.py compiles
+            # them all at startup); in DEBUG the autoreloader drops them when
+            # a template file changes.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
             ],
         },
     },
@@ -93,13 +108,95 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Connections are kept open between requests and BEGIN IMMEDIATE takes the write
+# lock up front, so concurrent check-ins wait for each other instead of failing
+# with "database is locked" when a read transaction is upgraded.
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+# Optional read replica for reports and exports. Set DB_REPLICA_NAME to a SQLite
+# file refreshed by `manage.py snapshot_replica`, or point DATABASES['replica']
+# at a Postgres standby. Writes always go to the primary.
+REPLICA_DATABASE_ALIAS = 'replica'
+
+if os.environ.get('DB_REPLICA_NAME'):
+    DATABASES[REPLICA_DATABASE_ALIAS] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['DB_REPLICA_NAME'],
+        # Snapshots replace the file, so never reuse a connection to an old copy
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {
+            'init_command': 'PRAGMA query_only = ON;',
+        },
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    }
+
+DATABASE_ROUTERS = ['utils.db_router.PrimaryReplicaRouter']
+
+# Seconds a user's reports stay on the primary after they submit a write
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 60))
+
+# Applied to every new SQLite connection by utils.database
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,  # milliseconds
+    'mmap_size': 134217728,  # 128 MB
+    'temp_store': 'MEMORY',
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Select the backend with CACHE_BACKEND=locmem|file|redis. LocMem is per-process,
+# so use the file or redis backend to share the cache between gunicorn workers.
+
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'scaatt',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'scaatt_cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+# InstrumentedCache counts hits and misses for the request metrics and hands
+# everything else to the selected backend.
+CACHES = {
+    'default': {
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'BACKEND': 'utils.instrumentation.InstrumentedCache',
+        'WRAPPED_BACKEND': CACHE_BACKENDS[CACHE_BACKEND]['BACKEND'],
+        'KEY_PREFIX': 'scaatt',
+        'TIMEOUT': 300,
     }
 }
 
+# How long rendered dashboard fragments are kept. Keys are versioned per course,
+# so writes invalidate them immediately and this only bounds memory use.
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', 600))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -156,10 +253,92 @@ LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'home'
 LOGOUT_REDIRECT_URL = 'home'
 
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Hashed, compressed copies of the static files, which WhiteNoise serves with
+# far-future cache headers. Run collectstatic before starting without DEBUG.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Offline scanner. Queued scans are accepted if their QR token was valid when
+# they were captured, give or take QUEUED_CHECKIN_SKEW seconds, and if they are
+# submitted within QUEUED_CHECKIN_MAX_AGE seconds of the capture.
+QUEUED_CHECKIN_MAX_AGE = int(os.environ.get('QUEUED_CHECKIN_MAX_AGE', 900))
+QUEUED_CHECKIN_SKEW = int(os.environ.get('QUEUED_CHECKIN_SKEW', 10))
+
+# Scans read the session's token, expiry and closed flag from a per-process
+# snapshot. Changes are seen at once through a version counter in the cache,
+# and after at most SESSION_STATE_TTL seconds when the cache is not shared.
+SESSION_STATE_TTL = float(os.environ.get('SESSION_STATE_TTL', 5))
+
+# Enrollment checks read a cached set of each course's students. Writes in
+# this process update it at once; writes elsewhere (another worker or a
+# management command) are seen when it expires if the cache is not shared.
+ENROLLED_CACHE_TTL = int(os.environ.get('ENROLLED_CACHE_TTL', 30))
+
+# Live rosters of teacher session pages each hold a worker thread while their
+# stream is open; at most this many run at once per process (gunicorn runs 8
+# threads), the others are refused and retried by the page.
+ATTENDANCE_STREAM_LIMIT = int(os.environ.get('ATTENDANCE_STREAM_LIMIT', 2))
+
+# Projector displays derive a new QR token every QR_SCHEDULE_WINDOW seconds
+# from a per-session seed; a scanned token is accepted for QR_SCHEDULE_SKEW
+# seconds either side of its window to allow for drift of the display's clock.
+QR_SCHEDULE_WINDOW = int(os.environ.get('QR_SCHEDULE_WINDOW', 10))
+QR_SCHEDULE_SKEW = int(os.environ.get('QR_SCHEDULE_SKEW', 10))
+
+# Request metrics
+# Share of requests whose timings are logged; the Server-Timing header with
+# them is only sent in DEBUG or to staff users
+REQUEST_METRICS_SAMPLE_RATE = float(os.environ.get('REQUEST_METRICS_SAMPLE_RATE', 0.01))
+# Append the JSON lines to this file as well, for the request_metrics_report command
+REQUEST_METRICS_LOG = os.environ.get('REQUEST_METRICS_LOG')
+
+# Directory where each process keeps its metric totals so /metrics can add up
+# all gunicorn workers and cron runs. Clear it when deploying.
+METRICS_DIR = os.environ.get('METRICS_DIR')
+# When set, /metrics requires an "Authorization: Bearer <token>" header;
+# otherwise only staff users (or anyone in DEBUG) can read it
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {'format': '{levelname} {name} {message}', 'style': '{'},
+        'json_line': {'format': '{message}', 'style': '{'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'simple'},
+        'request_metrics': {'class': 'logging.StreamHandler', 'formatter': 'json_line'},
+        **({
+            'request_metrics_file': {
+                'class': 'logging.handlers.WatchedFileHandler',
+                'filename': REQUEST_METRICS_LOG,
+                'formatter': 'json_line',
+            },
+        } if REQUEST_METRICS_LOG else {}),
+    },
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    'loggers': {
+        # Replaces Django's default handlers, which would print records a second time via the root logger
+        'django': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        'request_metrics': {
+            'handlers': ['request_metrics_file'] if REQUEST_METRICS_LOG else ['request_metrics'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
 
 # Cron jobs configuration - uncomment for production use
 # CRONJOBS = [
 #     # Run every hour to auto-close expired sessions and generate upcoming sessions
-#     ('0 * * * *', 'django.core.management.call_command', ['auto_manage_sessions'], {}, '>> /tmp/auto_manage_sessions.log 2>&1')
+#     ('0 * * * *', 'django.core.management.call_command', ['auto_manage_sessions'], {}, '>> /tmp/auto_manage_sessions.log 2>&1'),
+#     # Refresh the SQLite read replica every five minutes when DB_REPLICA_NAME is set
+#     ('*/5 * * * *', 'django.core.management.call_command', ['snapshot_replica'], {}, '>> /tmp/snapshot_replica.log 2>&1'),
 # ]
@@ -20,6 +20,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
 from django.shortcuts import render, redirect
+from apps.attendance.views import scan
+from utils.views import metrics
 
 def home_view(request):
     """Home page view that shows the home page to all users"""
@@ -32,6 +34,10 @@ urlpatterns = [
     path('courses/', include('apps.courses.urls')),
     path('', include('apps.sessions.urls')),
     path('attendance/', include('apps.attendance.urls')),
+    # Short, uppercase URL of session QR codes
+    path('S/<int:session_id>/<str:code>/', scan, name='scan'),
+    path('api/', include('apps.api.urls')),
+    path('metrics', metrics, name='metrics'),
     # We'll add these as we develop each app
     # path('sessions/', include('apps.sessions.urls')),
     # path('notifications/', include('apps.notifications.urls')),
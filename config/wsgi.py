@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Compile the templates before the worker serves its first request
+from utils.template_cache import warm_template_cache  # noqa: E402
+
+warm_template_cache()
@@ -0,0 +1,21 @@
+// Live clock functionality
+function updateClock() {
+    const now = new Date();
+
+    // Format the time
+    const hours = now.getHours().toString().padStart(2, '0');
+    const minutes = now.getMinutes().toString().padStart(2, '0');
+    const seconds = now.getSeconds().toString().padStart(2, '0');
+    const timeString = `${hours}:${minutes}:${seconds}`;
+
+    // Format the date
+    const options = { weekday: 'short', year: 'numeric', month: 'short', day: 'numeric' };
+    const dateString = now.toLocaleDateString('en-US', options);
+
+    // Update the clock display
+    document.getElementById('current-time').textContent = `${dateString} ${timeString}`;
+}
+
+// Update the clock immediately and then every second
+updateClock();
+setInterval(updateClock, 1000);
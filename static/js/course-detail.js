@@ -0,0 +1,21 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // The QR code opens the course's join link
+    const container = document.getElementById('course-qr-code');
+    const qr = qrcode(0, 'M');
+    qr.addData(container.dataset.joinUrl);
+    qr.make();
+    container.innerHTML = qr.createImgTag(5);
+});
+
+function copyJoinCode() {
+    const codeInput = document.getElementById('join-code');
+    codeInput.select();
+    document.execCommand('copy');
+
+    const copyBtn = document.getElementById('copy-btn');
+    const originalText = copyBtn.innerHTML;
+    copyBtn.innerHTML = '<i class="bi bi-clipboard-check"></i> Copied!';
+    setTimeout(() => {
+        copyBtn.innerHTML = originalText;
+    }, 2000);
+}
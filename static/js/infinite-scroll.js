@@ -0,0 +1,64 @@
+// Infinite scrolling for paginated lists
+//
+// Markup: <div data-infinite-scroll data-target="#rows" data-next-url="...">
+//           <a href="...">Load more</a>
+//         </div>
+// The next-url endpoint returns JSON {html, next_url}; the html is appended to
+// the target. Without JavaScript the link still opens the next page.
+document.addEventListener('DOMContentLoaded', function() {
+  document.querySelectorAll('[data-infinite-scroll]').forEach(function(loader) {
+    const target = document.querySelector(loader.dataset.target);
+    const link = loader.querySelector('a');
+    let nextUrl = loader.dataset.nextUrl;
+    let loading = false;
+
+    if(!target || !nextUrl) {
+      return;
+    }
+
+    function loadMore() {
+      if(loading || !nextUrl) {
+        return;
+      }
+      loading = true;
+
+      fetch(nextUrl, {headers: {'X-Requested-With': 'XMLHttpRequest'}})
+        .then(response => {
+          if(!response.ok) {
+            throw new Error('Network response was not ok');
+          }
+          return response.json();
+        })
+        .then(data => {
+          target.insertAdjacentHTML('beforeend', data.html);
+          nextUrl = data.next_url;
+          if(!nextUrl) {
+            observer.disconnect();
+            loader.remove();
+          }
+        })
+        .catch(error => {
+          // Leave the link in place so the next page can still be opened
+          console.error('Error loading more rows:', error);
+          observer.disconnect();
+        })
+        .finally(() => {
+          loading = false;
+        });
+    }
+
+    const observer = new IntersectionObserver(function(entries) {
+      if(entries.some(entry => entry.isIntersecting)) {
+        loadMore();
+      }
+    }, {rootMargin: '400px'});
+    observer.observe(loader);
+
+    if(link) {
+      link.addEventListener('click', function(event) {
+        event.preventDefault();
+        loadMore();
+      });
+    }
+  });
+});
@@ -0,0 +1,38 @@
+document.addEventListener('DOMContentLoaded', function () {
+    const html5QrCode = new Html5Qrcode("qr-reader");
+    const qrCodeSuccessCallback = (decodedText, decodedResult) => {
+        html5QrCode.stop();
+
+        // Enrollment QR codes hold the course's join link; anything else is treated as a typed code
+        const prefix = document.getElementById('qr-form').dataset.joinPrefix;
+        let url = null;
+        try {
+            url = new URL(decodedText, window.location.href);
+        } catch (e) {}
+        if (url && url.origin === window.location.origin && url.pathname.startsWith(prefix) && url.pathname !== prefix) {
+            document.getElementById('qr-reader-results').innerHTML =
+                '<div class="alert alert-success">QR code scanned. Joining the course...</div>';
+            window.location.assign(url.pathname);
+            return;
+        }
+
+        document.getElementById('scanned_course_code').value = decodedText;
+        document.getElementById('qr-form').submit();
+    };
+
+    const config = { fps: 10, qrbox: { width: 250, height: 250 } };
+
+    // Start scanning
+    html5QrCode.start({ facingMode: "environment" }, config, qrCodeSuccessCallback);
+
+    // Handle tab switching to stop/start scanner
+    document.querySelectorAll('button[data-bs-toggle="tab"]').forEach(tab => {
+        tab.addEventListener('shown.bs.tab', function (event) {
+            if (event.target.id === 'manual-tab') {
+                html5QrCode.stop();
+            } else if (event.target.id === 'scan-tab') {
+                html5QrCode.start({ facingMode: "environment" }, config, qrCodeSuccessCallback);
+            }
+        });
+    });
+});
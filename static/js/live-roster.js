@@ -0,0 +1,51 @@
+// Live attendance roster
+//
+// Markup: <div data-live-roster data-stream-url="..." data-after="<last attendance id>"
+//              data-target="#rows" data-count="#present-count" data-empty="#no-attendance">
+// The stream sends "attendance" events with JSON {id, html}; the row html is
+// appended to the target, the count is increased and the empty-state message
+// is hidden. EventSource reconnects on its own when the stream ends; when the
+// server refuses a stream because it is busy, it is opened again later.
+document.addEventListener('DOMContentLoaded', function() {
+  document.querySelectorAll('[data-live-roster]').forEach(function(roster) {
+    const target = document.querySelector(roster.dataset.target);
+    const count = document.querySelector(roster.dataset.count);
+    const empty = document.querySelector(roster.dataset.empty);
+
+    if(!target || !window.EventSource) {
+      return;
+    }
+
+    let after = roster.dataset.after || 0;
+
+    function connect() {
+      const source = new EventSource(roster.dataset.streamUrl + '?after=' + encodeURIComponent(after));
+
+      source.addEventListener('attendance', function(event) {
+        after = event.lastEventId || after;
+        const data = JSON.parse(event.data);
+        // Reconnects may resend rows that are already on the page
+        if(target.querySelector('[data-attendance-id="' + data.id + '"]')) {
+          return;
+        }
+        target.insertAdjacentHTML('beforeend', data.html);
+        roster.classList.remove('d-none');
+        if(empty) {
+          empty.classList.add('d-none');
+        }
+        if(count) {
+          count.textContent = parseInt(count.textContent, 10) + 1;
+        }
+      });
+
+      source.addEventListener('error', function() {
+        // EventSource gives up for good on an error status such as 503
+        if(source.readyState === EventSource.CLOSED) {
+          setTimeout(connect, 5000 + Math.random() * 10000);
+        }
+      });
+    }
+
+    connect();
+  });
+});
@@ -6,8 +6,21 @@ document.addEventListener('DOMContentLoaded', function() {
   const countdownDisplay = document.getElementById('countdown-display');
   const generateButton = document.getElementById('generate-qr-button');
   
-  // Function to refresh QR code via AJAX
+  // Pages that draw the QR code themselves only fetch the new URL
   function refreshQRCode() {
+    if(qrCodeSection && qrCodeSection.dataset.tokenUrl && window.QRRender) {
+      requestRefresh(qrCodeSection.dataset.tokenUrl).then(data => {
+        if(data.url) {
+          showQRCode(QRRender.dataURL(data.url, {scale: parseInt(qrCodeSection.dataset.qrScale, 10) || 10}));
+        } else {
+          console.error('Failed to generate QR code:', data.error || 'Unknown error');
+        }
+      }).catch(error => {
+        console.error('Error generating QR code:', error);
+      });
+      return;
+    }
+    
     // Get session info from URL
     const urlPath = window.location.pathname;
     const pathParts = urlPath.split('/');
@@ -31,7 +44,22 @@ document.addEventListener('DOMContentLoaded', function() {
     console.log(`Refreshing QR code for course: ${courseId}, session: ${sessionId}`);
     
     // Make AJAX call to refresh QR code
-    fetch(`/courses/${courseId}/sessions/${sessionId}/refresh-qr/`, {
+    requestRefresh(`/courses/${courseId}/sessions/${sessionId}/refresh-qr/`)
+    .then(data => {
+      if(data.success) {
+        console.log('QR code refreshed successfully');
+        showQRCode(data.qr_image);
+      } else {
+        console.error('Failed to generate QR code:', data.error || 'Unknown error');
+      }
+    })
+    .catch(error => {
+      console.error('Error generating QR code:', error);
+    });
+  }
+  
+  function requestRefresh(url) {
+    return fetch(url, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/x-www-form-urlencoded',
@@ -45,35 +73,28 @@ document.addEventListener('DOMContentLoaded', function() {
         throw new Error('Network response was not ok');
       }
       return response.json();
-    })
-    .then(data => {
-      if(data.success) {
-        console.log('QR code refreshed successfully');
-        // If there's a QR image placeholder, update it
-        if(qrCodeImage) {
-          qrCodeImage.src = data.qr_image;
-          
-          // Remove any expired message
-          const expiredMessage = document.querySelector('.alert-warning');
-          if(expiredMessage) {
-            expiredMessage.remove();
-          }
-          
-          // Reset countdown if it exists
-          if(countdownDisplay) {
-            timeLeft = 10;
-            countdownDisplay.textContent = timeLeft;
-          }
-        }
-      } else {
-        console.error('Failed to generate QR code:', data.error || 'Unknown error');
-      }
-    })
-    .catch(error => {
-      console.error('Error generating QR code:', error);
     });
   }
   
+  function showQRCode(src) {
+    // If there's a QR image placeholder, update it
+    if(qrCodeImage) {
+      qrCodeImage.src = src;
+      
+      // Remove any expired message
+      const expiredMessage = document.querySelector('.alert-warning');
+      if(expiredMessage) {
+        expiredMessage.remove();
+      }
+      
+      // Reset countdown if it exists
+      if(countdownDisplay) {
+        timeLeft = 10;
+        countdownDisplay.textContent = timeLeft;
+      }
+    }
+  }
+  
   // If generate button exists, attach click handler
   if (generateButton) {
     generateButton.addEventListener('click', function(e) {
@@ -98,8 +119,114 @@ document.addEventListener('DOMContentLoaded', function() {
     return cookieValue;
   }
   
+  // Projector displays derive each window's token from the session's seed,
+  // so they make no requests after the page has loaded
+  function startSchedule() {
+    const schedule = qrCodeSection.dataset;
+    const windowSeconds = parseInt(schedule.qrWindow, 10);
+    const opens = parseInt(schedule.qrOpens, 10);
+    const expires = parseInt(schedule.qrExpires, 10);
+    const scale = parseInt(schedule.qrScale, 10) || 10;
+    // Follow the server's clock rather than the projector's
+    const offset = parseInt(schedule.qrNow, 10) * 1000 - Date.now();
+    const seed = Uint8Array.from(atob(schedule.qrSeed), c => c.charCodeAt(0));
+    let shownWindow = null;
+    let timer = null;
+    
+    // Same encoding as compact_token() on the server
+    function base32(bytes) {
+      const alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567';
+      let bits = 0, value = 0, output = '';
+      for (const byte of bytes) {
+        value = ((value << 8) | byte) & 0xfff;
+        bits += 8;
+        while (bits >= 5) {
+          output += alphabet[(value >>> (bits - 5)) & 31];
+          bits -= 5;
+        }
+      }
+      if (bits > 0) {
+        output += alphabet[(value << (5 - bits)) & 31];
+      }
+      return output;
+    }
+    
+    // Same derivation as scheduled_qr_token() on the server
+    function windowCode(key, index) {
+      const counter = new DataView(new ArrayBuffer(8));
+      counter.setUint32(0, Math.floor(index / 4294967296));
+      counter.setUint32(4, index >>> 0);
+      return crypto.subtle.sign('HMAC', key, counter.buffer)
+        .then(digest => base32(new Uint8Array(digest).subarray(0, 16)));
+    }
+    
+    return crypto.subtle.importKey('raw', seed, {name: 'HMAC', hash: 'SHA-256'}, false, ['sign']).then(key => {
+      function tick() {
+        const now = (Date.now() + offset) / 1000;
+        if (now > expires) {
+          clearInterval(timer);
+          qrCodeImage.remove();
+          qrCodeSection.innerHTML = '<p class="mb-0">This session has ended.</p>';
+          return;
+        }
+        
+        // The server accepts no codes before check-in opens
+        if (now < opens) {
+          qrCodeImage.hidden = true;
+          countdownDisplay.textContent = Math.ceil(opens - now);
+          return;
+        }
+        qrCodeImage.hidden = false;
+        
+        const index = Math.floor(now / windowSeconds);
+        const timeLeft = Math.ceil((index + 1) * windowSeconds - now);
+        countdownDisplay.textContent = timeLeft;
+        countdownDisplay.style.color = timeLeft <= 3 ? 'red' : '';
+        
+        if (index !== shownWindow) {
+          shownWindow = index;
+          windowCode(key, index).then(code => {
+            if (index === shownWindow) {
+              qrCodeImage.src = QRRender.dataURL(schedule.qrUrl.replace(COMPACT_CODE, code + '/'), {scale: scale});
+            }
+          });
+        }
+      }
+      
+      tick();
+      timer = setInterval(tick, 1000);
+      
+      if (generateButton) {
+        generateButton.hidden = true;
+      }
+    });
+  }
+  
+  // The compact QR URL ends in the base32 form of the token (see generate_qr_code_url)
+  const COMPACT_CODE = /[A-Z2-7]{26}\/$/;
+  const scheduled = qrCodeSection && qrCodeImage && countdownDisplay && qrCodeSection.dataset.qrSeed
+    && COMPACT_CODE.test(qrCodeSection.dataset.qrUrl)
+    && window.QRRender && window.crypto && crypto.subtle;
+  if (scheduled) {
+    startSchedule().catch(error => {
+      console.error('Could not start the QR code schedule, refreshing from the server:', error);
+      startCountdown();
+    });
+  } else {
+    startCountdown();
+  }
+  
   // Countdown functionality with auto-refresh for QR display page
-  if (countdownDisplay && qrCodeSection) {
+  function startCountdown() {
+    if (!countdownDisplay || !qrCodeSection) {
+      return;
+    }
+    
+    // The projector page leaves the image empty for the schedule to draw
+    if (qrCodeImage && !qrCodeImage.getAttribute('src')) {
+      refreshQRCode();
+    }
+    
     let timeLeft = parseInt(countdownDisplay.textContent) || 10;
     let refreshInterval = setInterval(function() {
       timeLeft--;
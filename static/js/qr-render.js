@@ -0,0 +1,380 @@
+// QR code encoder for the session QR display
+//
+// Draws the scan URL in the browser, so refreshing the QR code only needs the
+// new URL from the server. Covers what session QR codes use: byte and
+// alphanumeric mode, error correction L or M, versions 1 to 10.
+(function(scope) {
+  const ALPHANUMERIC = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:';
+
+  // Per version: [error correction codewords per block, [block count, data codewords], ...]
+  const BLOCKS = {
+    L: [
+      null,
+      [7, [1, 19]], [10, [1, 34]], [15, [1, 55]], [20, [1, 80]], [26, [1, 108]],
+      [18, [2, 68]], [20, [2, 78]], [24, [2, 97]], [30, [2, 116]], [18, [2, 68], [2, 69]],
+    ],
+    M: [
+      null,
+      [10, [1, 16]], [16, [1, 28]], [26, [1, 44]], [18, [2, 32]], [24, [2, 43]],
+      [16, [4, 27]], [18, [4, 31]], [22, [2, 38], [2, 39]], [22, [3, 36], [2, 37]], [26, [4, 43], [1, 44]],
+    ],
+  };
+  const FORMAT_BITS = {L: 1, M: 0};
+  const ALIGNMENT = [
+    null, [], [6, 18], [6, 22], [6, 26], [6, 30], [6, 34],
+    [6, 22, 38], [6, 24, 42], [6, 26, 46], [6, 28, 50],
+  ];
+  const MASKS = [
+    (i, j) => (i + j) % 2 === 0,
+    (i, j) => i % 2 === 0,
+    (i, j) => j % 3 === 0,
+    (i, j) => (i + j) % 3 === 0,
+    (i, j) => (Math.floor(i / 2) + Math.floor(j / 3)) % 2 === 0,
+    (i, j) => (i * j) % 2 + (i * j) % 3 === 0,
+    (i, j) => ((i * j) % 2 + (i * j) % 3) % 2 === 0,
+    (i, j) => ((i * j) % 3 + (i + j) % 2) % 2 === 0,
+  ];
+
+  // Arithmetic in GF(256) for the Reed-Solomon error correction
+  const EXP = new Array(512);
+  const LOG = new Array(256);
+  for(let i = 0, x = 1; i < 255; i++) {
+    EXP[i] = x;
+    LOG[x] = i;
+    x <<= 1;
+    if(x & 0x100) {
+      x ^= 0x11d;
+    }
+  }
+  for(let i = 255; i < 512; i++) {
+    EXP[i] = EXP[i - 255];
+  }
+
+  function errorCorrection(data, count) {
+    let generator = [1];
+    for(let i = 0; i < count; i++) {
+      const next = new Array(generator.length + 1).fill(0);
+      generator.forEach(function(coefficient, j) {
+        next[j] ^= coefficient;
+        next[j + 1] ^= coefficient ? EXP[LOG[coefficient] + i] : 0;
+      });
+      generator = next;
+    }
+    const remainder = data.concat(new Array(count).fill(0));
+    for(let i = 0; i < data.length; i++) {
+      const factor = remainder[i];
+      if(factor) {
+        for(let j = 1; j < generator.length; j++) {
+          if(generator[j]) {
+            remainder[i + j] ^= EXP[LOG[generator[j]] + LOG[factor]];
+          }
+        }
+      }
+    }
+    return remainder.slice(data.length);
+  }
+
+  function bch(value, generator) {
+    const degree = generator.toString(2).length - 1;
+    let remainder = value << degree;
+    while(remainder.toString(2).length > degree) {
+      remainder ^= generator << (remainder.toString(2).length - degree - 1);
+    }
+    return (value << degree) | remainder;
+  }
+
+  function blocks(version, level) {
+    const [ecCount, ...groups] = BLOCKS[level][version];
+    const sizes = [];
+    groups.forEach(([count, dataCount]) => {
+      for(let i = 0; i < count; i++) {
+        sizes.push(dataCount);
+      }
+    });
+    return {ecCount: ecCount, sizes: sizes, dataCount: sizes.reduce((a, b) => a + b, 0)};
+  }
+
+  function segment(text) {
+    if([...text].every(c => ALPHANUMERIC.includes(c))) {
+      return {mode: 2, length: text.length, text: text};
+    }
+    const bytes = new TextEncoder().encode(text);
+    return {mode: 4, length: bytes.length, bytes: bytes};
+  }
+
+  function lengthBits(mode, version) {
+    return mode === 2 ? (version < 10 ? 9 : 11) : (version < 10 ? 8 : 16);
+  }
+
+  function dataBits(seg, version) {
+    const bits = [];
+    const put = (value, count) => {
+      for(let i = count - 1; i >= 0; i--) {
+        bits.push((value >>> i) & 1);
+      }
+    };
+    put(seg.mode, 4);
+    put(seg.length, lengthBits(seg.mode, version));
+    if(seg.mode === 2) {
+      for(let i = 0; i + 1 < seg.text.length; i += 2) {
+        put(ALPHANUMERIC.indexOf(seg.text[i]) * 45 + ALPHANUMERIC.indexOf(seg.text[i + 1]), 11);
+      }
+      if(seg.text.length % 2) {
+        put(ALPHANUMERIC.indexOf(seg.text[seg.text.length - 1]), 6);
+      }
+    } else {
+      seg.bytes.forEach(byte => put(byte, 8));
+    }
+    return bits;
+  }
+
+  function codewords(seg, version, level) {
+    const layout = blocks(version, level);
+    const bits = dataBits(seg, version);
+    const limit = layout.dataCount * 8;
+    for(let i = 0; i < 4 && bits.length < limit; i++) {
+      bits.push(0);
+    }
+    while(bits.length % 8) {
+      bits.push(0);
+    }
+    const data = [];
+    for(let i = 0; i < bits.length; i += 8) {
+      data.push(bits.slice(i, i + 8).reduce((byte, bit) => (byte << 1) | bit, 0));
+    }
+    for(let i = 0; data.length < layout.dataCount; i++) {
+      data.push(i % 2 ? 0x11 : 0xec);
+    }
+
+    // Split into blocks, add their error correction and interleave them
+    const dataBlocks = [];
+    const ecBlocks = [];
+    let offset = 0;
+    layout.sizes.forEach(function(size) {
+      const block = data.slice(offset, offset + size);
+      offset += size;
+      dataBlocks.push(block);
+      ecBlocks.push(errorCorrection(block, layout.ecCount));
+    });
+    const result = [];
+    const longest = Math.max(...layout.sizes);
+    for(let i = 0; i < longest; i++) {
+      dataBlocks.forEach(block => { if(i < block.length) result.push(block[i]); });
+    }
+    for(let i = 0; i < layout.ecCount; i++) {
+      ecBlocks.forEach(block => result.push(block[i]));
+    }
+    return result;
+  }
+
+  function fitVersion(seg, level) {
+    for(let version = 1; version <= 10; version++) {
+      if(dataBits(seg, version).length <= blocks(version, level).dataCount * 8) {
+        return version;
+      }
+    }
+    throw new Error('Text is too long for a QR code of version 10');
+  }
+
+  function functionPatterns(version) {
+    const size = version * 4 + 17;
+    const modules = Array.from({length: size}, () => new Array(size).fill(null));
+
+    [[0, 0], [size - 7, 0], [0, size - 7]].forEach(function([row, col]) {
+      for(let r = -1; r <= 7; r++) {
+        for(let c = -1; c <= 7; c++) {
+          if(row + r < 0 || row + r >= size || col + c < 0 || col + c >= size) {
+            continue;
+          }
+          modules[row + r][col + c] = (
+            (r >= 0 && r <= 6 && (c === 0 || c === 6)) ||
+            (c >= 0 && c <= 6 && (r === 0 || r === 6)) ||
+            (r >= 2 && r <= 4 && c >= 2 && c <= 4)
+          );
+        }
+      }
+    });
+
+    ALIGNMENT[version].forEach(function(row) {
+      ALIGNMENT[version].forEach(function(col) {
+        if(modules[row][col] !== null) {
+          return;
+        }
+        for(let r = -2; r <= 2; r++) {
+          for(let c = -2; c <= 2; c++) {
+            modules[row + r][col + c] = Math.max(Math.abs(r), Math.abs(c)) !== 1;
+          }
+        }
+      });
+    });
+
+    for(let i = 8; i < size - 8; i++) {
+      if(modules[i][6] === null) {
+        modules[i][6] = i % 2 === 0;
+      }
+      if(modules[6][i] === null) {
+        modules[6][i] = i % 2 === 0;
+      }
+    }
+
+    if(version >= 7) {
+      const bits = bch(version, 0x1f25);
+      for(let i = 0; i < 18; i++) {
+        const dark = ((bits >> i) & 1) === 1;
+        modules[Math.floor(i / 3)][i % 3 + size - 11] = dark;
+        modules[i % 3 + size - 11][Math.floor(i / 3)] = dark;
+      }
+    }
+    return modules;
+  }
+
+  function placeFormat(modules, level, mask) {
+    const size = modules.length;
+    const bits = bch((FORMAT_BITS[level] << 3) | mask, 0x537) ^ 0x5412;
+    for(let i = 0; i < 15; i++) {
+      const dark = ((bits >> i) & 1) === 1;
+      modules[i < 6 ? i : (i < 8 ? i + 1 : size - 15 + i)][8] = dark;
+      modules[8][i < 8 ? size - i - 1 : (i < 9 ? 15 - i : 14 - i)] = dark;
+    }
+    modules[size - 8][8] = true;
+  }
+
+  function placeData(modules, data, mask) {
+    const size = modules.length;
+    const masked = MASKS[mask];
+    let bitIndex = 0;
+    let row = size - 1;
+    let step = -1;
+    for(let col = size - 1; col > 0; col -= 2) {
+      if(col === 6) {
+        col--;
+      }
+      for(;;) {
+        for(let c = col; c > col - 2; c--) {
+          if(modules[row][c] === null) {
+            const byte = data[bitIndex >> 3];
+            let dark = byte !== undefined && ((byte >> (7 - (bitIndex & 7))) & 1) === 1;
+            if(masked(row, c)) {
+              dark = !dark;
+            }
+            modules[row][c] = dark;
+            bitIndex++;
+          }
+        }
+        row += step;
+        if(row < 0 || row >= size) {
+          row -= step;
+          step = -step;
+          break;
+        }
+      }
+    }
+  }
+
+  // The standard penalty score; the mask with the lowest one is used
+  function penalty(modules) {
+    const size = modules.length;
+    let score = 0;
+    const lines = [];
+    for(let i = 0; i < size; i++) {
+      lines.push(modules[i]);
+      lines.push(modules.map(row => row[i]));
+    }
+    lines.forEach(function(line) {
+      let run = 1;
+      for(let i = 1; i <= size; i++) {
+        if(i < size && line[i] === line[i - 1]) {
+          run++;
+        } else {
+          if(run >= 5) {
+            score += run - 2;
+          }
+          run = 1;
+        }
+      }
+      // Finder-like runs next to four light modules; the quiet zone is light
+      const text = '0000' + line.map(dark => (dark ? '1' : '0')).join('') + '0000';
+      for(let i = 0; i + 11 <= text.length; i++) {
+        const stretch = text.slice(i, i + 11);
+        if(stretch === '00001011101' || stretch === '10111010000') {
+          score += 40;
+        }
+      }
+    });
+    let dark = 0;
+    for(let r = 0; r < size; r++) {
+      for(let c = 0; c < size; c++) {
+        dark += modules[r][c] ? 1 : 0;
+        if(r + 1 < size && c + 1 < size && modules[r][c] === modules[r][c + 1] &&
+           modules[r][c] === modules[r + 1][c] && modules[r][c] === modules[r + 1][c + 1]) {
+          score += 3;
+        }
+      }
+    }
+    score += Math.floor(Math.abs(dark * 20 - size * size * 10) / (size * size)) * 10;
+    return score;
+  }
+
+  const QRRender = {
+    // Rows of booleans for ``text``; ``options.mask`` forces a mask pattern
+    matrix: function(text, options) {
+      options = options || {};
+      const level = options.level || 'L';
+      const seg = segment(text);
+      const version = options.version || fitVersion(seg, level);
+      const data = codewords(seg, version, level);
+      const template = functionPatterns(version);
+
+      const build = function(mask) {
+        const modules = template.map(row => row.slice());
+        placeFormat(modules, level, mask);
+        placeData(modules, data, mask);
+        return modules;
+      };
+      if(options.mask !== undefined) {
+        return build(options.mask);
+      }
+      let best = null;
+      let bestScore = Infinity;
+      for(let mask = 0; mask < 8; mask++) {
+        const modules = build(mask);
+        const score = penalty(modules);
+        if(score < bestScore) {
+          best = modules;
+          bestScore = score;
+        }
+      }
+      return best;
+    },
+
+    // Draws ``text`` on a canvas with ``scale`` pixels per module
+    draw: function(canvas, text, options) {
+      options = options || {};
+      const scale = options.scale || 10;
+      const border = options.border === undefined ? 1 : options.border;
+      const modules = QRRender.matrix(text, options);
+      const side = (modules.length + border * 2) * scale;
+      canvas.width = side;
+      canvas.height = side;
+      const context = canvas.getContext('2d');
+      context.fillStyle = '#fff';
+      context.fillRect(0, 0, side, side);
+      context.fillStyle = '#000';
+      modules.forEach(function(row, r) {
+        row.forEach(function(dark, c) {
+          if(dark) {
+            context.fillRect((c + border) * scale, (r + border) * scale, scale, scale);
+          }
+        });
+      });
+      return canvas;
+    },
+
+    // A PNG data URL of ``text``, for an <img>
+    dataURL: function(text, options) {
+      return QRRender.draw(document.createElement('canvas'), text, options).toDataURL('image/png');
+    },
+  };
+
+  scope.QRRender = QRRender;
+})(self);
@@ -0,0 +1,141 @@
+// Queue of scanned QR codes waiting to be submitted
+//
+// Shared by the scanner page and its service worker. Scans are kept in
+// IndexedDB with the time they were captured, so a scan made while the
+// network is slow or down is submitted later and still counts from the
+// moment it was taken. Results of submitted scans, with their signed
+// receipts, are kept in a second store.
+(function(scope) {
+  const DB_NAME = 'scaatt-scanner';
+  const SCANS = 'scans';
+  const RECEIPTS = 'receipts';
+  const KEPT_RECEIPTS = 20;
+  // The most scans the server takes in one request (QUEUED_CHECKIN_BATCH_SIZE)
+  const BATCH_SIZE = 50;
+
+  function open() {
+    return new Promise(function(resolve, reject) {
+      const request = indexedDB.open(DB_NAME, 1);
+      request.onupgradeneeded = function() {
+        request.result.createObjectStore(SCANS, {keyPath: 'id'});
+        request.result.createObjectStore(RECEIPTS, {keyPath: 'id'});
+      };
+      request.onsuccess = function() { resolve(request.result); };
+      request.onerror = function() { reject(request.error); };
+    });
+  }
+
+  function transact(store, mode, work) {
+    return open().then(function(db) {
+      return new Promise(function(resolve, reject) {
+        const tx = db.transaction(store, mode);
+        const result = work(tx.objectStore(store));
+        tx.oncomplete = function() { resolve(result && 'result' in result ? result.result : result); };
+        tx.onerror = function() { reject(tx.error); };
+      });
+    });
+  }
+
+  function newId() {
+    if(scope.crypto && scope.crypto.randomUUID) {
+      return scope.crypto.randomUUID();
+    }
+    return Date.now().toString(36) + Math.random().toString(36).slice(2);
+  }
+
+  const ScanQueue = {
+    // Pulls the session id and token out of an attendance URL, or returns null.
+    // Compact URLs (/S/<id>/<code>/) carry the token in base32.
+    parse: function(text) {
+      const match = /\/attendance\/mark\/(\d+)\/([^/?#]+)/.exec(text) || /\/S\/(\d+)\/([A-Z2-7]{26})\//.exec(text);
+      return match ? {session_id: parseInt(match[1], 10), token: decodeURIComponent(match[2])} : null;
+    },
+
+    add: function(scan, csrfToken) {
+      const entry = Object.assign({id: newId(), captured_at: Date.now(), csrf: csrfToken}, scan);
+      return transact(SCANS, 'readwrite', store => store.put(entry)).then(() => entry);
+    },
+
+    pending: function() {
+      return transact(SCANS, 'readonly', store => store.getAll());
+    },
+
+    receipts: function() {
+      return transact(RECEIPTS, 'readonly', store => store.getAll()).then(function(items) {
+        return items.sort((a, b) => b.submitted_at - a.submitted_at);
+      });
+    },
+
+    // Submits every pending scan, oldest first, in requests of at most
+    // BATCH_SIZE scans. Resolves with the results, or rejects and keeps the
+    // scans not yet answered if the server could not be reached.
+    flush: function(url) {
+      return ScanQueue.pending().then(function(scans) {
+        scans.sort((a, b) => a.captured_at - b.captured_at);
+        // The newest scan has the current CSRF token
+        const csrfToken = scans.length ? scans[scans.length - 1].csrf : null;
+        let results = [];
+        let next = Promise.resolve();
+        for(let start = 0; start < scans.length; start += BATCH_SIZE) {
+          const batch = scans.slice(start, start + BATCH_SIZE);
+          next = next
+            .then(() => ScanQueue.submit(url, batch, csrfToken))
+            .then(batchResults => { results = results.concat(batchResults); });
+        }
+        return next.then(() => results);
+      });
+    },
+
+    // Submits one batch of scans and settles the answered ones
+    submit: function(url, scans, csrfToken) {
+      return fetch(url, {
+        method: 'POST',
+        credentials: 'same-origin',
+        headers: {
+          'Content-Type': 'application/json',
+          'X-CSRFToken': csrfToken,
+          'X-Requested-With': 'XMLHttpRequest',
+        },
+        body: JSON.stringify({
+          sent_at: Date.now(),
+          scans: scans.map(scan => ({
+            id: scan.id, session_id: scan.session_id, token: scan.token, captured_at: scan.captured_at,
+          })),
+        }),
+      })
+        .then(response => {
+          if(!response.ok) {
+            throw new Error('Check-ins were not accepted (' + response.status + ')');
+          }
+          return response.json();
+        })
+        .then(data => ScanQueue.settle(scans, data.results));
+    },
+
+    // Moves answered scans from the queue to the receipts
+    settle: function(scans, results) {
+      const submittedAt = Date.now();
+      return open().then(function(db) {
+        return new Promise(function(resolve, reject) {
+          const tx = db.transaction([SCANS, RECEIPTS], 'readwrite');
+          const receipts = tx.objectStore(RECEIPTS);
+          results.forEach(function(result) {
+            tx.objectStore(SCANS).delete(result.id);
+            receipts.put(Object.assign({submitted_at: submittedAt}, result));
+          });
+          // Keep only the most recent receipts
+          receipts.getAll().onsuccess = function(event) {
+            event.target.result
+              .sort((a, b) => b.submitted_at - a.submitted_at)
+              .slice(KEPT_RECEIPTS)
+              .forEach(old => receipts.delete(old.id));
+          };
+          tx.oncomplete = function() { resolve(results); };
+          tx.onerror = function() { reject(tx.error); };
+        });
+      });
+    },
+  };
+
+  scope.ScanQueue = ScanQueue;
+})(self);
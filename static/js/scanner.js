@@ -0,0 +1,234 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const startButton = document.getElementById('start-button');
+    const stopButton = document.getElementById('stop-button');
+    const switchCameraButton = document.getElementById('switch-camera');
+    const scanResult = document.getElementById('scan-result');
+    const troubleshooting = document.getElementById('troubleshooting');
+    const checkIns = document.getElementById('check-ins');
+    const checkInList = document.getElementById('check-in-list');
+    const checkInUrl = checkIns.dataset.checkInUrl;
+    // Without IndexedDB, scans open the attendance URL directly as before
+    const canQueue = !!window.indexedDB;
+
+    let html5QrCode;
+    let currentCameraId;
+    let cameras = [];
+    let currentCameraIndex = 0;
+
+    startButton.addEventListener('click', function() {
+        initScanner();
+    });
+
+    stopButton.addEventListener('click', function() {
+        stopScanner();
+    });
+
+    switchCameraButton.addEventListener('click', function() {
+        if (cameras.length > 1) {
+            stopScanner();
+            currentCameraIndex = (currentCameraIndex + 1) % cameras.length;
+            startScanner(cameras[currentCameraIndex].id);
+        }
+    });
+
+    function initScanner() {
+        // Show troubleshooting info
+        troubleshooting.style.display = 'block';
+
+        // Create QR code scanner instance
+        html5QrCode = new Html5Qrcode("qr-reader");
+
+        // Get available cameras
+        Html5Qrcode.getCameras()
+            .then(devices => {
+                cameras = devices;
+                console.log("Available cameras:", cameras);
+
+                if (devices && devices.length) {
+                    // Show switch camera button if multiple cameras available
+                    if (devices.length > 1) {
+                        switchCameraButton.style.display = 'inline-block';
+                    }
+
+                    // Start scanner with first camera
+                    startScanner(devices[0].id);
+                } else {
+                    scanResult.innerHTML = `
+                        <div class="alert alert-danger">
+                            <strong>No cameras found!</strong><br>
+                            Please make sure your device has a camera and you've granted permission.
+                        </div>
+                    `;
+                }
+            })
+            .catch(err => {
+                console.error("Error getting cameras", err);
+                scanResult.innerHTML = `
+                    <div class="alert alert-danger">
+                        <strong>Error accessing camera:</strong><br>
+                        ${err}<br><br>
+                        <strong>Possible solutions:</strong>
+                        <ul>
+                            <li>Make sure you're using HTTPS or localhost</li>
+                            <li>Check that your browser supports camera access</li>
+                            <li>Grant camera permission when prompted</li>
+                            <li>Try a different browser (Chrome or Firefox recommended)</li>
+                        </ul>
+                    </div>
+                `;
+            });
+    }
+
+    function startScanner(cameraId) {
+        currentCameraId = cameraId;
+
+        const config = {
+            fps: 10,
+            qrbox: { width: 250, height: 250 },
+            aspectRatio: 1.0
+        };
+
+        scanResult.innerHTML = `<div class="alert alert-info">Starting camera...</div>`;
+
+        html5QrCode.start(
+            cameraId, 
+            config,
+            (decodedText, decodedResult) => {
+                // On successful scan
+                console.log(`QR Code detected: ${decodedText}`);
+                scanResult.innerHTML = `<div class="alert alert-success">QR Code detected! Submitting...</div>`;
+
+                // Stop scanning
+                stopScanner();
+
+                // Save the scan on the device, then submit it
+                const scan = canQueue && ScanQueue.parse(decodedText);
+                if (scan) {
+                    ScanQueue.add(scan, csrfToken())
+                        .then(() => submitScans())
+                        .catch(() => { window.location.href = decodedText; });
+                    return;
+                }
+
+                // Redirect to the attendance URL
+                if (decodedText.includes('/attendance/mark/') || /\/S\/\d+\/[A-Z2-7]{26}\//.test(decodedText)) {
+                    window.location.href = decodedText;
+                } else {
+                    scanResult.innerHTML = `<div class="alert alert-danger">Invalid QR code. Please try again.</div>`;
+                    setTimeout(() => {
+                        startScanner(currentCameraId);
+                    }, 2000);
+                }
+            },
+            (errorMessage) => {
+                // On error - we'll ignore this as it's usually just frames without QR codes
+                // console.error(errorMessage);
+            }
+        ).then(() => {
+            console.log(`Scanner started with camera ID: ${cameraId}`);
+            startButton.style.display = 'none';
+            stopButton.style.display = 'inline-block';
+        }).catch(err => {
+            console.error("Error starting scanner:", err);
+            scanResult.innerHTML = `
+                <div class="alert alert-danger">
+                    <strong>Error starting camera:</strong><br>
+                    ${err}<br><br>
+                    <strong>This could be due to:</strong>
+                    <ul>
+                        <li>Camera permission denied</li>
+                        <li>Camera already in use by another application</li>
+                        <li>Browser doesn't support camera access</li>
+                    </ul>
+                </div>
+            `;
+        });
+    }
+
+    function csrfToken() {
+        const match = document.cookie.match(/(?:^|; )csrftoken=([^;]+)/);
+        if (match) {
+            return decodeURIComponent(match[1]);
+        }
+        return document.querySelector('input[name="csrfmiddlewaretoken"]').value;
+    }
+
+    function submitScans() {
+        return ScanQueue.flush(checkInUrl)
+            .then(results => showResults(results))
+            .catch(() => {
+                // Offline or the server is busy: keep the scans and let the service worker retry
+                if ('serviceWorker' in navigator && 'SyncManager' in window) {
+                    navigator.serviceWorker.ready
+                        .then(registration => registration.sync.register('check-ins'))
+                        .catch(() => {});
+                }
+                ScanQueue.pending().then(scans => {
+                    if (scans.length) {
+                        scanResult.innerHTML = `<div class="alert alert-warning">Scan saved. It will be submitted as soon as you are back online.</div>`;
+                    }
+                });
+            })
+            .finally(renderCheckIns);
+    }
+
+    function showResults(results) {
+        if (!results.length) {
+            return;
+        }
+        scanResult.innerHTML = results.map(result => {
+            const level = result.result === 'recorded' ? 'success' : result.result === 'duplicate' ? 'info' : 'danger';
+            return `<div class="alert alert-${level}">${result.message}</div>`;
+        }).join('');
+    }
+
+    function renderCheckIns() {
+        return Promise.all([ScanQueue.pending(), ScanQueue.receipts()]).then(([scans, receipts]) => {
+            const items = scans.map(scan => `
+                <li class="list-group-item d-flex justify-content-between align-items-center">
+                    Waiting to be submitted
+                    <small class="text-muted">${new Date(scan.captured_at).toLocaleTimeString()}</small>
+                </li>
+            `).concat(receipts.map(receipt => `
+                <li class="list-group-item">
+                    <div class="d-flex justify-content-between align-items-center">
+                        ${receipt.message}
+                        <small class="text-muted">${new Date(receipt.check_in_time || receipt.submitted_at).toLocaleTimeString()}</small>
+                    </div>
+                    ${receipt.receipt ? `<small class="text-muted">Receipt: <code title="${receipt.receipt}">${receipt.receipt.slice(-12)}</code></small>` : ''}
+                </li>
+            `));
+            checkInList.innerHTML = items.join('');
+            checkIns.classList.toggle('d-none', !items.length);
+        });
+    }
+
+    if (canQueue) {
+        if ('serviceWorker' in navigator) {
+            navigator.serviceWorker.register(checkIns.dataset.serviceWorkerUrl).catch(err => {
+                console.error('Error registering the scanner service worker:', err);
+            });
+            navigator.serviceWorker.addEventListener('message', event => {
+                if (event.data && event.data.type === 'check-ins') {
+                    showResults(event.data.results);
+                    renderCheckIns();
+                }
+            });
+        }
+        window.addEventListener('online', submitScans);
+        // Submit anything left over from an earlier visit
+        submitScans();
+    }
+
+    function stopScanner() {
+        if (html5QrCode && html5QrCode.isScanning) {
+            html5QrCode.stop().then(() => {
+                console.log('Scanner stopped');
+                startButton.style.display = 'inline-block';
+                stopButton.style.display = 'none';
+            }).catch(err => {
+                console.error('Error stopping scanner:', err);
+            });
+        }
+    }
+});
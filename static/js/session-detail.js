@@ -0,0 +1,97 @@
+function copyAttendanceCode() {
+    var codeInput = document.getElementById("attendance-code");
+    codeInput.select();
+    document.execCommand("copy");
+    alert("Attendance code copied to clipboard!");
+}
+
+// QR Code Auto-refresh functionality
+document.addEventListener('DOMContentLoaded', function() {
+    const countdownTimer = document.getElementById('countdown-timer');
+    const qrCodeImage = document.getElementById('qr-code-image');
+    const manualRefreshBtn = document.getElementById('manual-refresh-btn');
+    const qrCodeSection = document.getElementById('qr-code-section');
+
+    let timeLeft = 10; // 10 seconds
+    let refreshInterval;
+    
+    function csrfToken() {
+        const match = document.cookie.match(/(?:^|; )csrftoken=([^;]+)/);
+        if (match) {
+            return decodeURIComponent(match[1]);
+        }
+        const input = document.querySelector('input[name="csrfmiddlewaretoken"]');
+        return input ? input.value : '';
+    }
+
+    // Check if session is closed
+    if (qrCodeSection && qrCodeSection.dataset.sessionClosed === 'true') {
+        // Don't start the countdown if session is closed
+        return;
+    }
+
+    // Function to refresh QR code via AJAX
+    function refreshQRCode() {
+        // Only the new token comes back; the QR code is drawn here
+        fetch(qrCodeSection.dataset.tokenUrl, {
+            method: 'POST',
+            headers: {
+                'X-CSRFToken': csrfToken(),
+                'X-Requested-With': 'XMLHttpRequest',
+                'Content-Type': 'application/x-www-form-urlencoded',
+            },
+            body: 'duration=10'
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.url) {
+                if (qrCodeImage) {
+                    qrCodeImage.src = QRRender.dataURL(data.url, {scale: 10});
+                }
+                const attendanceCode = document.getElementById('attendance-code');
+                if (attendanceCode) {
+                    attendanceCode.value = qrCodeSection.dataset.sessionId + '-' + data.token;
+                }
+                timeLeft = 10;
+                startCountdown();
+            }
+        })
+        .catch(error => {
+            console.error('Error refreshing QR code:', error);
+        });
+    }
+
+    // Function to start countdown
+    function startCountdown() {
+        // Clear any existing interval
+        if (refreshInterval) {
+            clearInterval(refreshInterval);
+        }
+
+        // Update countdown every second
+        refreshInterval = setInterval(function() {
+            timeLeft--;
+
+            if (countdownTimer) {
+                countdownTimer.textContent = timeLeft;
+            }
+
+            if (timeLeft <= 0) {
+                clearInterval(refreshInterval);
+                refreshQRCode();
+            }
+        }, 1000);
+    }
+
+    // Start countdown when page loads
+    if (countdownTimer && qrCodeImage) {
+        startCountdown();
+    }
+
+    // Manual refresh button
+    if (manualRefreshBtn) {
+        manualRefreshBtn.addEventListener('click', function() {
+            refreshQRCode();
+        });
+    }
+});
@@ -0,0 +1,59 @@
+{% load static %}// Scanner service worker
+//
+// Keeps the scanner page and its scripts available without a network, and
+// submits queued scans through Background Sync where the browser supports it.
+importScripts('{% static "js/scan-queue.js" %}');
+
+const CACHE = 'scaatt-scanner-v1';
+const SCANNER_URL = '{% url "scanner" %}';
+const CHECK_IN_URL = '{% url "queued_check_ins" %}';
+const SYNC_TAG = 'check-ins';
+
+self.addEventListener('install', function(event) {
+  event.waitUntil(
+    caches.open(CACHE)
+      .then(cache => cache.add(new Request(SCANNER_URL, {credentials: 'same-origin'})))
+      .catch(() => {})
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener('activate', function(event) {
+  event.waitUntil(
+    caches.keys()
+      .then(keys => Promise.all(keys.filter(key => key !== CACHE).map(key => caches.delete(key))))
+      .then(() => self.clients.claim())
+  );
+});
+
+// Network first, so the page and its assets stay current; the cached copy is
+// only used while offline.
+self.addEventListener('fetch', function(event) {
+  if(event.request.method !== 'GET') {
+    return;
+  }
+  event.respondWith(
+    fetch(event.request)
+      .then(function(response) {
+        if(response.ok || response.type === 'opaque') {
+          const copy = response.clone();
+          caches.open(CACHE).then(cache => cache.put(event.request, copy));
+        }
+        return response;
+      })
+      .catch(() => caches.match(event.request).then(cached => cached || Response.error()))
+  );
+});
+
+self.addEventListener('sync', function(event) {
+  if(event.tag !== SYNC_TAG) {
+    return;
+  }
+  event.waitUntil(
+    ScanQueue.flush(CHECK_IN_URL).then(function(results) {
+      return self.clients.matchAll({type: 'window'}).then(function(clients) {
+        clients.forEach(client => client.postMessage({type: 'check-ins', results: results}));
+      });
+    })
+  );
+});
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class UtilsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'utils'
+    verbose_name = 'Utilities'
+
+    def ready(self):
+        import utils.database  # noqa
@@ -0,0 +1,79 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+from utils.db_router import replica_generation
+
+
+COURSE_VERSION_KEY = 'course:{course_id}:version'
+
+
+def _new_version():
+    """Return a version seed that cannot collide with previously evicted versions"""
+    return int(time.time() * 1000)
+
+
+def get_version(key):
+    """Return the version counter stored at ``key``, starting one if there is none"""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """Increment the version counter stored at ``key``"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The counter was evicted; start over from a fresh seed
+        version = _new_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def get_course_version(course_id):
+    """Return the current cache version for a course"""
+    return get_version(COURSE_VERSION_KEY.format(course_id=course_id))
+
+
+def get_course_versions(course_ids, create=True):
+    """
+    Return a {course_id: version} mapping in a single cache round-trip. With
+    ``create=False``, courses without a version yet are left out instead of
+    being given one, e.g. for ids that come straight from a URL.
+    """
+    course_ids = set(course_ids)
+    keys = {COURSE_VERSION_KEY.format(course_id=course_id): course_id for course_id in course_ids}
+    found = cache.get_many(keys.keys())
+
+    versions = {keys[key]: version for key, version in found.items()}
+    if create:
+        for course_id in course_ids - versions.keys():
+            versions[course_id] = get_course_version(course_id)
+
+    # Values computed from a lagging replica must not be shared with primary reads
+    generation = replica_generation()
+    if generation is not None:
+        versions = {course_id: f'{version}r{generation}' for course_id, version in versions.items()}
+
+    return versions
+
+
+def bump_course_version(course_id):
+    """Invalidate every cached value and fragment of a course"""
+    return bump_version(COURSE_VERSION_KEY.format(course_id=course_id))
+
+
+def course_cache_key(course_id, version, *parts):
+    """Build a cache key scoped to a specific version of a course"""
+    suffix = ':'.join(str(part) for part in parts)
+    return f"course:{course_id}:v{version}:{suffix}"
+
+
+def get_or_set_course_value(course_id, version, parts, default, timeout=None):
+    """Get a versioned per-course value, computing it with ``default`` on a miss"""
+    if timeout is None:
+        timeout = settings.FRAGMENT_CACHE_TIMEOUT
+    key = course_cache_key(course_id, version, *parts)
+    return cache.get_or_set(key, default, timeout)
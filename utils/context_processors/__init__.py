@@ -6,4 +6,12 @@ def media_url(request):
     """
     return {
         'MEDIA_URL': settings.MEDIA_URL,
-    } 
\ No newline at end of file
+    } 
+
+def cache_settings(request):
+    """
+    Add cache-related context variables to the context.
+    """
+    return {
+        'FRAGMENT_CACHE_TIMEOUT': settings.FRAGMENT_CACHE_TIMEOUT,
+    }
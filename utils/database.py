@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Apply the SQLITE_PRAGMAS setting to every new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+
+    # The replica is a read-only snapshot and keeps the journal mode it was copied with
+    if connection.alias == getattr(settings, 'REPLICA_DATABASE_ALIAS', None):
+        return
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value};')
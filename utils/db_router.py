@@ -0,0 +1,113 @@
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+
+
+_replica_reads = ContextVar('replica_reads', default=False)
+_pinned_to_primary = ContextVar('pinned_to_primary', default=False)
+_has_written = ContextVar('has_written', default=False)
+
+
+def replica_alias():
+    """Return the configured replica alias, or None if no replica is set up"""
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def replica_generation():
+    """
+    Identify the replica snapshot that reads are currently served from, or
+    return None when reads go to the primary. Cache keys for data read from the
+    replica include it, so they never outlive the snapshot they were built from.
+    """
+    alias = replica_alias()
+    if not alias or not _replica_reads.get() or _pinned_to_primary.get():
+        return None
+
+    name = settings.DATABASES[alias]['NAME']
+    try:
+        return os.stat(name).st_mtime_ns
+    except (OSError, TypeError):
+        # Not a file-based replica; fall back to a constant generation
+        return 0
+
+
+@contextmanager
+def replica_reads():
+    """
+    Send reads made inside this block to the read replica.
+    Also usable as a decorator for report and export functions.
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def pinned_to_primary():
+    """Keep every read made inside this block on the primary database"""
+    token = _pinned_to_primary.set(True)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Route reporting reads to the replica and everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and not _pinned_to_primary.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        _has_written.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica is a copy of the primary, so objects from both may be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != replica_alias()
+
+
+class ReplicaPinningMiddleware:
+    """
+    Read-your-writes stickiness: after a request from a user writes to the
+    database, their reports are served from the primary until the replica has
+    caught up. Check-ins are GET requests, so writes are detected by the router
+    rather than by HTTP method.
+    """
+
+    cookie_name = 'db_pin'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_alias():
+            return self.get_response(request)
+
+        written = _has_written.set(False)
+        try:
+            if self.cookie_name in request.COOKIES:
+                with pinned_to_primary():
+                    response = self.get_response(request)
+            else:
+                response = self.get_response(request)
+
+            if _has_written.get():
+                response.set_cookie(
+                    self.cookie_name, '1',
+                    max_age=settings.REPLICA_PIN_SECONDS,
+                    httponly=True,
+                    samesite='Lax',
+                )
+        finally:
+            _has_written.reset(written)
+        return response
@@ -3,15 +3,23 @@ import xlsxwriter # type: ignore
 import io
 from datetime import datetime
 from django.http import HttpResponse
+from django.utils import timezone
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
+from utils.db_router import replica_reads
+from utils.metrics import EXPORT_DURATION
+from apps.attendance.models import Attendance
 
 
+@EXPORT_DURATION.time(format='csv')
+@replica_reads()
 def export_attendance_to_csv(attendances, course_name):
     """Export attendance records to CSV format"""
     
+    attendances = attendances.for_export()
+    
     # Create a response object with CSV content type
     response = HttpResponse(content_type='text/csv')
     response['Content-Disposition'] = f'attachment; filename="attendance_{course_name}_{datetime.now().strftime("%Y%m%d")}.csv"'
@@ -37,14 +45,18 @@ def export_attendance_to_csv(attendances, course_name):
     return response
 
 
+@EXPORT_DURATION.time(format='excel')
+@replica_reads()
 def export_attendance_to_excel(attendances, course_name):
     """Export attendance records to Excel format"""
     
+    attendances = attendances.for_export()
+    
     # Create an in-memory output file
     output = io.BytesIO()
     
-    # Create a workbook and add a worksheet
-    workbook = xlsxwriter.Workbook(output)
+    # Create a workbook and add a worksheet (Excel has no timezone support)
+    workbook = xlsxwriter.Workbook(output, {'remove_timezone': True})
     worksheet = workbook.add_worksheet('Attendance')
     
     # Add formats
@@ -69,7 +81,7 @@ def export_attendance_to_excel(attendances, course_name):
         worksheet.write(row, 1, attendance.student.email)
         worksheet.write(row, 2, attendance.session.title)
         worksheet.write_datetime(row, 3, attendance.session.date, date_format)
-        worksheet.write_datetime(row, 4, attendance.check_in_time, datetime_format)
+        worksheet.write_datetime(row, 4, timezone.localtime(attendance.check_in_time), datetime_format)
         worksheet.write(row, 5, attendance.get_status_display())
         worksheet.write(row, 6, attendance.notes)
     
@@ -91,9 +103,13 @@ def export_attendance_to_excel(attendances, course_name):
     return response
 
 
+@EXPORT_DURATION.time(format='pdf')
+@replica_reads()
 def export_attendance_to_pdf(attendances, course_name):
     """Export attendance records to PDF format"""
     
+    attendances = attendances.for_export()
+    
     # Create an in-memory output file
     buffer = io.BytesIO()
     
@@ -166,6 +182,8 @@ def export_attendance_to_pdf(attendances, course_name):
     return response
 
 
+@EXPORT_DURATION.time(format='session_summary_excel')
+@replica_reads()
 def export_session_summary_to_excel(course, sessions):
     """Export session summary to Excel format"""
     
@@ -207,6 +225,14 @@ def export_session_summary_to_excel(course, sessions):
     enrollments = course.enrollments.filter(is_active=True).select_related('student')
     students = [enrollment.student for enrollment in enrollments]
     
+    # Load every attendance status of the course at once: {session_id: {student_id: status}}
+    sessions = list(sessions.defer('description'))
+    statuses = {session.id: {} for session in sessions}
+    rows = Attendance.objects.filter(session__course=course).values_list('session_id', 'student_id', 'status')
+    for session_id, student_id, status in rows:
+        if session_id in statuses:
+            statuses[session_id][student_id] = status
+    
     # Write summary statistics
     summary_sheet.write(6, 0, 'Total Sessions:')
     summary_sheet.write(6, 1, len(sessions))
@@ -223,7 +249,7 @@ def export_session_summary_to_excel(course, sessions):
     sessions_sheet.write(2, 5, 'Attendance Rate', header_format)
     
     for row, session in enumerate(sessions, start=3):
-        attendance_count = session.attendances.count()
+        attendance_count = len(statuses[session.id])
         attendance_rate = attendance_count / len(students) if students else 0
         
         sessions_sheet.write(row, 0, session.title)
@@ -248,15 +274,11 @@ def export_session_summary_to_excel(course, sessions):
         students_sheet.write(row, 0, session.title)
         students_sheet.write_datetime(row, 1, session.date, date_format)
         
-        # Get attendance records for this session
-        attendances = session.attendances.all()
-        attendance_dict = {a.student.id: a for a in attendances}
-        
         # Write attendance status for each student
         for col, student in enumerate(students, start=2):
-            attendance = attendance_dict.get(student.id)
-            if attendance:
-                students_sheet.write(row, col, attendance.get_status_display())
+            status = statuses[session.id].get(student.id)
+            if status:
+                students_sheet.write(row, col, Attendance.Status(status).label)
             else:
                 students_sheet.write(row, col, 'Absent')
     
@@ -0,0 +1,195 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache.backends.base import BaseCache
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger('request_metrics')
+
+_metrics = ContextVar('request_metrics', default=None)
+_MISSING = object()
+
+
+class RequestMetrics:
+    """Counters collected while a sampled request is being handled"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.template_time = 0.0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+def current_metrics():
+    """Return the metrics of the request being handled, or None if it is not sampled"""
+    return _metrics.get()
+
+
+class RequestMetricsMiddleware:
+    """
+    Log wall time, SQL, cache and template timings of sampled requests as one
+    JSON line each, and expose them in a Server-Timing header in DEBUG or to
+    staff users.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'REQUEST_METRICS_SAMPLE_RATE', 0.01)
+
+    def __call__(self, request):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            _metrics.reset(token)
+
+        wall = time.perf_counter() - metrics.start
+        match = request.resolver_match
+        logger.info(json.dumps({
+            'url_name': match.view_name if match else None,
+            'path': request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'wall_ms': round(wall * 1000, 2),
+            'db_queries': metrics.db_queries,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'cache_hits': metrics.cache_hits,
+            'cache_misses': metrics.cache_misses,
+            'template_ms': round(metrics.template_time * 1000, 2),
+        }))
+
+        # The timings tell how the database and cache are used; keep them from other clients
+        user = getattr(request, 'user', None)
+        if not (settings.DEBUG or (user is not None and user.is_staff)):
+            return response
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.db_queries} queries"',
+            f'tpl;dur={metrics.template_time * 1000:.1f}',
+            f'cache;desc="{metrics.cache_hits} hits, {metrics.cache_misses} misses"',
+            f'total;dur={wall * 1000:.1f}',
+        ])
+        return response
+
+
+class InstrumentedCache(BaseCache):
+    """
+    Cache backend that counts hits and misses of sampled requests and delegates
+    everything to the backend named by WRAPPED_BACKEND.
+    """
+
+    def __init__(self, location, params):
+        params = dict(params)
+        wrapped = import_string(params.pop('WRAPPED_BACKEND'))
+        self._cache = wrapped(location, params)
+        super().__init__(params)
+
+    def _count(self, hits, misses):
+        metrics = _metrics.get()
+        if metrics is not None:
+            metrics.cache_hits += hits
+            metrics.cache_misses += misses
+
+    def get(self, key, default=None, version=None):
+        value = self._cache.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._count(0, 1)
+            return default
+        self._count(1, 0)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = self._cache.get_many(keys, version=version)
+        self._count(len(found), len(keys) - len(found))
+        return found
+
+    def add(self, key, value, timeout=BaseCache.get_backend_timeout, version=None):
+        return self._cache.add(key, value, timeout=self._timeout(timeout), version=version)
+
+    def set(self, key, value, timeout=BaseCache.get_backend_timeout, version=None):
+        return self._cache.set(key, value, timeout=self._timeout(timeout), version=version)
+
+    def set_many(self, data, timeout=BaseCache.get_backend_timeout, version=None):
+        return self._cache.set_many(data, timeout=self._timeout(timeout), version=version)
+
+    def touch(self, key, timeout=BaseCache.get_backend_timeout, version=None):
+        return self._cache.touch(key, timeout=self._timeout(timeout), version=version)
+
+    def delete(self, key, version=None):
+        return self._cache.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        return self._cache.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        return self._cache.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        return self._cache.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        return self._cache.decr(key, delta, version=version)
+
+    def clear(self):
+        return self._cache.clear()
+
+    def close(self, **kwargs):
+        return self._cache.close(**kwargs)
+
+    def _timeout(self, timeout):
+        # Let the wrapped backend apply its own default timeout
+        return self._cache.default_timeout if timeout is BaseCache.get_backend_timeout else timeout
+
+
+class InstrumentedTemplate(Template):
+    """Template that adds its render time to the current request metrics"""
+
+    def render(self, context=None, request=None):
+        metrics = _metrics.get()
+        if metrics is None:
+            return super().render(context, request)
+
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Django template backend whose templates report their render time"""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return InstrumentedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,49 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class Broker:
+    """
+    In-process publish/subscribe for live page updates. Subscribers get their
+    own queue per topic. Events only reach streams served by the same process,
+    so consumers must also catch up from the database now and then for writes
+    made by other workers.
+    """
+
+    def __init__(self, max_pending=1000):
+        self.max_pending = max_pending
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def subscribe(self, topic):
+        """Yield a queue receiving the events published to ``topic`` until the block exits"""
+        events = queue.Queue(maxsize=self.max_pending)
+        with self.lock:
+            self.subscribers.setdefault(topic, set()).add(events)
+        try:
+            yield events
+        finally:
+            with self.lock:
+                subscribers = self.subscribers.get(topic, set())
+                subscribers.discard(events)
+                if not subscribers:
+                    self.subscribers.pop(topic, None)
+
+    def publish(self, topic, event):
+        with self.lock:
+            subscribers = list(self.subscribers.get(topic, ()))
+        for events in subscribers:
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                # A stalled stream drops live events; its database catch-up still finds them
+                pass
+
+
+broker = Broker()
+
+
+def session_topic(session_id):
+    return f'session:{session_id}:attendance'
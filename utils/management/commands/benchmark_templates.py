@@ -0,0 +1,168 @@
+import logging
+import statistics
+import time
+from collections import Counter
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import NoReverseMatch, reverse
+from utils.management.commands.check_performance_budgets import Command as BudgetsCommand, route_parameters
+from utils.management.commands.request_metrics_report import read_lines
+from utils.synthetic_data import generate_synthetic_data
+from utils.template_cache import warm_template_cache
+
+
+# The most-hit pages when no request metrics log is given, with who opens them
+TOP_PAGES = (
+    ('student', 'course_list'),
+    ('student', 'course_detail'),
+    ('student', 'session_detail'),
+    ('student', 'scanner'),
+    ('student', 'student_attendance_report'),
+    ('teacher', 'course_list'),
+    ('teacher', 'course_detail'),
+    ('teacher', 'session_detail'),
+    ('teacher', 'qr_code_display'),
+    ('teacher', 'attendance_list'),
+)
+
+
+def cached_loaders():
+    """Return the cached template loaders of the Django template engines"""
+    loaders = {}
+    for backend in engines.all():
+        if isinstance(backend, DjangoTemplates):
+            for loader in backend.engine.template_loaders:
+                if isinstance(loader, CachedLoader):
+                    loaders.setdefault(backend.engine, []).append(loader)
+    return loaders
+
+
+def use_cached_loaders(loaders, cached):
+    """Load templates through the cached loaders, or through the loaders they wrap so every render parses from disk"""
+    for engine, engine_loaders in loaders.items():
+        if cached:
+            engine.template_loaders = engine_loaders
+        else:
+            engine.template_loaders = [wrapped for loader in engine_loaders for wrapped in loader.loaders]
+
+
+class Command(BaseCommand):
+    help = 'Compares render times of the most-hit pages with templates parsed on every request and with the cached loader'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Requests per page and configuration')
+        parser.add_argument(
+            '--log',
+            nargs='*',
+            default=[],
+            help='Request metrics logs to take the ten most-hit pages from, instead of the built-in list',
+        )
+        parser.add_argument('--students', type=int, default=40)
+        parser.add_argument('--sessions', type=int, default=10, help='Past sessions per course')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        if iterations < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        setup_test_environment()
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        logging.getLogger('request_metrics').setLevel(logging.WARNING)
+
+        # Measure against a throwaway database so real data is never touched
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            data = generate_synthetic_data(
+                teachers=2, courses=4, students=options['students'], sessions=options['sessions'], seed=0,
+            )
+            teacher, student, kwargs = BudgetsCommand().route_kwargs(data)
+            clients = {}
+            for role, user in (('teacher', teacher), ('student', student)):
+                clients[role] = Client()
+                clients[role].force_login(user)
+
+            pages = self.pages(options['log'], clients, kwargs)
+
+            loaders = cached_loaders()
+            if not loaders:
+                raise CommandError('TEMPLATES does not use the cached template loader.')
+            for engine_loaders in loaders.values():
+                for loader in engine_loaders:
+                    loader.reset()
+            start = time.perf_counter()
+            count = warm_template_cache()
+            warm_ms = (time.perf_counter() - start) * 1000
+
+            try:
+                results = {page: self.measure(clients[page[0]], page[2], iterations, loaders) for page in pages}
+            finally:
+                use_cached_loaders(loaders, True)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f'Compiled {count} templates at startup in {warm_ms:.1f} ms')
+        self.stdout.write(f"{'page':<36} {'parsed ms':>10} {'cached ms':>10} {'speedup':>8}")
+        for page in pages:
+            before, after = results[page]
+            self.stdout.write(f"{page[0] + ':' + page[1]:<36} {before:>10.2f} {after:>10.2f} {before / after:>7.2f}x")
+        total_before = sum(before for before, _ in results.values())
+        total_after = sum(after for _, after in results.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'All pages: {total_before:.2f} ms parsed, {total_after:.2f} ms cached ({total_before / total_after:.2f}x)'
+        ))
+
+    def pages(self, logs, clients, kwargs):
+        """Return (role, url name, url) of the pages to render"""
+        names = [(role, name) for role, name in TOP_PAGES]
+        if logs:
+            try:
+                hits = Counter(
+                    record['url_name'] for record in read_lines(logs)
+                    if record.get('method', 'GET') == 'GET' and record.get('url_name')
+                )
+            except OSError as exc:
+                raise CommandError(str(exc))
+            if not hits:
+                raise CommandError('No GET requests found in the given logs.')
+            names = [(None, name) for name, _ in hits.most_common(10)]
+
+        pages = []
+        for role, name in names:
+            try:
+                url = reverse(name, kwargs={param: kwargs[param] for param in route_parameters(name)})
+            except (KeyError, NoReverseMatch):
+                self.stderr.write(f'Skipping {name}: its URL cannot be built here')
+                continue
+            # Pages from a log are rendered as whichever role can open them
+            roles = [role] if role else list(clients)
+            for candidate in roles:
+                if clients[candidate].get(url).status_code == 200:
+                    pages.append((candidate, name, url))
+                    break
+            else:
+                self.stderr.write(f'Skipping {name}: it does not render a page here')
+        if not pages:
+            raise CommandError('None of the pages could be rendered.')
+        return pages
+
+    def measure(self, client, url, iterations, loaders):
+        """
+        Median milliseconds per request with templates parsed from disk and
+        with the cached loader. Requests alternate between the two so that
+        anything else that changes during the run affects both alike.
+        """
+        client.get(url)
+        timings = {False: [], True: []}
+        for _ in range(iterations):
+            for cached in (False, True):
+                use_cached_loaders(loaders, cached)
+                start = time.perf_counter()
+                client.get(url)
+                timings[cached].append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings[False]), statistics.median(timings[True])
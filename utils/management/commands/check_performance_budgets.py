@@ -0,0 +1,250 @@
+import json
+import logging
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from apps.attendance.models import Attendance
+from apps.sessions.models import Session
+from utils.qr_generator import compact_token
+from utils.synthetic_data import generate_synthetic_data
+
+
+# Routes that cannot be rendered from a plain GET in this harness
+SKIPPED_ROUTES = {
+    # Their templates are not part of the project yet
+    'password_reset', 'password_reset_done', 'password_reset_confirm', 'password_reset_complete',
+}
+
+ROLES = ('anonymous', 'teacher', 'student')
+
+
+def post_requests(student, session):
+    """
+    Valid client.post() arguments for the routes that only accept POST, so
+    they are measured doing their work instead of answering 405
+    """
+    now = timezone.now()
+    return {
+        'bulk_attendance': {'data': {'students': [student.id], 'status': Attendance.Status.PRESENT}},
+        'kiosk_check_ins': {
+            'content_type': 'application/json',
+            'data': {'scans': [{'student': student.email, 'timestamp': now.isoformat()}]},
+        },
+        'manual_attendance': {'data': {'attendance_code': session.attendance_code}},
+        'qr_code_token': {'data': {'duration': 10}},
+        'queued_check_ins': {
+            'content_type': 'application/json',
+            'data': {
+                'sent_at': now.timestamp() * 1000,
+                'scans': [{'session_id': session.id, 'token': session.qr_code_token, 'captured_at': now.timestamp() * 1000}],
+            },
+        },
+    }
+
+
+def iter_route_names(patterns):
+    """Yield the name of every named route, skipping the admin site"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.app_name == 'admin':
+                continue
+            yield from iter_route_names(pattern.url_patterns)
+        elif pattern.name:
+            yield pattern.name
+
+
+def route_parameters(name):
+    """Return the URL parameter names a route expects"""
+    possibilities = get_resolver().reverse_dict.getlist(name)
+    return possibilities[0][0][0][1] if possibilities else []
+
+
+class Command(BaseCommand):
+    help = 'Renders every route as each role on synthetic data and compares query counts and timings to budgets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--teachers', type=int, default=2)
+        parser.add_argument('--courses', type=int, default=4)
+        parser.add_argument('--students', type=int, default=40)
+        parser.add_argument('--sessions', type=int, default=10, help='Past sessions per course')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--budgets',
+            default=str(settings.BASE_DIR / 'perf_budgets.json'),
+            help='Budget file to compare against',
+        )
+        parser.add_argument(
+            '--update',
+            action='store_true',
+            help='Write the current measurements (with headroom) to the budget file instead of checking',
+        )
+        parser.add_argument('--time-headroom', type=float, default=3.0, help='Multiplier applied to timings on --update')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        # 403/404/405 responses are expected when a role opens another role's pages
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        logging.getLogger('request_metrics').setLevel(logging.WARNING)
+
+        # Measure against a throwaway database so real data is never touched
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            data = generate_synthetic_data(
+                teachers=options['teachers'],
+                courses=options['courses'],
+                students=options['students'],
+                sessions=options['sessions'],
+                seed=options['seed'],
+            )
+            self.stdout.write(
+                f"Synthetic data: {len(data.teachers)} teachers, {len(data.courses)} courses, "
+                f"{len(data.students)} students, {len(data.sessions)} sessions, "
+                f"{data.attendance_count} attendance rows"
+            )
+            results = self.measure_routes(data)
+            results.update(self.measure_exporters(data))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['update']:
+            self.write_budgets(options['budgets'], results, options['time_headroom'])
+        else:
+            self.check_budgets(options['budgets'], results)
+
+    def route_kwargs(self, data):
+        """URL parameters that resolve to objects visible to both the teacher and the student"""
+        course = data.courses[0]
+        session = next(s for s in data.active_sessions if s.course_id == course.id)
+        attendance = Attendance.objects.filter(session=session).first()
+        # A student who has not checked in yet, so check-in routes record one
+        enrollments = course.enrollments.select_related('student')
+        enrollment = enrollments.exclude(student__attendances__session=session).first() or enrollments.first()
+        student = enrollment.student
+
+        return course.teacher, student, {
+            'course_id': course.id,
+            'session_id': session.id,
+            'token': session.qr_code_token,
+            'code': compact_token(session.qr_code_token),
+            'attendance_id': attendance.id if attendance else 0,
+            'schedule_id': 0,
+        }
+
+    def measure_routes(self, data):
+        teacher, student, kwargs = self.route_kwargs(data)
+        users = {'anonymous': None, 'teacher': teacher, 'student': student}
+        posts = post_requests(student, Session.objects.get(id=kwargs['session_id']))
+        results = {}
+
+        for name in sorted(set(iter_route_names(get_resolver().url_patterns))):
+            if name in SKIPPED_ROUTES:
+                continue
+            url = reverse(name, kwargs={param: kwargs[param] for param in route_parameters(name)})
+
+            for role in ROLES:
+                client = Client()
+                if users[role]:
+                    client.force_login(users[role])
+                # Every measurement starts cold
+                cache.clear()
+
+                if name in posts:
+                    request = lambda: client.post(url, **posts[name])
+                else:
+                    request = lambda: client.get(url)
+                results[f'{role}:{name}'] = self.measure_rolled_back(request)
+
+        return results
+
+    def measure_rolled_back(self, call):
+        """Measure a request and roll back what it wrote, e.g. a check-in, so later routes see the same data"""
+        with transaction.atomic():
+            result = self.measure(call)
+            transaction.set_rollback(True)
+        return result
+
+    def measure_exporters(self, data):
+        from utils import exporters
+
+        course = data.courses[0]
+
+        # Exporters receive unevaluated querysets, as a view would pass them
+        def attendances():
+            return Attendance.objects.filter(session__course=course)
+
+        calls = {
+            'export:attendance_csv': lambda: exporters.export_attendance_to_csv(attendances(), course.name),
+            'export:attendance_excel': lambda: exporters.export_attendance_to_excel(attendances(), course.name),
+            'export:attendance_pdf': lambda: exporters.export_attendance_to_pdf(attendances(), course.name),
+            'export:session_summary_excel': lambda: exporters.export_session_summary_to_excel(course, course.sessions.all()),
+        }
+        return {name: self.measure(call) for name, call in calls.items()}
+
+    def measure(self, call):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = call()
+            wall = time.perf_counter() - start
+
+        return {
+            'status': response.status_code,
+            'queries': len(queries.captured_queries),
+            'sql_ms': round(sum(float(q['time']) for q in queries.captured_queries) * 1000, 2),
+            'wall_ms': round(wall * 1000, 2),
+        }
+
+    def write_budgets(self, path, results, headroom):
+        budgets = {
+            key: {
+                'queries': result['queries'],
+                'wall_ms': max(50, round(result['wall_ms'] * headroom)),
+            }
+            for key, result in sorted(results.items())
+        }
+        with open(path, 'w') as f:
+            json.dump(budgets, f, indent=2)
+            f.write('\n')
+        self.stdout.write(self.style.SUCCESS(f'Wrote {len(budgets)} budgets to {path}'))
+
+    def check_budgets(self, path, results):
+        try:
+            with open(path) as f:
+                budgets = json.load(f)
+        except FileNotFoundError:
+            raise CommandError(f'No budget file at {path}. Run with --update to create it.')
+
+        failures = []
+        self.stdout.write(f"{'route':<48} {'status':>6} {'queries':>9} {'sql ms':>8} {'wall ms':>9}")
+        for key, result in sorted(results.items()):
+            budget = budgets.get(key)
+            problems = []
+            if budget is None:
+                problems.append('no budget')
+            else:
+                if result['queries'] > budget['queries']:
+                    problems.append(f"queries {result['queries']} > {budget['queries']}")
+                if result['wall_ms'] > budget['wall_ms']:
+                    problems.append(f"wall {result['wall_ms']}ms > {budget['wall_ms']}ms")
+            if result['status'] >= 500:
+                problems.append(f"status {result['status']}")
+
+            line = (
+                f"{key:<48} {result['status']:>6} {result['queries']:>9} "
+                f"{result['sql_ms']:>8} {result['wall_ms']:>9}"
+            )
+            if problems:
+                failures.append(key)
+                self.stdout.write(self.style.ERROR(f"{line}  {'; '.join(problems)}"))
+            else:
+                self.stdout.write(line)
+
+        if failures:
+            raise CommandError(f'{len(failures)} routes exceeded their performance budget.')
+        self.stdout.write(self.style.SUCCESS('All routes are within budget'))
@@ -0,0 +1,82 @@
+import json
+import sys
+from django.core.management.base import BaseCommand, CommandError
+
+
+METRICS = ('wall_ms', 'db_ms', 'db_queries', 'template_ms')
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def read_lines(paths):
+    """Yield request metric records, skipping anything a log line may carry around them"""
+    for path in paths:
+        f = sys.stdin if path == '-' else open(path)
+        try:
+            for line in f:
+                start = line.find('{')
+                if start < 0:
+                    continue
+                try:
+                    record = json.loads(line[start:])
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and 'wall_ms' in record:
+                    yield record
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+class Command(BaseCommand):
+    help = 'Aggregates request metrics logs into p50/p95/p99 timings per URL name'
+
+    def add_arguments(self, parser):
+        parser.add_argument('logs', nargs='+', help="Log files written by the request metrics logger, or - for stdin")
+        parser.add_argument('--metric', choices=METRICS, default='wall_ms', help='Metric to sort the report by')
+        parser.add_argument('--limit', type=int, default=0, help='Only show the slowest N URL names')
+
+    def handle(self, *args, **options):
+        groups = {}
+        try:
+            for record in read_lines(options['logs']):
+                name = record.get('url_name') or record.get('path') or 'unknown'
+                groups.setdefault(f"{record.get('method', 'GET')} {name}", []).append(record)
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        if not groups:
+            raise CommandError('No request metrics found in the given logs.')
+
+        rows = []
+        for name, records in groups.items():
+            row = {'name': name, 'count': len(records)}
+            for metric in METRICS:
+                values = sorted(record.get(metric, 0) for record in records)
+                row[metric] = [percentile(values, p) for p in (50, 95, 99)]
+            hits = sum(record.get('cache_hits', 0) for record in records)
+            lookups = hits + sum(record.get('cache_misses', 0) for record in records)
+            row['cache_hit_rate'] = hits / lookups if lookups else None
+            row['errors'] = sum(1 for record in records if record.get('status', 200) >= 500)
+            rows.append(row)
+
+        rows.sort(key=lambda row: row[options['metric']][1], reverse=True)
+        if options['limit']:
+            rows = rows[:options['limit']]
+
+        self.stdout.write(
+            f"{'url name':<44} {'count':>6} {'wall p50/p95/p99 ms':>22} {'db p95 ms':>10} "
+            f"{'queries p95':>12} {'tpl p95 ms':>11} {'cache hit':>10} {'5xx':>5}"
+        )
+        for row in rows:
+            wall = '/'.join(f'{value:.0f}' for value in row['wall_ms'])
+            hit_rate = f"{row['cache_hit_rate']:.0%}" if row['cache_hit_rate'] is not None else '-'
+            self.stdout.write(
+                f"{row['name']:<44} {row['count']:>6} {wall:>22} {row['db_ms'][1]:>10.1f} "
+                f"{row['db_queries'][1]:>12} {row['template_ms'][1]:>11.1f} {hit_rate:>10} {row['errors']:>5}"
+            )
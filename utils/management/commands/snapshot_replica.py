@@ -0,0 +1,41 @@
+import os
+import sqlite3
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Copies the primary SQLite database to the read replica file used for reports'
+
+    def handle(self, *args, **options):
+        alias = settings.REPLICA_DATABASE_ALIAS
+        replica = settings.DATABASES.get(alias)
+        primary = settings.DATABASES['default']
+
+        if replica is None:
+            raise CommandError('No read replica is configured. Set DB_REPLICA_NAME first.')
+        if 'sqlite3' not in primary['ENGINE'] or 'sqlite3' not in replica['ENGINE']:
+            raise CommandError('Snapshots are only supported between SQLite databases.')
+
+        start = time.perf_counter()
+        target = str(replica['NAME'])
+        temp_target = f'{target}.tmp'
+
+        # Copy in a single step: in WAL mode this only holds a read snapshot, so
+        # check-ins keep writing while the copy is taken
+        source = sqlite3.connect(str(primary['NAME']))
+        destination = sqlite3.connect(temp_target)
+        try:
+            source.backup(destination)
+            # Readers open the snapshot read-only, so it must not need a WAL file
+            destination.execute('PRAGMA journal_mode = DELETE;')
+        finally:
+            destination.close()
+            source.close()
+
+        # Swap the file atomically so readers see either the old or the new copy
+        os.replace(temp_target, target)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f'Replica snapshot written to {target} in {elapsed:.2f}s'))
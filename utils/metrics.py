@@ -0,0 +1,338 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.signals import request_finished
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where scrapes and exits are not serialized
+    fcntl = None
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _process_name():
+    """
+    Name of this process's metrics file: its pid, to tell whether it is still
+    running, and a random suffix so a process that gets a reused pid never
+    overwrites the file of an earlier one
+    """
+    return f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+
+def _process_alive(path):
+    """Whether the process that writes a metrics-<pid>-<suffix>.json file is running"""
+    try:
+        pid = int(os.path.basename(path).removeprefix('metrics-').split('-')[0].removesuffix('.json'))
+    except ValueError:
+        return True
+    if os.name != 'posix':
+        # os.kill() would terminate the process
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    """Replace a file at once, so readers never see it half written"""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class Registry:
+    """
+    In-process metrics registry. When METRICS_DIR is set, each process also
+    writes its totals to its own file there after every request that changed
+    them, and the /metrics endpoint adds up the files of all processes, so
+    gunicorn workers and cron commands report as one. Files of processes that
+    have exited are folded into one archive file, so totals never go down.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.written = False
+        self.process = _process_name()
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def reset(self):
+        """Start from zero, e.g. in a freshly forked worker"""
+        with self.lock:
+            for metric in self.metrics.values():
+                metric.values = {}
+            self.dirty = False
+            self.written = False
+            self.process = _process_name()
+
+    def directory(self):
+        return getattr(settings, 'METRICS_DIR', None)
+
+    def path(self):
+        return os.path.join(self.directory(), f'metrics-{self.process}.json')
+
+    def archive_path(self):
+        return os.path.join(self.directory(), 'archive.json')
+
+    @contextmanager
+    def directory_lock(self):
+        """Hold the lock that serializes archiving and scraping across processes"""
+        os.makedirs(self.directory(), exist_ok=True)
+        with open(os.path.join(self.directory(), 'metrics.lock'), 'a') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            # Closing the file releases the lock
+            yield
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: [[list(key), value] for key, value in metric.values.items()]
+                for name, metric in self.metrics.items()
+            }
+
+    def flush(self, **kwargs):
+        """Write this process's totals if anything changed since the last flush"""
+        if not self.dirty or not self.directory():
+            return
+        self.dirty = False
+
+        os.makedirs(self.directory(), exist_ok=True)
+        _write_json(self.path(), self.snapshot())
+        self.written = True
+
+    def retire(self):
+        """Move this process's totals into the archive as it exits"""
+        if not (self.dirty or self.written) or not self.directory():
+            return
+        with self.directory_lock():
+            self.flush()
+            if os.path.exists(self.path()):
+                self.archive([self.path()])
+
+    def archive(self, paths):
+        """Add the totals in ``paths`` to the archive and remove them; call with the directory lock held"""
+        snapshots, archived = [], []
+        for path in paths:
+            snapshot = _read_json(path)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+                archived.append(path)
+        if not archived:
+            return
+
+        totals = self.merge([_read_json(self.archive_path()) or {}] + snapshots)
+        _write_json(self.archive_path(), {
+            name: [[list(key), value] for key, value in values.items()]
+            for name, values in totals.items()
+        })
+        for path in archived:
+            os.remove(path)
+
+    def collect(self):
+        """Totals of every process, keyed by metric name and label values"""
+        snapshots = [self.snapshot()]
+
+        if self.directory():
+            with self.directory_lock():
+                own = self.path()
+                running, exited = [], []
+                for path in glob.glob(os.path.join(self.directory(), 'metrics-*.json')):
+                    if path != own:
+                        (running if _process_alive(path) else exited).append(path)
+                # Workers killed without running their exit handlers, e.g. on timeout
+                self.archive(exited)
+
+                for path in [self.archive_path()] + running:
+                    snapshot = _read_json(path)
+                    if snapshot is not None:
+                        snapshots.append(snapshot)
+
+        return self.merge(snapshots)
+
+    def merge(self, snapshots):
+        """Add up snapshots into totals keyed by metric name and label values"""
+        totals = {name: {} for name in self.metrics}
+        for snapshot in snapshots:
+            for name, samples in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in samples:
+                    key = tuple(key)
+                    totals[name][key] = metric.merge(totals[name].get(key), value)
+        return totals
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            for key, value in sorted(values.items()):
+                lines.extend(metric.render(dict(zip(metric.labelnames, key)), value))
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+        for name, value in labels.items()
+    )
+    return '{' + pairs + '}'
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.registry = registry
+        registry.register(self)
+
+    def key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    """A total that only goes up"""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+            self.registry.dirty = True
+
+    def merge(self, total, value):
+        return (total or 0) + value
+
+    def render(self, labels, value):
+        return [f'{self.name}{format_labels(labels)} {value}']
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative buckets, with their sum and count"""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(buckets)
+
+    def observe(self, amount, **labels):
+        key = self.key(labels)
+        with self.registry.lock:
+            counts, total, count = self.values.get(key) or ([0] * len(self.buckets), 0, 0)
+            counts = [c + (amount <= bound) for c, bound in zip(counts, self.buckets)]
+            self.values[key] = [counts, total + amount, count + 1]
+            self.registry.dirty = True
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block; also usable as a decorator"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def merge(self, total, value):
+        if total is None:
+            return value
+        return [
+            [a + b for a, b in zip(total[0], value[0])],
+            total[1] + value[1],
+            total[2] + value[2],
+        ]
+
+    def render(self, labels, value):
+        counts, total, count = value
+        lines = [
+            f'{self.name}_bucket{format_labels({**labels, "le": bound})} {bucket_count}'
+            for bound, bucket_count in zip(self.buckets, counts)
+        ]
+        lines.append(f'{self.name}_bucket{format_labels({**labels, "le": "+Inf"})} {count}')
+        lines.append(f'{self.name}_sum{format_labels(labels)} {total}')
+        lines.append(f'{self.name}_count{format_labels(labels)} {count}')
+        return lines
+
+
+CHECKINS = Counter(
+    'scaatt_checkins_total',
+    'Attendance check-in attempts by method and result',
+    ['method', 'result'],
+)
+CHECKIN_DURATION = Histogram(
+    'scaatt_checkin_duration_seconds',
+    'Time spent handling a check-in attempt',
+    ['method'],
+)
+QR_REFRESHES = Counter(
+    'scaatt_qr_refreshes_total',
+    'QR code rotations requested by session pages',
+)
+EXPORT_DURATION = Histogram(
+    'scaatt_export_duration_seconds',
+    'Time spent generating an attendance export, by format',
+    ['format'],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+SESSIONS_CLOSED = Counter(
+    'scaatt_sessions_closed_total',
+    'Sessions closed automatically by the scheduler',
+)
+SESSIONS_GENERATED = Counter(
+    'scaatt_sessions_generated_total',
+    'Upcoming sessions generated from course schedules by the scheduler',
+)
+SCHEDULER_DURATION = Histogram(
+    'scaatt_scheduler_run_duration_seconds',
+    'Time spent by one auto_manage_sessions run',
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 300),
+)
+
+
+request_finished.connect(REGISTRY.flush, dispatch_uid='metrics_flush')
+atexit.register(REGISTRY.retire)
+if hasattr(os, 'register_at_fork'):
+    # Counts made before a fork belong to the parent process's file
+    os.register_at_fork(after_in_child=REGISTRY.reset)
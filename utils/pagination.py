@@ -0,0 +1,90 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Raised when a page cursor cannot be decoded"""
+
+
+@dataclass
+class KeysetPage:
+    """One page of a keyset-paginated queryset"""
+
+    items: list
+    next_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def _resolve_field(model, path):
+    """Return the model field a lookup path such as 'session__date' points to"""
+    *relations, name = path.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def _value(obj, path):
+    if isinstance(obj, dict):
+        # A values() row
+        return obj[path]
+    for attr in path.split('__'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def encode_cursor(values):
+    """Encode the ordering values of a row as an opaque, URL-safe cursor"""
+    # isoformat keeps microseconds, which DjangoJSONEncoder would round away
+    raw = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, fields):
+    """Decode a cursor back into values of the given model fields"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise InvalidCursor(cursor)
+        return [field.to_python(value) for field, value in zip(fields, values)]
+    except (binascii.Error, UnicodeDecodeError, ValueError, ValidationError):
+        raise InvalidCursor(cursor)
+
+
+def keyset_queryset(queryset, ordering, cursor=None):
+    """Order the queryset and keep only the rows that follow the cursor"""
+    paths = [key.lstrip('-') for key in ordering]
+    queryset = queryset.order_by(*ordering)
+    if not cursor:
+        return queryset
+
+    values = decode_cursor(cursor, [_resolve_field(queryset.model, path) for path in paths])
+    after = Q()
+    for i, key in enumerate(ordering):
+        lookup = 'lt' if key.startswith('-') else 'gt'
+        equal = {paths[j]: values[j] for j in range(i)}
+        after |= Q(**equal, **{f'{paths[i]}__{lookup}': values[i]})
+    return queryset.filter(after)
+
+
+def keyset_page(queryset, ordering, cursor=None, per_page=50):
+    """
+    Return the page of rows that follow the cursor in the given ordering,
+    e.g. ('-date', '-start_time', '-id'). The ordering must end with a unique
+    field. Rows are found with a WHERE on the ordering values of the last row
+    of the previous page instead of an OFFSET, so every page costs the same.
+    """
+    items = list(keyset_queryset(queryset, ordering, cursor)[:per_page + 1])
+    if len(items) <= per_page:
+        return KeysetPage(items)
+
+    items = items[:per_page]
+    paths = [key.lstrip('-') for key in ordering]
+    return KeysetPage(items, encode_cursor([_value(items[-1], path) for path in paths]))
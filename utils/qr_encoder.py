@@ -0,0 +1,90 @@
+import base64
+import io
+import qrcode
+from qrcode import util
+from qrcode.main import copy_2d_array
+from PIL import Image
+
+
+class QREncoder:
+    """
+    Encodes payloads of one shape with a fixed QR version and mask pattern.
+
+    The function patterns (finders, timing, alignment, format and version
+    information) depend only on those, so they are laid out once and each
+    payload only fills in the data region. This skips the search for the
+    version and, above all, the eight trial encodings that pick the mask.
+    """
+
+    def __init__(self, version, mask_pattern, error_correction=qrcode.constants.ERROR_CORRECT_L):
+        self.version = version
+        self.mask_pattern = mask_pattern
+        self.error_correction = error_correction
+
+        qr = self._qr()
+        size = qr.modules_count
+        qr.modules = [[None] * size for _ in range(size)]
+        qr.setup_position_probe_pattern(0, 0)
+        qr.setup_position_probe_pattern(size - 7, 0)
+        qr.setup_position_probe_pattern(0, size - 7)
+        qr.setup_position_adjust_pattern()
+        qr.setup_timing_pattern()
+        qr.setup_type_info(False, mask_pattern)
+        if version >= 7:
+            qr.setup_type_number(False)
+        self._template = qr.modules
+
+    def _qr(self):
+        qr = qrcode.QRCode(version=self.version, error_correction=self.error_correction, mask_pattern=self.mask_pattern)
+        qr.modules_count = self.version * 4 + 17
+        return qr
+
+    def matrix(self, data):
+        """Return the module matrix of ``data`` as rows of booleans"""
+        qr = self._qr()
+        qr.modules = copy_2d_array(self._template)
+        qr.map_data(util.create_data(self.version, self.error_correction, [util.QRData(data)]), self.mask_pattern)
+        return qr.modules
+
+    def png(self, data, box_size=10, border=1):
+        """Return ``data`` as a black on white 1-bit PNG"""
+        modules = self.matrix(data)
+        side = len(modules) + 2 * border
+        margin = b'\xff' * side * border
+        quiet = b'\xff' * border
+        pixels = b''.join(
+            [margin]
+            + [quiet + bytes(0 if dark else 255 for dark in row) + quiet for row in modules]
+            + [margin]
+        )
+        image = Image.frombytes('L', (side, side), pixels).convert('1', dither=Image.Dither.NONE)
+        image = image.resize((side * box_size, side * box_size), Image.Resampling.NEAREST)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    def png_data_uri(self, data, box_size=10, border=1):
+        """Return ``data`` as a PNG data URI for an <img> tag"""
+        return f"data:image/png;base64,{base64.b64encode(self.png(data, box_size, border)).decode()}"
+
+
+# Encoders of this process by (mode, length, error correction)
+_encoders = {}
+
+
+def encoder_for(data, error_correction=qrcode.constants.ERROR_CORRECT_L):
+    """
+    Return the encoder for payloads shaped like ``data``. Payloads with the
+    same length and encoding mode share one, with the smallest version that
+    fits them and the mask pattern that best suits the first of them.
+    """
+    segment = util.QRData(data)
+    key = (segment.mode, len(segment), error_correction)
+    encoder = _encoders.get(key)
+    if encoder is None:
+        qr = qrcode.QRCode(error_correction=error_correction)
+        qr.add_data(segment)
+        qr.best_fit()
+        encoder = _encoders.setdefault(key, QREncoder(qr.version, qr.best_mask_pattern(), error_correction))
+    return encoder
@@ -1,11 +1,12 @@
-import qrcode
-import uuid
 import base64
-import io
+import binascii
+import uuid
+from urllib.parse import urlsplit
 from datetime import datetime, timedelta
 from django.conf import settings
 from django.urls import reverse
 from django.utils import timezone
+from utils.qr_encoder import encoder_for
 
 
 def generate_session_token():
@@ -23,37 +24,56 @@ def generate_qr_code_data(session_id, token, expiry_time):
     return data
 
 
-def generate_qr_code_url(session_id, token):
-    """Generate a URL for the QR code that can be scanned by students"""
-    attendance_url = reverse('mark_attendance', args=[session_id, token])
+def compact_token(token):
+    """
+    Return a session token as 26 base32 characters, which QR codes hold in
+    alphanumeric mode, or None if it is not a UUID in its usual form
+    """
+    try:
+        value = uuid.UUID(token)
+    except ValueError:
+        return None
+    if str(value) != token:
+        return None
+    return base64.b32encode(value.bytes).decode().rstrip('=')
+
+
+def expand_token(code):
+    """Return the session token of a compact token, or None if ``code`` is not one"""
+    if len(code) != 26:
+        return None
+    try:
+        return str(uuid.UUID(bytes=base64.b32decode(code.upper() + '======')))
+    except (binascii.Error, ValueError):
+        return None
+
+
+def _base_url():
     base_url = getattr(settings, 'BASE_URL', 'https://web-production-9a574.up.railway.app')
     
     # Ensure base_url has protocol (https://)
     if base_url and not base_url.startswith(('http://', 'https://')):
         base_url = f"https://{base_url}"
     
-    return f"{base_url}{attendance_url}"
+    return base_url
+
+
+def generate_qr_code_url(session_id, token):
+    """Generate a URL for the QR code that can be scanned by students"""
+    code = compact_token(token)
+    if code is None:
+        return f"{_base_url()}{reverse('mark_attendance', args=[session_id, token])}"
+    
+    # Scheme and host are case-insensitive, so uppercasing them keeps the
+    # whole URL in the QR alphanumeric set (digits, A-Z and $%*+-./:)
+    base_url = urlsplit(_base_url())
+    origin = f"{base_url.scheme}://{base_url.netloc}".upper()
+    return f"{origin}{base_url.path.rstrip('/')}{reverse('scan', args=[session_id, code])}"
 
 
 def generate_qr_code_image(url, size=10, border=1):
     """Generate a QR code image from a URL"""
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=size,
-        border=border,
-    )
-    qr.add_data(url)
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Convert the image to a base64 string
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
-    img_str = base64.b64encode(buffer.getvalue()).decode()
-    
-    return f"data:image/png;base64,{img_str}"
+    return encoder_for(url).png_data_uri(url, box_size=size, border=border)
 
 
 def calculate_expiry_time(duration_seconds=10):
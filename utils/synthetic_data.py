@@ -0,0 +1,147 @@
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+from apps.accounts.models import User
+from apps.courses.enrolled import forget_enrolled
+from apps.courses.models import Course, CourseEnrollment
+from apps.sessions.models import Session
+from apps.attendance.models import Attendance
+
+
+@dataclass
+class SyntheticData:
+    """Objects created by generate_synthetic_data"""
+
+    teachers: list = field(default_factory=list)
+    students: list = field(default_factory=list)
+    courses: list = field(default_factory=list)
+    sessions: list = field(default_factory=list)
+    active_sessions: list = field(default_factory=list)
+    attendance_count: int = 0
+
+
+def create_users(role, count, prefix, password=None):
+    """Create users and their profiles in bulk, bypassing per-row signals"""
+    password = password or make_password(None)
+    return User.objects.bulk_create_users(
+        User(
+            email=f'{prefix}-{i}@example.com',
+            username=f'{prefix}-{i}',
+            first_name=prefix.title(),
+            last_name=str(i),
+            role=role,
+            password=password,
+        )
+        for i in range(count)
+    )
+
+
+def generate_synthetic_data(teachers=2, courses=4, students=40, sessions=10, seed=0,
+                            students_per_course=None, prefix='synthetic', password=None):
+    """
+    Create N teachers, M courses, K students and S past sessions per course,
+    with realistic attendance. Each course also gets one session running now
+    and one upcoming session, so every dashboard state has data.
+    """
+    rng = random.Random(seed)
+    data = SyntheticData()
+
+    data.teachers = create_users(User.Role.TEACHER, teachers, f'{prefix}-teacher', password)
+    data.students = create_users(User.Role.STUDENT, students, f'{prefix}-student', password)
+
+    data.courses = Course.objects.bulk_create(
+        Course(
+            name=f'Course {i}',
+            code=f'{prefix[:6].upper()}-{seed}-{i}',
+            description='Synthetic course',
+            teacher=data.teachers[i % teachers],
+        )
+        for i in range(courses)
+    )
+
+    per_course = min(students_per_course or students, students)
+    rosters = {course.id: rng.sample(data.students, per_course) for course in data.courses}
+    CourseEnrollment.objects.bulk_create(
+        CourseEnrollment(course_id=course_id, student=student)
+        for course_id, roster in rosters.items()
+        for student in roster
+    )
+    for course_id in rosters:
+        forget_enrolled(course_id)
+
+    now = timezone.localtime()
+    today = now.date()
+    live_start = max(now - timedelta(minutes=10), now.replace(hour=0, minute=0, second=0, microsecond=0))
+    live_end = min(now + timedelta(hours=1), now.replace(hour=23, minute=59, second=0, microsecond=0))
+
+    new_sessions = []
+    for course in data.courses:
+        for i in range(sessions):
+            new_sessions.append(Session(
+                course=course,
+                title=f'{course.name} - Week {i + 1}',
+                date=today - timedelta(days=7 * (sessions - i)),
+                start_time=time(8, 0),
+                end_time=time(10, 0),
+                is_closed=True,
+            ))
+        new_sessions.append(Session(
+            course=course,
+            title=f'{course.name} - Live',
+            date=today,
+            start_time=live_start.time(),
+            end_time=live_end.time(),
+        ))
+        new_sessions.append(Session(
+            course=course,
+            title=f'{course.name} - Next week',
+            date=today + timedelta(days=7),
+            start_time=time(8, 0),
+            end_time=time(10, 0),
+        ))
+
+    # bulk_create skips Session.save(), so set the QR fields here
+    for session in new_sessions:
+        session.qr_code_token = session.qr_code_token or _token(rng)
+        session.qr_expiry_time = now + timedelta(hours=2)
+    data.sessions = Session.objects.bulk_create(new_sessions)
+    data.active_sessions = [s for s in data.sessions if s.date == today]
+
+    attendances = []
+    for session in data.sessions:
+        if session.date > today:
+            continue
+        start = timezone.make_aware(datetime.combine(session.date, session.start_time))
+        for student in rosters[session.course_id]:
+            roll = rng.random()
+            if roll < 0.75:
+                status, delay = Attendance.Status.PRESENT, rng.uniform(-10, 15)
+            elif roll < 0.85:
+                status, delay = Attendance.Status.LATE, rng.uniform(15, 45)
+            elif roll < 0.88:
+                status, delay = Attendance.Status.EXCUSED, 0
+            else:
+                continue  # absent students have no row
+            check_in = start + timedelta(minutes=delay)
+            if check_in > now:
+                continue
+            attendances.append(Attendance(
+                session=session,
+                student=student,
+                status=status,
+                check_in_time=check_in,
+                ip_address='127.0.0.1',
+                device_info='synthetic',
+            ))
+    Attendance.objects.bulk_create(attendances, batch_size=1000)
+    data.attendance_count = len(attendances)
+
+    return data
+
+
+def _token(rng):
+    # Same form as generate_session_token(), so compact QR URLs apply
+    return str(uuid.UUID(int=rng.getrandbits(128)))
@@ -0,0 +1,32 @@
+import logging
+import os
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+
+logger = logging.getLogger(__name__)
+
+
+def warm_template_cache():
+    """
+    Compile every template in the project's template directories, so that
+    the cached loader has them before the first request. Returns how many
+    templates were compiled.
+    """
+    count = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        engine = backend.engine
+        for directory in engine.dirs:
+            for root, _, filenames in os.walk(directory):
+                for filename in filenames:
+                    name = os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/')
+                    try:
+                        engine.get_template(name)
+                    except (TemplateSyntaxError, UnicodeDecodeError) as exc:
+                        # Rendering the template reports this again
+                        logger.warning('Could not compile template %s: %s', name, exc)
+                    else:
+                        count += 1
+    return count
@@ -0,0 +1,21 @@
+import hmac
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+from utils.metrics import REGISTRY
+
+
+@require_GET
+def metrics(request):
+    """Expose the application metrics to Prometheus"""
+
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token:
+        given = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        if not hmac.compare_digest(given.encode(), token.encode()):
+            return HttpResponseForbidden("A valid metrics token is required.")
+    elif not (settings.DEBUG or request.user.is_staff):
+        # Without a token the metrics stay private to staff rather than public
+        return HttpResponseForbidden("Set METRICS_TOKEN to scrape metrics, or sign in as staff.")
+
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')